@@ -0,0 +1,132 @@
+"""
+Services partagés par les endpoints, injectés avec `Depends` et créés au
+premier usage : le démarrage de l'application (et /health) ne charge ni
+LangChain, ni les clients Mistral, ni NumPy, ni les parseurs de documents.
+Les modules des services sont importés par leur fabrique.
+"""
+import asyncio
+import logging
+import sys
+import threading
+import time
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class LazyService:
+    """
+    Service créé par `factory` au premier appel, puis partagé (création
+    protégée par un verrou : FastAPI résout les dépendances synchrones dans
+    son pool de threads). Utilisable directement comme dépendance FastAPI.
+    """
+
+    def __init__(self, factory: Callable[[], Any]):
+        self.factory = factory
+        self._instance = _MISSING
+        self._lock = threading.Lock()
+
+    def __call__(self) -> Any:
+        if self._instance is _MISSING:
+            with self._lock:
+                if self._instance is _MISSING:
+                    self._instance = self.factory()
+        return self._instance
+
+    @property
+    def created(self) -> bool:
+        return self._instance is not _MISSING
+
+    def set(self, instance: Any) -> None:
+        """Remplace l'instance partagée (tests, benchmarks)."""
+        with self._lock:
+            self._instance = instance
+
+
+def _llm_service():
+    from app.services.llm.mistral_client import LLMService
+    return LLMService()
+
+
+def _matching_service():
+    from app.services.matching.scorer import MatchingService
+    return MatchingService()
+
+
+def _extraction_pool():
+    from app.services.parsers.worker_pool import ExtractionPool
+    return ExtractionPool()
+
+
+def _analytics_store():
+    from app.services.analytics.store import build_analytics_store
+    return build_analytics_store(get_matching_service().score_store)
+
+
+def _analysis_pipeline():
+    from app.services.pipeline.analysis import AnalysisPipeline
+    return AnalysisPipeline(
+        get_llm_service(), get_matching_service(),
+        extraction_pool=get_extraction_pool(), results_store=get_analytics_store()
+    )
+
+
+def _batch_pipeline():
+    from app.services.pipeline.batch import BatchAnalysisPipeline
+    return BatchAnalysisPipeline(get_analysis_pipeline())
+
+
+def _job_queue():
+    from app.services.pipeline.jobs import AnalysisJobQueue
+    return AnalysisJobQueue(get_analysis_pipeline())
+
+
+def _candidate_search():
+    from app.services.matching.candidate_search import CandidateSearchService
+    return CandidateSearchService(get_matching_service())
+
+
+get_llm_service = LazyService(_llm_service)
+get_matching_service = LazyService(_matching_service)
+get_extraction_pool = LazyService(_extraction_pool)
+get_analytics_store = LazyService(_analytics_store)
+get_analysis_pipeline = LazyService(_analysis_pipeline)
+get_batch_pipeline = LazyService(_batch_pipeline)
+get_job_queue = LazyService(_job_queue)
+get_candidate_search = LazyService(_candidate_search)
+
+
+async def warm_up() -> None:
+    """
+    Préchauffage optionnel (WARMUP_ON_STARTUP) : crée les services hors de la
+    boucle d'événements (imports, chaînes LangChain, référentiel, caches
+    persistants), rend les prompts, ouvre les clients HTTP et démarre les
+    workers d'extraction, pour que la première requête n'en paie pas le coût.
+    """
+    start = time.perf_counter()
+    try:
+        pipeline = await asyncio.to_thread(get_analysis_pipeline)
+        await asyncio.to_thread(get_candidate_search)
+        await asyncio.to_thread(pipeline.llm_service.warm_up)
+        await asyncio.to_thread(get_extraction_pool().warm_up)
+    except Exception as e:
+        logger.warning(f"Préchauffage des services incomplet: {e}")
+        return
+    logger.info(f"Services préchauffés en {time.perf_counter() - start:.2f}s")
+
+
+async def shutdown() -> None:
+    """Arrête les services créés (workers, pools, écritures en attente, connexions Mistral)."""
+    if get_job_queue.created:
+        await get_job_queue().stop()
+    if get_extraction_pool.created:
+        get_extraction_pool().shutdown()
+    if get_analytics_store.created and get_analytics_store() is not None:
+        get_analytics_store().close()
+    if get_matching_service.created:
+        get_matching_service().close()
+    http_client = sys.modules.get("app.services.llm.http_client")
+    if http_client is not None:
+        await http_client.mistral_http.aclose()
@@ -1,5 +1,8 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import analyze
+from app.api.v1.endpoints import analytics, analyze, candidates, scores
 
 api_router = APIRouter()
 api_router.include_router(analyze.router, tags=["analysis"])
+api_router.include_router(candidates.router, tags=["candidates"])
+api_router.include_router(scores.router, tags=["scores"])
+api_router.include_router(analytics.router, tags=["analytics"])
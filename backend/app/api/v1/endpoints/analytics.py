@@ -0,0 +1,40 @@
+import asyncio
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from app.schemas.analysis import AnalyticsMatchesResponse
+from app.api.deps import get_analytics_store
+import logging
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+@router.get("/analytics/matches", response_model=AnalyticsMatchesResponse)
+async def scan_matches(
+    min_score: Optional[float] = None,
+    max_score: Optional[float] = None,
+    offer_id: Optional[str] = None,
+    candidate_id: Optional[str] = None,
+    matched: List[str] = Query([]),
+    missing: List[str] = Query([]),
+    recommendation: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=10000),
+    analytics_store=Depends(get_analytics_store)
+):
+    """
+    Parcours filtré des résultats de matching enregistrés, par score
+    décroissant (ex. `?min_score=70&missing=Kubernetes`). Seul le dernier
+    résultat de chaque couple candidat-offre est retourné.
+    """
+    if analytics_store is None:
+        raise HTTPException(status_code=503, detail="Le stockage analytique est désactivé (ANALYTICS_STORE_PATH).")
+    try:
+        results = await asyncio.to_thread(
+            analytics_store.scan,
+            min_score=min_score, max_score=max_score, offer_id=offer_id, candidate_id=candidate_id,
+            matched=matched, missing=missing, recommendation=recommendation, limit=limit
+        )
+        return AnalyticsMatchesResponse(count=len(results), results=results)
+
+    except Exception as e:
+        logger.error(f"Internal error: {e}")
+        raise HTTPException(status_code=500, detail=f"Une erreur interne est survenue: {str(e)}")
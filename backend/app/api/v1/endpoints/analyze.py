@@ -1,66 +1,73 @@
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException
-from app.schemas.analysis import AnalysisResponse
-from app.services.parsers.extractor import TextExtractor
-from app.services.llm.mistral_client import LLMService
-from app.services.matching.scorer import MatchingService
+import json
+from typing import List, Optional
+from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from app.core.config import settings
+from app.schemas.analysis import AnalysisJob, AnalysisResponse, BatchAnalysisResponse
+from app.api.deps import get_analysis_pipeline, get_batch_pipeline, get_job_queue
+from app.services.llm.result_cache import begin_cache_tracking, format_cache_statuses
+from app.services.parsers.upload import UploadRejected, ingest_upload
+from app.services.parsers.worker_pool import ExtractionPoolSaturated
+from app.services.pipeline.job_store import COMPLETED, FINISHED_STATUSES
+from app.services.pipeline.jobs import JobQueueFull
+from app.services.pipeline.runner import StageTimeoutError
 import logging
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-# Instanciation des services
-llm_service = LLMService()
-matching_service = MatchingService()
-
 @router.post("/analyze", response_model=AnalysisResponse)
 async def analyze_application(
+    response: Response,
     cv: UploadFile = File(...),
-    job_description: str = Form(...)
+    job_description: str = Form(...),
+    mode: Optional[str] = Form(None, description="standard ou fused (ANALYSIS_MODE par défaut)"),
+    analysis_pipeline=Depends(get_analysis_pipeline)
 ):
     """
     Endpoint principal pour analyser une candidature.
     1. Extrait le texte du CV.
-    2. Analyse le CV avec le LLM.
-    3. Analyse l'offre d'emploi avec le LLM.
-    4. Calcule le matching via Embeddings.
-    5. Génère un rapport final.
+    2. Analyse le CV et l'offre d'emploi avec le LLM (en parallèle).
+    3. Calcule le matching via Embeddings.
+    4. Génère un rapport final.
+    Avec `mode=fused`, les étapes 2 et 4 se réduisent à un seul appel LLM
+    (extraction combinée CV + offre) et à un rapport généré par template.
+    Le statut du cache des extractions LLM est renvoyé dans l'en-tête `X-LLM-Cache`.
     """
+    cache_statuses = begin_cache_tracking()
     try:
-        # 1. Parsing du CV
-        logger.info(f"Processing file: {cv.filename}")
-        content = await cv.read()
-        cv_text = TextExtractor.extract(cv.filename, content)
-        
-        if not cv_text:
-            raise HTTPException(status_code=400, detail="Impossible d'extraire du texte du fichier.")
-
-        # 2. Analyse IA (Parallélisable en théorie, ici séquentiel pour simplicité)
-        logger.info("Analyzing CV with LLM...")
-        cv_data = await llm_service.analyze_cv(cv_text)
-        
-        logger.info("Analyzing Job Description with LLM...")
-        job_data = await llm_service.analyze_job_description(job_description)
-
-        # 3. Matching
-        logger.info("Calculating matching score...")
-        matching_result = await matching_service.calculate_score(cv_data, job_data) ### ANALYSE POINTUE A VENIR A CE NIVEAU
-
-        # 4. Génération de rapport
-        logger.info("Generating report...")
-        report = await llm_service.generate_report(
-            cv_data, 
-            job_data, 
-            matching_result['overall_score']
+        upload = await ingest_upload(cv)
+        logger.info(f"Processing file: {upload.filename} ({upload.size} bytes, sha256 {upload.sha256[:12]})")
+
+        results = await analysis_pipeline.run(
+            upload.filename, upload.content, job_description, mode=mode, content_hash=upload.sha256
         )
+        cv_data = results['cv_analysis']
+        response.headers["X-LLM-Cache"] = format_cache_statuses(cache_statuses)
 
         # Construction de la réponse
         return AnalysisResponse(
             job_classification=cv_data.get('job_classification'),
             cv_analysis=cv_data.get('cv_analysis'),
-            matching=matching_result,
-            report=report
+            matching=results['matching'],
+            report=results['report']
         )
 
+    except HTTPException:
+        raise
+
+    except UploadRejected as e:
+        logger.warning(f"Upload rejected: {e}")
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+    except StageTimeoutError as e:
+        logger.error(f"Timeout: {e}")
+        raise HTTPException(status_code=504, detail=str(e))
+
+    except ExtractionPoolSaturated as e:
+        logger.warning(f"Extraction pool saturated: {e}")
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+
     except ValueError as e:
         logger.error(f"Validation error: {e}")
         raise HTTPException(status_code=400, detail=str(e))
@@ -68,3 +75,187 @@ async def analyze_application(
     except Exception as e:
         logger.error(f"Internal error: {e}")
         raise HTTPException(status_code=500, detail=f"Une erreur interne est survenue: {str(e)}")
+
+
+@router.post("/analyze/batch", response_model=BatchAnalysisResponse)
+async def analyze_batch(
+    response: Response,
+    cvs: List[UploadFile] = File(..., description="CV (PDF, DOCX, TXT) ou archives ZIP"),
+    job_description: str = Form(...),
+    include_report: bool = Form(False),
+    batch_pipeline=Depends(get_batch_pipeline)
+):
+    """
+    Classe plusieurs candidatures pour une même offre d'emploi.
+    L'offre est analysée une seule fois, les CV sont traités en parallèle
+    (concurrence bornée) et classés par score global.
+    Le rapport LLM n'est généré que si `include_report` est activé.
+    """
+    cache_statuses = begin_cache_tracking()
+    try:
+        files = []
+        for cv in cvs:
+            upload = await ingest_upload(cv, allowed_extensions=settings.ALLOWED_EXTENSIONS | {'zip'})
+            files.append((upload.filename, upload.content))
+        logger.info(f"Batch analysis of {len(files)} uploaded file(s)")
+        result = await batch_pipeline.run(files, job_description, include_report=include_report)
+        response.headers["X-LLM-Cache"] = format_cache_statuses(cache_statuses)
+        return result
+
+    except UploadRejected as e:
+        logger.warning(f"Upload rejected: {e}")
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+    except StageTimeoutError as e:
+        logger.error(f"Timeout: {e}")
+        raise HTTPException(status_code=504, detail=str(e))
+
+    except ExtractionPoolSaturated as e:
+        logger.warning(f"Extraction pool saturated: {e}")
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+
+    except ValueError as e:
+        logger.error(f"Validation error: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+
+    except Exception as e:
+        logger.error(f"Internal error: {e}")
+        raise HTTPException(status_code=500, detail=f"Une erreur interne est survenue: {str(e)}")
+
+
+def _sse(event: str, data) -> str:
+    """Formate un événement Server-Sent Events."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+@router.post("/analyze/stream")
+async def analyze_application_stream(
+    cv: UploadFile = File(...),
+    job_description: str = Form(...),
+    mode: Optional[str] = Form(None, description="standard ou fused (ANALYSIS_MODE par défaut)"),
+    analysis_pipeline=Depends(get_analysis_pipeline)
+):
+    """
+    Variante progressive de /analyze au format Server-Sent Events.
+    Chaque étape est envoyée dès qu'elle est terminée (classification,
+    cv_analysis, job_analysis, matching), puis le rapport est transmis
+    fragment par fragment (`report`) et la réponse complète en fin de flux (`done`).
+    En cas d'échec, un événement `error` contient le code HTTP équivalent.
+    """
+    try:
+        upload = await ingest_upload(cv)
+    except UploadRejected as e:
+        logger.warning(f"Upload rejected: {e}")
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    logger.info(f"Processing file (stream): {upload.filename} ({upload.size} bytes, sha256 {upload.sha256[:12]})")
+    filename, content = upload.filename, upload.content
+
+    async def event_stream():
+        try:
+            async for event, data in analysis_pipeline.stream_events(
+                filename, content, job_description, mode, content_hash=upload.sha256
+            ):
+                if event == 'done':
+                    data = AnalysisResponse(**data).model_dump()
+                yield _sse(event, data)
+
+        except StageTimeoutError as e:
+            logger.error(f"Timeout: {e}")
+            yield _sse('error', {'status': 504, 'detail': str(e)})
+
+        except ExtractionPoolSaturated as e:
+            logger.warning(f"Extraction pool saturated: {e}")
+            yield _sse('error', {'status': 503, 'detail': str(e)})
+
+        except ValueError as e:
+            logger.error(f"Validation error: {e}")
+            yield _sse('error', {'status': 400, 'detail': str(e)})
+
+        except Exception as e:
+            logger.error(f"Internal error: {e}")
+            yield _sse('error', {'status': 500, 'detail': f"Une erreur interne est survenue: {str(e)}"})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.post("/analyze/jobs", response_model=AnalysisJob, status_code=202)
+async def submit_analysis_job(
+    response: Response,
+    cv: UploadFile = File(...),
+    job_description: str = Form(...),
+    priority: str = Form("normal", description="high, normal ou low"),
+    job_queue=Depends(get_job_queue)
+):
+    """
+    Mode asynchrone de /analyze : le job est mis en file et son identifiant
+    retourné immédiatement (202). Le résultat s'obtient ensuite par
+    GET /analyze/jobs/{id} (éventuellement en attente longue avec `wait`)
+    ou par abonnement SSE sur GET /analyze/jobs/{id}/events.
+    """
+    try:
+        upload = await ingest_upload(cv)
+        logger.info(f"Queueing file: {upload.filename} ({upload.size} bytes, sha256 {upload.sha256[:12]})")
+        job = await job_queue.submit(upload.filename, upload.content, job_description, priority)
+    except UploadRejected as e:
+        logger.warning(f"Upload rejected: {e}")
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    except JobQueueFull as e:
+        logger.warning(f"Job queue full: {e}")
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    response.headers["Location"] = f"{settings.API_V1_STR}/analyze/jobs/{job['id']}"
+    return job
+
+
+@router.get("/analyze/jobs/{job_id}", response_model=AnalysisJob)
+async def get_analysis_job(
+    job_id: str,
+    wait: float = Query(0, ge=0, le=60, description="Attente maximale (s) d'un changement de statut"),
+    job_queue=Depends(get_job_queue)
+):
+    """État d'un job d'analyse ; avec `wait`, la réponse est renvoyée dès que le statut change."""
+    job = await job_queue.wait(job_id, wait)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job d'analyse introuvable.")
+    return job
+
+
+@router.get("/analyze/jobs/{job_id}/events")
+async def stream_analysis_job(job_id: str, job_queue=Depends(get_job_queue)):
+    """
+    Abonnement SSE à un job : un événement `status` à chaque changement de
+    statut, puis `done` (réponse complète) ou `error` (code HTTP équivalent).
+    """
+    job = await job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job d'analyse introuvable.")
+
+    async def event_stream():
+        current = job
+        yield _sse('status', {'id': job_id, 'status': current['status']})
+        while current['status'] not in FINISHED_STATUSES:
+            updated = await job_queue.wait(job_id, 15, known_status=current['status'])
+            if updated is None:
+                return
+            if updated['status'] == current['status']:
+                # Commentaire SSE pour maintenir la connexion ouverte
+                yield ": keep-alive\n\n"
+                continue
+            current = updated
+            yield _sse('status', {'id': job_id, 'status': current['status']})
+
+        if current['status'] == COMPLETED:
+            yield _sse('done', current['result'])
+        else:
+            yield _sse('error', {'status': current['status_code'], 'detail': current['error']})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,90 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException
+from app.schemas.analysis import CandidateIndexResponse, CandidateSearchResponse
+from app.api.deps import get_analysis_pipeline, get_candidate_search, get_extraction_pool, get_llm_service
+from app.services.parsers.upload import UploadRejected, ingest_upload
+from app.services.parsers.worker_pool import ExtractionPoolSaturated
+from app.services.pipeline.runner import StageTimeoutError
+import logging
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+@router.post("/candidates", response_model=CandidateIndexResponse)
+async def index_candidate(
+    cv: UploadFile = File(...),
+    candidate_id: Optional[str] = Form(None),
+    analysis_pipeline=Depends(get_analysis_pipeline),
+    candidate_search=Depends(get_candidate_search),
+    extraction_pool=Depends(get_extraction_pool),
+    llm_service=Depends(get_llm_service)
+):
+    """
+    Analyse un CV et l'ajoute au vivier de candidats.
+    Sans identifiant fourni, le hash du fichier est utilisé (un même CV
+    soumis deux fois remplace l'entrée existante).
+    """
+    try:
+        upload = await ingest_upload(cv)
+        # Document déjà analysé : ni extraction, ni appel LLM
+        cv_data = analysis_pipeline.cached_cv_analysis(upload.sha256)
+        if cv_data is None:
+            cv_text = await extraction_pool.extract(upload.filename, upload.content)
+            if not cv_text:
+                raise ValueError("Impossible d'extraire du texte du fichier.")
+            cv_data = await llm_service.analyze_cv(await analysis_pipeline.preprocess(cv_text))
+            analysis_pipeline.remember_cv_analysis(upload.sha256, cv_data)
+        candidate_id = candidate_id or upload.sha256[:16]
+        await candidate_search.add_candidate(candidate_id, cv_data)
+
+        return CandidateIndexResponse(
+            candidate_id=candidate_id,
+            job_classification=cv_data.get('job_classification'),
+            indexed_candidates=len(candidate_search.index)
+        )
+
+    except UploadRejected as e:
+        logger.warning(f"Upload rejected: {e}")
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+    except ExtractionPoolSaturated as e:
+        logger.warning(f"Extraction pool saturated: {e}")
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+
+    except ValueError as e:
+        logger.error(f"Validation error: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+
+    except Exception as e:
+        logger.error(f"Internal error: {e}")
+        raise HTTPException(status_code=500, detail=f"Une erreur interne est survenue: {str(e)}")
+
+@router.post("/candidates/search", response_model=CandidateSearchResponse)
+async def search_candidates(
+    job_description: str = Form(...),
+    top_k: int = Form(10, ge=1, le=200),
+    approximate: bool = Form(False),
+    analysis_pipeline=Depends(get_analysis_pipeline),
+    candidate_search=Depends(get_candidate_search)
+):
+    """
+    Classe le vivier de candidats pour une offre d'emploi.
+    L'index vectoriel présélectionne les profils ; seul ce sous-ensemble
+    passe par le calcul de score exact.
+    """
+    try:
+        job_data = await analysis_pipeline.analyze_job(job_description)
+        result = await candidate_search.search(job_data, top_k=top_k, approximate=approximate)
+        return CandidateSearchResponse(job_analysis=job_data, **result)
+
+    except StageTimeoutError as e:
+        logger.error(f"Timeout: {e}")
+        raise HTTPException(status_code=504, detail=str(e))
+
+    except ValueError as e:
+        logger.error(f"Validation error: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+
+    except Exception as e:
+        logger.error(f"Internal error: {e}")
+        raise HTTPException(status_code=500, detail=f"Une erreur interne est survenue: {str(e)}")
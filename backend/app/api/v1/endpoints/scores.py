@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends, HTTPException
+from app.schemas.analysis import RescoreRequest, RescoreResponse
+from app.api.deps import get_matching_service
+import logging
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+@router.post("/scores/rescore", response_model=RescoreResponse)
+async def rescore(request: RescoreRequest, matching_service=Depends(get_matching_service)):
+    """
+    Recalcule les scores globaux et recommandations des candidatures déjà
+    analysées avec un nouveau profil de pondération (poids, seuils).
+    Aucun appel aux modèles : seuls les sous-scores enregistrés sont utilisés.
+    """
+    try:
+        return matching_service.rescore(
+            weights=request.weights,
+            thresholds=request.thresholds,
+            offer_id=request.offer_id,
+            top_k=request.top_k
+        )
+
+    except ValueError as e:
+        logger.error(f"Validation error: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+
+    except Exception as e:
+        logger.error(f"Internal error: {e}")
+        raise HTTPException(status_code=500, detail=f"Une erreur interne est survenue: {str(e)}")
@@ -11,6 +11,19 @@ class Settings:
     # Security
     MISTRAL_API_KEY: str = os.getenv("MISTRAL_API_KEY", "")
     MISTRAL_MODEL: str = os.getenv("MISTRAL_MODEL", "open-mixtral-8x7b")
+    MISTRAL_EMBED_MODEL: str = os.getenv("MISTRAL_EMBED_MODEL", "mistral-embed")
+    MISTRAL_BASE_URL: str = os.getenv("MISTRAL_BASE_URL", "https://api.mistral.ai/v1")
+
+    # Connexions à l'API Mistral : pool keep-alive partagé (chat + embeddings)
+    MISTRAL_TIMEOUT: float = float(os.getenv("MISTRAL_TIMEOUT", "120"))
+    MISTRAL_MAX_CONNECTIONS: int = int(os.getenv("MISTRAL_MAX_CONNECTIONS", "20"))
+    MISTRAL_MAX_KEEPALIVE: int = int(os.getenv("MISTRAL_MAX_KEEPALIVE", "10"))
+    MISTRAL_KEEPALIVE_EXPIRY: float = float(os.getenv("MISTRAL_KEEPALIVE_EXPIRY", "60"))
+    MISTRAL_HTTP2: bool = os.getenv("MISTRAL_HTTP2", "true").lower() in ("1", "true", "yes")
+    # Limiteur global : requêtes simultanées et débit en requêtes/s (0 = pas de limite)
+    MISTRAL_MAX_CONCURRENCY: int = int(os.getenv("MISTRAL_MAX_CONCURRENCY", "8"))
+    MISTRAL_RATE_LIMIT: float = float(os.getenv("MISTRAL_RATE_LIMIT", "5"))
+    MISTRAL_RATE_BURST: int = int(os.getenv("MISTRAL_RATE_BURST", "10"))
     
     # CORS Origins
     _origins_str = os.getenv("ALLOWED_ORIGINS", "")
@@ -25,9 +38,108 @@ class Settings:
         "https://skill-match-iota.vercel.app/"
     ]
     
+    # Démarrage : les services sont créés à la première requête ; avec
+    # WARMUP_ON_STARTUP, ils sont préchauffés en arrière-plan dès le démarrage
+    WARMUP_ON_STARTUP: bool = os.getenv("WARMUP_ON_STARTUP", "false").lower() in ("1", "true", "yes")
+
     # Parsing
     MAX_UPLOAD_SIZE: int = 5 * 1024 * 1024  # 5MB
+    # Archives ZIP de CV acceptées par /analyze/batch
+    MAX_ARCHIVE_SIZE: int = int(os.getenv("MAX_ARCHIVE_SIZE", str(50 * 1024 * 1024)))
     ALLOWED_EXTENSIONS: set = {"pdf", "docx", "txt"}
+    # Budget de caractères extraits par document (0 = illimité) et résolution OCR
+    EXTRACTION_MAX_CHARS: int = int(os.getenv("EXTRACTION_MAX_CHARS", "100000"))
+    OCR_DPI: int = int(os.getenv("OCR_DPI", "200"))
+
+    # Prétraitement du CV avant l'appel LLM (dédoublonnage, sections) et budget
+    # de tokens estimés envoyés au modèle (0 = pas de troncature)
+    CV_PREPROCESSING: bool = os.getenv("CV_PREPROCESSING", "true").lower() in ("1", "true", "yes")
+    CV_TOKEN_BUDGET: int = int(os.getenv("CV_TOKEN_BUDGET", "3000"))
+
+    # Extraction de texte hors boucle d'événements (mode : process ou thread ;
+    # 0 = valeur automatique : nombre de CPU, file = 4 x workers)
+    EXTRACTION_POOL_MODE: str = os.getenv("EXTRACTION_POOL_MODE", "process")
+    EXTRACTION_WORKERS: int = int(os.getenv("EXTRACTION_WORKERS", "0"))
+    EXTRACTION_QUEUE_SIZE: int = int(os.getenv("EXTRACTION_QUEUE_SIZE", "0"))
+
+    # Pipeline d'analyse : timeout par étape en secondes (0 = pas de limite)
+    EXTRACTION_TIMEOUT: float = float(os.getenv("EXTRACTION_TIMEOUT", "30"))
+    LLM_ANALYSIS_TIMEOUT: float = float(os.getenv("LLM_ANALYSIS_TIMEOUT", "60"))
+    MATCHING_TIMEOUT: float = float(os.getenv("MATCHING_TIMEOUT", "30"))
+    REPORT_TIMEOUT: float = float(os.getenv("REPORT_TIMEOUT", "90"))
+
+    # Mode d'analyse par défaut de /analyze : standard (trois appels LLM) ou
+    # fused (un seul appel d'extraction CV + offre, rapport généré localement)
+    ANALYSIS_MODE: str = os.getenv("ANALYSIS_MODE", "standard")
+
+    # Rapport d'évaluation : llm (toujours rédigé par le LLM), template (rendu
+    # local, sans appel LLM) ou threshold (LLM à partir de LLM_REPORT_MIN_SCORE)
+    REPORT_POLICY: str = os.getenv("REPORT_POLICY", "llm")
+    LLM_REPORT_MIN_SCORE: float = float(os.getenv("LLM_REPORT_MIN_SCORE", "80"))
+
+    # Cache des extractions LLM (backend : memory, sqlite ou none)
+    LLM_CACHE_BACKEND: str = os.getenv("LLM_CACHE_BACKEND", "memory")
+    LLM_CACHE_PATH: str = os.getenv("LLM_CACHE_PATH", ".cache/llm_results.sqlite3")
+    LLM_CACHE_TTL: float = float(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))
+    LLM_CACHE_MAX_ENTRIES: int = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000"))
+
+    # Analyse par lot (plusieurs CV pour une même offre)
+    BATCH_MAX_FILES: int = int(os.getenv("BATCH_MAX_FILES", "500"))
+    # Volume total décompressé des archives ZIP d'un lot
+    BATCH_MAX_UNCOMPRESSED_SIZE: int = int(os.getenv("BATCH_MAX_UNCOMPRESSED_SIZE", str(200 * 1024 * 1024)))
+    BATCH_CONCURRENCY: int = int(os.getenv("BATCH_CONCURRENCY", "8"))
+
+    # Mode asynchrone de /analyze : file de jobs (stockage : memory ou sqlite)
+    JOB_STORE_BACKEND: str = os.getenv("JOB_STORE_BACKEND", "memory").lower()
+    JOB_STORE_PATH: str = os.getenv("JOB_STORE_PATH", ".cache/analysis_jobs.sqlite3")
+    JOB_WORKERS: int = int(os.getenv("JOB_WORKERS", "4"))
+    JOB_QUEUE_SIZE: int = int(os.getenv("JOB_QUEUE_SIZE", "100"))
+    JOB_RESULT_TTL: float = float(os.getenv("JOB_RESULT_TTL", str(24 * 3600)))
+
+    # Index vectoriel du vivier de candidats (chemin vide = index en mémoire)
+    CANDIDATE_INDEX_PATH: str = os.getenv("CANDIDATE_INDEX_PATH", ".cache/candidate_index")
+    CANDIDATE_SHORTLIST_FACTOR: int = int(os.getenv("CANDIDATE_SHORTLIST_FACTOR", "5"))
+    CANDIDATE_INDEX_NPROBE: int = int(os.getenv("CANDIDATE_INDEX_NPROBE", "8"))
+    # Réentraînement de l'IVF quand le vivier a été multiplié par ce facteur
+    CANDIDATE_INDEX_RETRAIN_FACTOR: float = float(os.getenv("CANDIDATE_INDEX_RETRAIN_FACTOR", "2"))
+
+    # Fournisseurs d'embeddings : mistral, local (hachage de trigrammes, hors
+    # ligne) ou vocabulary (table précalculée en memory-map). Le fournisseur des
+    # compétences individuelles est par défaut celui des profils agrégés.
+    EMBEDDING_PROVIDER: str = os.getenv("EMBEDDING_PROVIDER", "mistral")
+    SKILL_EMBEDDING_PROVIDER: str = os.getenv("SKILL_EMBEDDING_PROVIDER", "")
+    LOCAL_EMBEDDING_DIM: int = int(os.getenv("LOCAL_EMBEDDING_DIM", "512"))
+    EMBEDDING_VOCABULARY_PATH: str = os.getenv("EMBEDDING_VOCABULARY_PATH", ".cache/skill_vocabulary")
+
+    # Référentiel de compétences (alias et hiérarchie) résolu avant les
+    # embeddings : vide = référentiel fourni, `none` = désactivé
+    SKILL_TAXONOMY_PATH: str = os.getenv("SKILL_TAXONOMY_PATH", "")
+
+    # Offres compilées pour le scoring (JobProfile), conservées par identifiant d'offre
+    JOB_PROFILE_CACHE_SIZE: int = int(os.getenv("JOB_PROFILE_CACHE_SIZE", "256"))
+
+    # Sous-scores par couple candidat-offre, pour le re-scoring sans appel aux
+    # modèles (chemin vide = mémoire seule, par défaut), dans la limite des
+    # couples les plus récents
+    SCORE_STORE_PATH: str = os.getenv("SCORE_STORE_PATH", "")
+    SCORE_STORE_MAX_ROWS: int = int(os.getenv("SCORE_STORE_MAX_ROWS", "100000"))
+
+    # Stockage analytique en colonnes des CV, offres et résultats (vide =
+    # désactivé, par défaut) ; sous-scores et compétences lus dans le stockage des scores
+    ANALYTICS_STORE_PATH: str = os.getenv("ANALYTICS_STORE_PATH", "")
+
+    # Micro-batching des appels d'embeddings distants : les textes des scorings
+    # simultanés sont regroupés pendant la fenêtre (ms, 0 = désactivé) ou
+    # jusqu'à la taille maximale d'un appel
+    EMBEDDING_BATCH_WINDOW_MS: float = float(os.getenv("EMBEDDING_BATCH_WINDOW_MS", "5"))
+    EMBEDDING_BATCH_MAX_SIZE: int = int(os.getenv("EMBEDDING_BATCH_MAX_SIZE", "256"))
+
+    # Cache d'embeddings (LRU mémoire + SQLite local ; chemin vide = mémoire seule)
+    EMBEDDING_CACHE_SIZE: int = int(os.getenv("EMBEDDING_CACHE_SIZE", "20000"))
+    EMBEDDING_CACHE_PATH: str = os.getenv("EMBEDDING_CACHE_PATH", ".cache/embeddings.sqlite3")
+
+    # Instrumentation : endpoint /metrics (format Prometheus) et en-tête Server-Timing
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
 
 settings = Settings()
 
@@ -0,0 +1,246 @@
+import bisect
+import contextvars
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from starlette.datastructures import MutableHeaders
+
+from app.core.config import settings
+
+LabelValues = Tuple[str, ...]
+
+
+class _Metric:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def _format_labels(self, key: LabelValues, extra: Optional[Tuple[str, str]] = None) -> str:
+        pairs = list(zip(self.labelnames, key))
+        if extra:
+            pairs.append(extra)
+        if not pairs:
+            return ""
+        escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+        return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+class Counter(_Metric):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        if not REGISTRY.enabled:
+            return
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{self._format_labels(key)} {value:g}")
+        return lines
+
+
+class Histogram(_Metric):
+    def __init__(self, name: str, documentation: str, buckets: Sequence[float], labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[LabelValues, List[float]] = {}  # [compte par bucket..., +Inf, somme]
+
+    def observe(self, value: float, **labels) -> None:
+        if not REGISTRY.enabled:
+            return
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0.0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                cumulative = 0.0
+                for bound, count in zip(self.buckets, series):
+                    cumulative += count
+                    lines.append(f"{self.name}_bucket{self._format_labels(key, ('le', f'{bound:g}'))} {cumulative:g}")
+                cumulative += series[len(self.buckets)]
+                lines.append(f"{self.name}_bucket{self._format_labels(key, ('le', '+Inf'))} {cumulative:g}")
+                lines.append(f"{self.name}_sum{self._format_labels(key)} {series[-1]:g}")
+                lines.append(f"{self.name}_count{self._format_labels(key)} {cumulative:g}")
+        return lines
+
+
+class MetricsRegistry:
+    """Registre minimal de métriques au format texte Prometheus."""
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._metrics: List[_Metric] = []
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, documentation: str, buckets: Sequence[float], labelnames: Sequence[str] = ()) -> Histogram:
+        metric = Histogram(name, documentation, buckets, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry(enabled=settings.METRICS_ENABLED)
+
+STAGE_DURATION = REGISTRY.histogram(
+    "skillmatch_stage_duration_seconds",
+    "Durée des étapes d'analyse (extraction, appels LLM, matching, rapport).",
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60),
+    labelnames=("stage",)
+)
+LLM_TOKENS = REGISTRY.histogram(
+    "skillmatch_llm_tokens",
+    "Tokens consommés par appel LLM.",
+    buckets=(100, 250, 500, 1000, 2000, 4000, 8000, 16000, 32000),
+    labelnames=("operation", "type")
+)
+EMBEDDING_BATCH_SIZE = REGISTRY.histogram(
+    "skillmatch_embedding_batch_size",
+    "Nombre de textes envoyés par appel au fournisseur d'embeddings.",
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500),
+    labelnames=("provider",)
+)
+EMBEDDING_QUEUE_WAIT = REGISTRY.histogram(
+    "skillmatch_embedding_queue_wait_seconds",
+    "Attente d'un texte dans le micro-batch d'embeddings avant l'appel au fournisseur.",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1),
+    labelnames=("provider",)
+)
+LLM_QUEUE_WAIT = REGISTRY.histogram(
+    "skillmatch_llm_queue_wait_seconds",
+    "Attente locale avant envoi d'une requête à l'API Mistral (limiteur de débit).",
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+COALESCED_CALLS = REGISTRY.counter(
+    "skillmatch_coalesced_calls_total",
+    "Appels évités car un appel identique était déjà en cours (single-flight).",
+    labelnames=("operation",)
+)
+CACHE_REQUESTS = REGISTRY.counter(
+    "skillmatch_cache_requests_total",
+    "Consultations des caches, par cache et résultat (hit/miss).",
+    labelnames=("cache", "result")
+)
+REPORTS = REGISTRY.counter(
+    "skillmatch_reports_total",
+    "Rapports générés, par moteur (llm ou template).",
+    labelnames=("renderer",)
+)
+CV_TOKENS = REGISTRY.histogram(
+    "skillmatch_cv_tokens",
+    "Tokens estimés du texte de CV avant (raw) et après (preprocessed) prétraitement.",
+    buckets=(250, 500, 1000, 2000, 3000, 4000, 6000, 8000, 16000, 32000),
+    labelnames=("stage",)
+)
+
+
+# --- Minuteurs d'étapes ---
+
+_server_timings: contextvars.ContextVar[Optional[List[Tuple[str, float]]]] = contextvars.ContextVar(
+    "server_timings", default=None
+)
+
+
+@contextmanager
+def stage_timer(stage: str):
+    """Mesure la durée d'un bloc : histogramme global et en-tête Server-Timing de la requête."""
+    if not REGISTRY.enabled:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_DURATION.observe(elapsed, stage=stage)
+        timings = _server_timings.get()
+        if timings is not None:
+            timings.append((stage, elapsed))
+
+
+def timed(stage: str):
+    """Décorateur de stage_timer pour les coroutines."""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if not REGISTRY.enabled:
+                return await func(*args, **kwargs)
+            with stage_timer(stage):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record_token_usage(operation: str, message) -> None:
+    """Enregistre les tokens d'un message LangChain (usage_metadata), s'ils sont fournis."""
+    if not REGISTRY.enabled:
+        return
+    usage = getattr(message, "usage_metadata", None) or {}
+    for token_type in ("input_tokens", "output_tokens"):
+        if usage.get(token_type):
+            LLM_TOKENS.observe(usage[token_type], operation=operation, type=token_type.replace("_tokens", ""))
+
+
+class ServerTimingMiddleware:
+    """
+    Middleware ASGI : collecte les durées des étapes exécutées pendant la
+    requête et les renvoie dans l'en-tête `Server-Timing` (durées cumulées
+    par étape, plus `total`).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not REGISTRY.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        timings: List[Tuple[str, float]] = []
+        token = _server_timings.set(timings)
+        start = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                totals: Dict[str, float] = {}
+                for stage, elapsed in timings:
+                    totals[stage] = totals.get(stage, 0.0) + elapsed
+                entries = [f"{stage};dur={elapsed * 1000:.1f}" for stage, elapsed in totals.items()]
+                entries.append(f"total;dur={(time.perf_counter() - start) * 1000:.1f}")
+                MutableHeaders(scope=message).append("Server-Timing", ", ".join(entries))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _server_timings.reset(token)
@@ -0,0 +1,68 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+
+from app.core.metrics import COALESCED_CALLS
+
+
+class _Call:
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Regroupement des appels identiques simultanés (« single-flight ») :
+    tant qu'un appel est en cours pour une clé, les demandes suivantes
+    attendent son résultat au lieu de relancer le même appel.
+
+    L'appel partagé s'exécute dans sa propre tâche : l'annulation d'un
+    demandeur (client déconnecté) n'interrompt pas les autres ; la tâche
+    n'est annulée que si plus personne ne l'attend.
+    """
+
+    def __init__(self, operation: str):
+        self.operation = operation
+        self._calls: Dict[str, _Call] = {}
+
+    def in_flight(self, key: str) -> bool:
+        return key in self._calls
+
+    def get(self, key: str) -> Optional[asyncio.Task]:
+        call = self._calls.get(key)
+        return call.task if call else None
+
+    def start(self, keys: Iterable[str], coro: Awaitable) -> asyncio.Task:
+        """Lance `coro` et l'enregistre sous chacune des `keys` jusqu'à sa fin."""
+        call = _Call(asyncio.ensure_future(coro))
+        keys = list(keys)
+        for key in keys:
+            self._calls[key] = call
+
+        def forget(_task, keys=keys, call=call):
+            for key in keys:
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+
+        call.task.add_done_callback(forget)
+        return call.task
+
+    def record_coalesced(self, count: int = 1) -> None:
+        COALESCED_CALLS.inc(count, operation=self.operation)
+
+    async def do(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Exécute `func()` ou rejoint l'appel déjà en cours pour `key`."""
+        call = self._calls.get(key)
+        if call is None:
+            self.start([key], func())
+            call = self._calls[key]
+        else:
+            self.record_coalesced()
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                call.task.cancel()
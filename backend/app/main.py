@@ -1,14 +1,37 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from app.core.config import settings
+from app.core.metrics import REGISTRY, ServerTimingMiddleware
 from app.api.v1.api import api_router
+from app.api.deps import get_job_queue, shutdown, warm_up
+from app.services.parsers.upload import UploadSizeLimitMiddleware
 import logging
 
 # Configuration du logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Services créés à la première requête (voir deps) ; les workers des jobs
+    # d'analyse démarrent à la première soumission, sauf s'il faut reprendre
+    # les jobs non terminés du stockage SQLite
+    if settings.JOB_STORE_BACKEND == "sqlite":
+        job_queue = await asyncio.to_thread(get_job_queue)
+        await job_queue.start()
+    warmup = asyncio.create_task(warm_up()) if settings.WARMUP_ON_STARTUP else None
+    yield
+    if warmup is not None and not warmup.done():
+        warmup.cancel()
+        await asyncio.gather(warmup, return_exceptions=True)
+    # Arrêt des workers et fermeture des connexions Mistral
+    await shutdown()
+
 app = FastAPI(
+    lifespan=lifespan,
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
     description="API pour l'analyse automatisée de candidatures par Skill-Match, l'Agent IA spécialisé en Ressources Humaines.",
@@ -17,6 +40,12 @@ app = FastAPI(
 # Log des origines autorisées au démarrage
 logger.info(f"CORS Allowed Origins: {settings.ALLOWED_ORIGINS}")
 
+# Durées des étapes renvoyées dans l'en-tête Server-Timing
+app.add_middleware(ServerTimingMiddleware)
+
+# Taille des envois de fichiers bornée pendant la réception du corps
+app.add_middleware(UploadSizeLimitMiddleware)
+
 # Configuration CORS
 app.add_middleware(
     CORSMiddleware,
@@ -24,6 +53,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-LLM-Cache", "Server-Timing"],
 )
 
 app.include_router(api_router, prefix=settings.API_V1_STR)
@@ -35,3 +65,8 @@ async def root():
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Métriques au format texte Prometheus (latences par étape, tokens, embeddings, caches)."""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
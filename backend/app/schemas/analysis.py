@@ -43,17 +43,32 @@ class JobDescriptionAnalysis(BaseModel):
     required_experience_level: str
     required_languages: List[str]
 
+class FusedExtractionResult(BaseModel):
+    cv: CVExtractionResult = Field(..., description="Extraction du CV")
+    job: JobDescriptionAnalysis = Field(..., description="Exigences de l'offre d'emploi")
+
 class MatchingDetails(BaseModel):
     skills_score: float
     experience_score: float
     technologies_score: float
     soft_skills_score: float
 
+class SkillMatchDetail(BaseModel):
+    skill: str = Field(..., description="Compétence requise par l'offre")
+    matched: bool
+    best_match: Optional[str] = Field(None, description="Compétence du CV la plus proche")
+    similarity: float = Field(..., description="Similarité cosinus avec la meilleure correspondance")
+
 class MatchingResult(BaseModel):
+    candidate_id: Optional[str] = Field(None, description="Identifiant du candidat pour le re-scoring")
+    offer_id: Optional[str] = Field(None, description="Identifiant de l'offre pour le re-scoring")
     overall_score: float
     recommendation: str = Field(..., description="strongly_recommended, recommended, not_recommended")
     matched_skills: List[str]
     missing_skills: List[str]
+    skill_matches: List[SkillMatchDetail] = Field(default=[], description="Détail du rapprochement par compétence requise")
+    strengths: List[str] = Field(default=[], description="Points forts identifiés par le scoring")
+    concerns: List[str] = Field(default=[], description="Points de vigilance identifiés par le scoring")
     details: MatchingDetails
 
 class AnalysisResponse(BaseModel):
@@ -61,3 +76,85 @@ class AnalysisResponse(BaseModel):
     cv_analysis: CVAnalysis
     matching: MatchingResult
     report: str = Field(..., description="Rapport complet au format Markdown")
+
+class RescoreRequest(BaseModel):
+    offer_id: Optional[str] = Field(None, description="Limiter le re-scoring aux candidats d'une offre")
+    weights: Optional[Dict[str, float]] = Field(None, description="technical_skills, soft_skills, experience, technologies")
+    thresholds: Optional[Dict[str, float]] = Field(None, description="strongly_recommended, consider")
+    top_k: Optional[int] = Field(None, ge=1, description="Nombre de résultats retournés (tous par défaut)")
+
+class RescoredCandidate(BaseModel):
+    candidate_id: str
+    offer_id: str
+    rank: int
+    overall_score: float
+    recommendation: str
+    matched_skills: List[str]
+    missing_skills: List[str]
+    details: MatchingDetails
+
+class RescoreResponse(BaseModel):
+    total: int = Field(..., description="Nombre de couples candidat-offre re-scorés")
+    weights: Dict[str, float] = Field(..., description="Poids appliqués (somme ramenée à 1)")
+    thresholds: Dict[str, float]
+    results: List[RescoredCandidate]
+
+class AnalyticsMatch(BaseModel):
+    candidate_id: str
+    offer_id: str
+    overall_score: float
+    recommendation: str
+    details: MatchingDetails
+    matched_skills: List[str]
+    missing_skills: List[str]
+    recorded_at: float
+
+class AnalyticsMatchesResponse(BaseModel):
+    count: int
+    results: List[AnalyticsMatch]
+
+class AnalysisJob(BaseModel):
+    id: str
+    status: str = Field(..., description="queued, running, completed ou failed")
+    priority: str = Field(..., description="high, normal ou low")
+    filename: Optional[str] = None
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[AnalysisResponse] = Field(None, description="Résultat de l'analyse (job terminé)")
+    error: Optional[str] = None
+    status_code: Optional[int] = Field(None, description="Code HTTP équivalent en cas d'échec")
+
+class CandidateRanking(BaseModel):
+    filename: str
+    rank: Optional[int] = Field(None, description="Rang par score global (absent en cas d'échec)")
+    job_classification: Optional[JobClassification] = None
+    matching: Optional[MatchingResult] = None
+    report: Optional[str] = Field(None, description="Rapport Markdown, si demandé")
+    error: Optional[str] = None
+
+class BatchAnalysisResponse(BaseModel):
+    job_analysis: JobDescriptionAnalysis
+    total: int
+    succeeded: int
+    failed: int
+    candidates: List[CandidateRanking]
+
+class CandidateIndexResponse(BaseModel):
+    candidate_id: str
+    job_classification: JobClassification
+    indexed_candidates: int
+
+class CandidateSearchResult(BaseModel):
+    candidate_id: str
+    rank: int
+    estimated_score: float = Field(..., description="Score estimé par l'index avant calcul exact")
+    job_classification: Optional[JobClassification] = None
+    matching: MatchingResult
+
+class CandidateSearchResponse(BaseModel):
+    job_analysis: JobDescriptionAnalysis
+    indexed_candidates: int
+    shortlisted: int
+    approximate: bool
+    results: List[CandidateSearchResult]
@@ -0,0 +1,150 @@
+import os
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class StringDictionary:
+    """
+    Dictionnaire de chaînes append-only (une chaîne par ligne) : chaque valeur
+    reçoit l'identifiant entier de sa ligne, utilisé dans les colonnes.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._values: List[str] = []
+        self._ids: Dict[str, int] = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    self._register(line.rstrip("\n"))
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def _register(self, value: str) -> int:
+        self._ids[value] = len(self._values)
+        self._values.append(value)
+        return self._ids[value]
+
+    def get(self, value: str) -> Optional[int]:
+        return self._ids.get(value)
+
+    def encode(self, value: str) -> int:
+        """Identifiant d'une valeur, ajoutée au dictionnaire si nécessaire."""
+        value = " ".join(value.splitlines())
+        known = self._ids.get(value)
+        if known is not None:
+            return known
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(value + "\n")
+        return self._register(value)
+
+    def decode(self, ids: Iterable[int]) -> List[str]:
+        return [self._values[i] for i in ids]
+
+
+class ColumnTable:
+    """
+    Table en colonnes append-only : un fichier binaire par colonne (dtype
+    fixe), relu par memory-map. Les colonnes de listes (identifiants de
+    compétences) sont stockées en CSR : longueur par ligne + valeurs à plat.
+
+    Une ligne n'est visible qu'une fois toutes ses colonnes écrites : au
+    chargement, les octets d'une ligne incomplète (arrêt brutal) sont tronqués.
+    """
+
+    def __init__(self, path: str, columns: Dict[str, str], list_columns: Sequence[str] = ()):
+        self.path = path
+        self.columns = {name: np.dtype(dtype) for name, dtype in columns.items()}
+        self.list_columns = tuple(list_columns)
+        self._cache: Dict[str, np.ndarray] = {}
+        os.makedirs(path, exist_ok=True)
+        self._size = self._recover()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, f"{name}.bin")
+
+    def _rows_in(self, name: str, dtype: np.dtype) -> int:
+        path = self._file(name)
+        return os.path.getsize(path) // dtype.itemsize if os.path.exists(path) else 0
+
+    def _recover(self) -> int:
+        lengths_dtype = np.dtype(np.int32)
+        size = min(
+            [self._rows_in(name, dtype) for name, dtype in self.columns.items()] +
+            [self._rows_in(f"{name}.lengths", lengths_dtype) for name in self.list_columns]
+        )
+        for name, dtype in self.columns.items():
+            self._truncate(self._file(name), size * dtype.itemsize)
+        for name in self.list_columns:
+            self._truncate(self._file(f"{name}.lengths"), size * lengths_dtype.itemsize)
+            values = int(self._map(f"{name}.lengths", lengths_dtype, size).sum()) if size else 0
+            self._truncate(self._file(f"{name}.values"), values * np.dtype(np.int32).itemsize)
+        return size
+
+    @staticmethod
+    def _truncate(path: str, expected: int) -> None:
+        if os.path.exists(path) and os.path.getsize(path) > expected:
+            with open(path, "r+b") as f:
+                f.truncate(expected)
+
+    def _map(self, name: str, dtype: np.dtype, rows: int) -> np.ndarray:
+        if rows == 0:
+            return np.zeros(0, dtype=dtype)
+        return np.memmap(self._file(name), dtype=dtype, mode="r", shape=(rows,))
+
+    def append(self, row: dict) -> None:
+        """Ajoute une ligne (valeurs scalaires et listes d'identifiants)."""
+        self.append_many([row])
+
+    def append_many(self, rows: List[dict]) -> None:
+        """Ajoute des lignes en un seul passage : chaque fichier de colonne est ouvert une fois."""
+        if not rows:
+            return
+        # Valeurs des listes d'abord, colonnes scalaires ensuite : une ligne
+        # n'est comptée qu'une fois entièrement écrite
+        for name in self.list_columns:
+            lists = [np.asarray(row[name], dtype=np.int32) for row in rows]
+            with open(self._file(f"{name}.values"), "ab") as f:
+                f.write(np.concatenate(lists).tobytes())
+            with open(self._file(f"{name}.lengths"), "ab") as f:
+                f.write(np.array([ids.size for ids in lists], dtype=np.int32).tobytes())
+        for name, dtype in self.columns.items():
+            with open(self._file(name), "ab") as f:
+                f.write(np.asarray([row[name] for row in rows], dtype=dtype).tobytes())
+        self._size += len(rows)
+        self._cache.clear()
+
+    def column(self, name: str) -> np.ndarray:
+        """Colonne scalaire en memory-map (lecture seule)."""
+        if name not in self._cache:
+            self._cache[name] = self._map(name, self.columns[name], self._size)
+        return self._cache[name]
+
+    def list_column(self, name: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Colonne de listes : (offsets de taille n + 1, valeurs à plat)."""
+        key = f"{name}.csr"
+        if key not in self._cache:
+            lengths = self._map(f"{name}.lengths", np.dtype(np.int32), self._size)
+            offsets = np.zeros(self._size + 1, dtype=np.int64)
+            np.cumsum(lengths, out=offsets[1:])
+            values = self._map(f"{name}.values", np.dtype(np.int32), int(offsets[-1]))
+            self._cache[key] = (offsets, values)
+        return self._cache[key]
+
+    def rows_containing(self, name: str, value: int) -> np.ndarray:
+        """Masque des lignes dont la liste `name` contient `value`."""
+        offsets, values = self.list_column(name)
+        mask = np.zeros(self._size, dtype=bool)
+        hits = np.flatnonzero(values == value)
+        if hits.size:
+            mask[np.searchsorted(offsets, hits, side="right") - 1] = True
+        return mask
+
+    def list_values(self, name: str, row: int) -> np.ndarray:
+        offsets, values = self.list_column(name)
+        return values[offsets[row]:offsets[row + 1]]
@@ -0,0 +1,262 @@
+import logging
+import os
+import queue
+import threading
+import time
+from typing import List, Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.analytics.columnar import ColumnTable, StringDictionary
+from app.services.matching.embedding_cache import normalize_text
+from app.services.matching.job_profile import content_id
+from app.services.matching.score_store import ScoreStore
+
+logger = logging.getLogger(__name__)
+
+
+class AnalyticsStore:
+    """
+    Persistance locale des analyses pour les tableaux de bord : CV analysés,
+    offres et historique des résultats de matching, en colonnes NumPy
+    append-only relues par memory-map (aucun blob JSON à désérialiser).
+
+    Les chaînes répétées (identifiants, compétences, métiers, séniorités,
+    recommandations) sont encodées par dictionnaire ; les listes de
+    compétences sont des colonnes CSR d'identifiants. Un filtre comme
+    « score > 70 et Kubernetes manquant » est une combinaison de masques.
+
+    Un résultat de matching ne conserve ici que le score global, la
+    recommandation et sa date : les sous-scores et les compétences
+    trouvées/manquantes sont ceux du `score_store` du service de matching
+    (dernier résultat de chaque couple), qui reste leur seul stockage.
+
+    `record` ne fait que mettre le résultat en file : un thread dédié écrit
+    les lignes en attente par lots, hors de la boucle d'événements.
+
+    Arborescence de `path` : `dictionaries/*.txt`, `cvs/`, `offers/`, `matches/`.
+    """
+
+    def __init__(self, path: str, score_store: Optional[ScoreStore] = None):
+        self.path = path
+        self.score_store = score_store if score_store is not None else ScoreStore()
+        self._lock = threading.Lock()
+
+        dictionaries = os.path.join(path, "dictionaries")
+        os.makedirs(dictionaries, exist_ok=True)
+        self.candidate_ids = StringDictionary(os.path.join(dictionaries, "candidates.txt"))
+        self.offer_ids = StringDictionary(os.path.join(dictionaries, "offers.txt"))
+        self.skills = StringDictionary(os.path.join(dictionaries, "skills.txt"))
+        self.labels = StringDictionary(os.path.join(dictionaries, "labels.txt"))
+
+        self.cvs = ColumnTable(os.path.join(path, "cvs"), {
+            "candidate": "int32",
+            "job_title": "int32",
+            "confidence": "float32",
+            "seniority": "int32",
+            "recorded_at": "float64",
+        }, list_columns=("skills",))
+        self.offers = ColumnTable(os.path.join(path, "offers"), {
+            "offer": "int32",
+            "experience_level": "int32",
+            "recorded_at": "float64",
+        }, list_columns=("skills",))
+        self.matches = ColumnTable(os.path.join(path, "matches"), {
+            "candidate": "int32",
+            "offer": "int32",
+            "overall_score": "float32",
+            "recommendation": "int32",
+            "recorded_at": "float64",
+        })
+
+        if len(self.matches):
+            logger.info(f"Stockage analytique chargé : {len(self.matches)} résultats de matching ({path})")
+
+        self._writes: "queue.Queue" = queue.Queue()
+        self._writer: Optional[threading.Thread] = threading.Thread(
+            target=self._write_loop, name="analytics-writer", daemon=True
+        )
+        self._writer.start()
+
+    def _skill_ids(self, skills: List[str]) -> List[int]:
+        return [self.skills.encode(normalize_text(s)) for s in skills if s and s.strip()]
+
+    def record(self, cv_data: dict, job_data: dict, matching: dict) -> None:
+        """
+        Ajoute un résultat de matching ; le CV et l'offre ne sont ajoutés
+        qu'à leur première apparition (identifiants du matching, ou hash).
+        L'écriture est différée (voir `flush`).
+        """
+        self._writes.put((cv_data, job_data, matching, time.time()))
+
+    def _write_loop(self) -> None:
+        while True:
+            batch = [self._writes.get()]
+            while True:
+                try:
+                    batch.append(self._writes.get_nowait())
+                except queue.Empty:
+                    break
+            entries = [entry for entry in batch if entry is not None]
+            if entries:
+                try:
+                    with self._lock:
+                        self._append(entries)
+                except Exception as e:
+                    logger.warning(f"Enregistrement analytique de {len(entries)} résultat(s) impossible: {e}")
+            for _ in batch:
+                self._writes.task_done()
+            if len(entries) < len(batch):
+                return
+
+    def _append(self, entries) -> None:
+        cvs, offers, matches = [], [], []
+        for cv_data, job_data, matching, now in entries:
+            cv = cv_data.get('cv_analysis') or {}
+            classification = cv_data.get('job_classification') or {}
+
+            known_candidates = len(self.candidate_ids)
+            candidate = self.candidate_ids.encode(matching.get('candidate_id') or content_id(cv_data))
+            if candidate == known_candidates:
+                cvs.append({
+                    "candidate": candidate,
+                    "job_title": self.labels.encode(classification.get('job_title') or ""),
+                    "confidence": classification.get('confidence') or 0.0,
+                    "seniority": self.labels.encode(normalize_text(cv.get('seniority') or "")),
+                    "recorded_at": now,
+                    "skills": self._skill_ids((cv.get('technical_skills') or []) + (cv.get('soft_skills') or [])),
+                })
+
+            known_offers = len(self.offer_ids)
+            offer = self.offer_ids.encode(matching.get('offer_id') or content_id(job_data))
+            if offer == known_offers:
+                offers.append({
+                    "offer": offer,
+                    "experience_level": self.labels.encode(normalize_text(job_data.get('required_experience_level') or "")),
+                    "recorded_at": now,
+                    "skills": self._skill_ids(
+                        (job_data.get('required_technical_skills') or []) + (job_data.get('required_soft_skills') or [])
+                    ),
+                })
+
+            matches.append({
+                "candidate": candidate,
+                "offer": offer,
+                "overall_score": matching.get('overall_score', 0.0),
+                "recommendation": self.labels.encode(matching.get('recommendation') or ""),
+                "recorded_at": now,
+            })
+
+        self.cvs.append_many(cvs)
+        self.offers.append_many(offers)
+        self.matches.append_many(matches)
+
+    def flush(self) -> None:
+        """Attend l'écriture des résultats enregistrés."""
+        if self._writer is not None:
+            self._writes.join()
+
+    def close(self) -> None:
+        """Écrit les résultats en attente et arrête le thread d'écriture."""
+        if self._writer is None:
+            return
+        self._writes.put(None)
+        self._writer.join()
+        self._writer = None
+
+    def _latest(self) -> np.ndarray:
+        """Masque du dernier résultat de chaque couple candidat-offre."""
+        keys = self.matches.column("candidate").astype(np.int64) * max(1, len(self.offer_ids)) + self.matches.column("offer")
+        _, first_from_end = np.unique(keys[::-1], return_index=True)
+        mask = np.zeros(len(keys), dtype=bool)
+        mask[len(keys) - 1 - first_from_end] = True
+        return mask
+
+    def scan(
+        self,
+        min_score: Optional[float] = None,
+        max_score: Optional[float] = None,
+        offer_id: Optional[str] = None,
+        candidate_id: Optional[str] = None,
+        matched: Optional[List[str]] = None,
+        missing: Optional[List[str]] = None,
+        recommendation: Optional[str] = None,
+        latest_only: bool = True,
+        limit: Optional[int] = None
+    ) -> List[dict]:
+        """
+        Résultats de matching filtrés, par score décroissant. Les filtres de
+        compétences exigent la présence de toutes les compétences listées,
+        d'après le dernier résultat du couple dans le `score_store` ; les
+        couples qu'il ne conserve plus sont ignorés.
+        """
+        required = [
+            (key, {normalize_text(skill) for skill in skills or []})
+            for key, skills in (('matched_skills', matched), ('missing_skills', missing))
+        ]
+        with self._lock:
+            if not len(self.matches):
+                return []
+            overall = self.matches.column("overall_score")
+            mask = np.ones(len(overall), dtype=bool)
+            if min_score is not None:
+                mask &= overall >= min_score
+            if max_score is not None:
+                mask &= overall <= max_score
+
+            for column, dictionary, value in (
+                ("offer", self.offer_ids, offer_id),
+                ("candidate", self.candidate_ids, candidate_id),
+                ("recommendation", self.labels, recommendation),
+            ):
+                if value is None:
+                    continue
+                code = dictionary.get(value)
+                if code is None:
+                    return []
+                mask &= self.matches.column(column) == code
+
+            if latest_only:
+                mask &= self._latest()
+
+            rows = np.flatnonzero(mask)
+            rows = rows[np.argsort(-overall[rows], kind="stable")]
+            results = []
+            for row in rows.tolist():
+                match = self._match(row)
+                if match is None or any(
+                    not skills <= {normalize_text(s) for s in match[key]} for key, skills in required
+                ):
+                    continue
+                results.append(match)
+                if limit is not None and len(results) >= limit:
+                    break
+            return results
+
+    def _match(self, row: int) -> Optional[dict]:
+        column = self.matches.column
+        candidate_id = self.candidate_ids.decode([column("candidate")[row]])[0]
+        offer_id = self.offer_ids.decode([column("offer")[row]])[0]
+        pair = self.score_store.pair(candidate_id, offer_id)
+        if pair is None:
+            return None
+        return {
+            'candidate_id': candidate_id,
+            'offer_id': offer_id,
+            'overall_score': round(float(column("overall_score")[row]), 1),
+            'recommendation': self.labels.decode([column("recommendation")[row]])[0],
+            **pair,
+            'recorded_at': float(column("recorded_at")[row]),
+        }
+
+
+def build_analytics_store(score_store: Optional[ScoreStore] = None) -> Optional[AnalyticsStore]:
+    """Stockage analytique configuré (ANALYTICS_STORE_PATH vide = désactivé, par défaut)."""
+    if not settings.ANALYTICS_STORE_PATH:
+        return None
+    try:
+        return AnalyticsStore(settings.ANALYTICS_STORE_PATH, score_store)
+    except OSError as e:
+        logger.warning(f"Stockage analytique indisponible ({settings.ANALYTICS_STORE_PATH}): {e}")
+        return None
@@ -0,0 +1,169 @@
+import logging
+from typing import Callable, Optional
+
+import httpx
+
+from app.core.config import settings
+from app.services.llm.rate_limiter import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Corps de réponse qui libère la place du limiteur à sa fermeture (réponses streamées comprises)."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release: Callable[[], None]):
+        self._stream = stream
+        self._release: Optional[Callable[[], None]] = release
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            self._release_once()
+
+    def _release_once(self) -> None:
+        if self._release is not None:
+            self._release()
+            self._release = None
+
+
+class _ReleasingSyncStream(httpx.SyncByteStream):
+    """Équivalent synchrone de _ReleasingStream."""
+
+    def __init__(self, stream: httpx.SyncByteStream, release: Callable[[], None]):
+        self._stream = stream
+        self._release: Optional[Callable[[], None]] = release
+
+    def __iter__(self):
+        yield from self._stream
+
+    def close(self) -> None:
+        try:
+            self._stream.close()
+        finally:
+            if self._release is not None:
+                self._release()
+                self._release = None
+
+
+class RateLimitedTransport(httpx.AsyncBaseTransport):
+    """Transport httpx qui fait passer chaque requête par le limiteur global."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, limiter: RateLimiter):
+        self._transport = transport
+        self.limiter = limiter
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await self.limiter.acquire()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            self.limiter.release()
+            raise
+        response.stream = _ReleasingStream(response.stream, self.limiter.release)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class RateLimitedSyncTransport(httpx.BaseTransport):
+    """Transport httpx synchrone soumis au même limiteur (appels bloquants des clients LangChain)."""
+
+    def __init__(self, transport: httpx.BaseTransport, limiter: RateLimiter):
+        self._transport = transport
+        self.limiter = limiter
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        self.limiter.acquire_sync()
+        try:
+            response = self._transport.handle_request(request)
+        except BaseException:
+            self.limiter.release_sync()
+            raise
+        response.stream = _ReleasingSyncStream(response.stream, self.limiter.release_sync)
+        return response
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+class MistralHTTPClients:
+    """
+    Clients HTTP partagés par ChatMistralAI et MistralAIEmbeddings : un seul
+    pool de connexions keep-alive (HTTP/2 si le paquet `h2` est installé) et
+    un limiteur de débit commun aux appels de chat et d'embeddings, clients
+    asynchrone et synchrone compris.
+    Les clients sont créés au premier usage.
+    """
+
+    def __init__(self):
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._sync_client: Optional[httpx.Client] = None
+        self.limiter = RateLimiter(
+            max_concurrency=settings.MISTRAL_MAX_CONCURRENCY,
+            rate=settings.MISTRAL_RATE_LIMIT,
+            burst=settings.MISTRAL_RATE_BURST
+        )
+
+    def _options(self) -> dict:
+        http2 = settings.MISTRAL_HTTP2 and _http2_available()
+        if settings.MISTRAL_HTTP2 and not http2:
+            logger.warning("Paquet h2 absent : connexions Mistral en HTTP/1.1")
+        return {
+            "http2": http2,
+            "limits": httpx.Limits(
+                max_connections=settings.MISTRAL_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.MISTRAL_MAX_KEEPALIVE,
+                keepalive_expiry=settings.MISTRAL_KEEPALIVE_EXPIRY
+            ),
+        }
+
+    def _client_kwargs(self) -> dict:
+        return {
+            "base_url": settings.MISTRAL_BASE_URL,
+            "headers": {
+                "Content-Type": "application/json",
+                "Accept": "application/json",
+                "Authorization": f"Bearer {settings.MISTRAL_API_KEY}",
+            },
+            "timeout": settings.MISTRAL_TIMEOUT,
+        }
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        if self._async_client is None:
+            transport = RateLimitedTransport(httpx.AsyncHTTPTransport(**self._options()), self.limiter)
+            self._async_client = httpx.AsyncClient(transport=transport, **self._client_kwargs())
+        return self._async_client
+
+    @property
+    def sync_client(self) -> httpx.Client:
+        if self._sync_client is None:
+            transport = RateLimitedSyncTransport(httpx.HTTPTransport(**self._options()), self.limiter)
+            self._sync_client = httpx.Client(transport=transport, **self._client_kwargs())
+        return self._sync_client
+
+    async def aclose(self) -> None:
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+        if self._sync_client is not None:
+            self._sync_client.close()
+            self._sync_client = None
+
+
+mistral_http = MistralHTTPClients()
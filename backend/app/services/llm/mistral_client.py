@@ -1,8 +1,24 @@
-from langchain_mistralai import ChatMistralAI
+import copy
+import logging
+from typing import AsyncIterator, Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
 from langchain_core.prompts import ChatPromptTemplate
 
 from app.core.config import settings
-from app.schemas.analysis import CVExtractionResult, JobDescriptionAnalysis
+from app.core.metrics import REGISTRY, record_token_usage, timed
+from app.core.singleflight import SingleFlight
+from app.schemas.analysis import CVExtractionResult, FusedExtractionResult, JobDescriptionAnalysis
+from app.services.llm.http_client import mistral_http
+from app.services.llm.result_cache import build_result_cache, record_cache_status, result_cache_key
+
+logger = logging.getLogger(__name__)
+
+# Versions des prompts d'extraction : à incrémenter à chaque modification
+# de prompt ou de schéma pour invalider les résultats mis en cache.
+CV_PROMPT_VERSION = "cv-v1"
+JOB_PROMPT_VERSION = "job-v1"
+FUSED_PROMPT_VERSION = "fused-v1"
 
 AUTHORIZED_JOBS = """
 A. Tech – Général:
@@ -43,76 +59,37 @@ manager, Google Ads manager, Growth hacker, Affiliate marketing manager, Product
 marketer
 """
 
-class LLMService:
-    def __init__(self):
-        self.llm = ChatMistralAI(
-            mistral_api_key=settings.MISTRAL_API_KEY,
-            model=settings.MISTRAL_MODEL,
-            temperature=0.3 # moderate for a good balance between creativity and accuracy
-        )
+CV_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", "Tu es un expert RH et un assistant IA spécialisé dans l'analyse de CV."
+               "Ta tâche est d'extraire les informations clés d'un CV et de les structurer."
+               "Sois précis et exhaustif."
+               "Pour le 'job_title', tu DOIS OBLIGATOIREMENT choisir le métier le plus proche parmi la liste officielle suivante."
+               "Si aucun métier ne correspond exactement, choisis le plus pertinent dans la liste."
+               "\n\nLISTE OFFICIELLE DES MÉTIERS :\n{authorized_jobs}\n\n"
+               "Pour 'seniority', choisis parmi: Junior, Confirmé, Senior, Expert."),
+    ("user", "Voici le contenu du CV :\n\n{cv_text}")
+]).partial(authorized_jobs=AUTHORIZED_JOBS)
 
-    async def analyze_cv(self, cv_text: str) -> dict:
-        """
-        Extract structured data from CV text using Mistral with structured output.
-        Returns a dict matching CVExtractionResult schema.
-        """
-        structured_llm = self.llm.with_structured_output(CVExtractionResult)
-        
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", "Tu es un expert RH et un assistant IA spécialisé dans l'analyse de CV."
-                       "Ta tâche est d'extraire les informations clés d'un CV et de les structurer."
-                       "Sois précis et exhaustif."
-                       "Pour le 'job_title', tu DOIS OBLIGATOIREMENT choisir le métier le plus proche parmi la liste officielle suivante."
-                       "Si aucun métier ne correspond exactement, choisis le plus pertinent dans la liste."
-                       "\n\nLISTE OFFICIELLE DES MÉTIERS :\n{authorized_jobs}\n\n"
-                       "Pour 'seniority', choisis parmi: Junior, Confirmé, Senior, Expert."),
-            ("user", "Voici le contenu du CV :\n\n{cv_text}")
-        ])
-
-        chain = prompt | structured_llm
+JOB_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", "Tu es un expert RH. Analyse cette offre d'emploi et extrais les compétences et critères requis."),
+    ("user", "Offre d'emploi :\n\n{job_text}")
+])
 
-        try:
-            result = await chain.ainvoke({
-                "cv_text": cv_text,
-                "authorized_jobs": AUTHORIZED_JOBS
-            })
-           
-            # Convert Pydantic model to dict for compatibility with the rest of the app
-            return result.model_dump()
-        
-        except Exception as e:
-            print(f"Error in analyze_cv: {e}")
-            raise e
-
-    async def analyze_job_description(self, job_text: str) -> dict:
-        """
-        Extract key requirements from Job Description using structured output.
-        """
-        structured_llm = self.llm.with_structured_output(JobDescriptionAnalysis)
-        
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", "Tu es un expert RH. Analyse cette offre d'emploi et extrais les compétences et critères requis."),
-            ("user", "Offre d'emploi :\n\n{job_text}")
-        ])
-        
-        chain = prompt | structured_llm
+# Mode fusionné : CV et offre extraits par un seul appel (schéma combiné)
+FUSED_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", "Tu es un expert RH et un assistant IA spécialisé dans l'analyse de candidatures."
+               "Ta tâche est double : extraire les informations clés du CV (champ 'cv') "
+               "et les compétences et critères requis par l'offre d'emploi (champ 'job')."
+               "Sois précis et exhaustif."
+               "Pour le 'job_title' du CV, tu DOIS OBLIGATOIREMENT choisir le métier le plus proche parmi la liste officielle suivante."
+               "Si aucun métier ne correspond exactement, choisis le plus pertinent dans la liste."
+               "\n\nLISTE OFFICIELLE DES MÉTIERS :\n{authorized_jobs}\n\n"
+               "Pour 'seniority', choisis parmi: Junior, Confirmé, Senior, Expert."),
+    ("user", "Voici le contenu du CV :\n\n{cv_text}\n\nOffre d'emploi :\n\n{job_text}")
+]).partial(authorized_jobs=AUTHORIZED_JOBS)
 
-        try:
-            result = await chain.ainvoke({
-                "job_text": job_text
-            })
-
-            return result.model_dump()
-        except Exception as e:
-            print(f"Error in analyze_job: {e}")
-            raise e
-
-    async def generate_report(self, cv_data: dict, job_data: dict, matching_score: float) -> str:
-        """
-        Generate a human-readable report in Markdown.
-        """
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", """Tu es un consultant RH senior expert. 
+REPORT_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", """Tu es un consultant RH senior expert. 
              Rédige un rapport d'évaluation professionnel et structuré pour un recruteur.
 
 Tu DOIS utiliser le format Markdown suivant EXACTEMENT :
@@ -137,7 +114,7 @@ Tu DOIS utiliser le format Markdown suivant EXACTEMENT :
     
 
 Utilise des **mots en gras** pour les éléments importants."""),
-            ("user", """
+    ("user", """
 Informations du Candidat :
 - Poste identifié : {job_title}
 - Niveau d'expérience : {seniority}
@@ -155,15 +132,189 @@ Score de compatibilité calculé : **{score}/100**
 
 Rédige maintenant le rapport d'évaluation en Markdown.
 Utilise un ton professionnel, concret et objectif.""")
-        ])
-        
-        chain = prompt | self.llm
+])
+
+
+class TokenUsageHandler(BaseCallbackHandler):
+    """Records the token usage reported by the model into the metrics registry."""
+
+    run_inline = True
+
+    def __init__(self, operation: str):
+        self.operation = operation
+
+    def on_llm_end(self, response, **kwargs) -> None:
+        for generations in response.generations:
+            for generation in generations:
+                record_token_usage(self.operation, getattr(generation, "message", None))
+
+
+def _metrics_config(operation: str) -> dict:
+    """Runnable config attaching the token usage handler (nothing when metrics are disabled)."""
+    if not REGISTRY.enabled:
+        return {}
+    return {"callbacks": [TokenUsageHandler(operation)]}
+
+
+class LLMService:
+    def __init__(self, result_cache=None, llm=None):
+        if llm is None:
+            # Deferred import: the Mistral client is only loaded when the service is created
+            from langchain_mistralai import ChatMistralAI
+
+        self.llm = llm or ChatMistralAI(
+            mistral_api_key=settings.MISTRAL_API_KEY,
+            model=settings.MISTRAL_MODEL,
+            temperature=0.3, # moderate for a good balance between creativity and accuracy
+            # Shared keep-alive connection pool and rate limiter (see http_client)
+            client=mistral_http.sync_client,
+            async_client=mistral_http.async_client
+        )
+        self.result_cache = result_cache or build_result_cache()
+        self.inflight = SingleFlight("llm_extraction")
+
+        # Chaînes compilées une seule fois (prompt | modèle) et réutilisées à chaque appel
+        self.cv_chain = CV_PROMPT | self.llm.with_structured_output(CVExtractionResult)
+        self.job_chain = JOB_PROMPT | self.llm.with_structured_output(JobDescriptionAnalysis)
+        self.fused_chain = FUSED_PROMPT | self.llm.with_structured_output(FusedExtractionResult)
+        self.report_chain = REPORT_PROMPT | self.llm
+
+    def warm_up(self) -> None:
+        """
+        Render every prompt once (template parsing, AUTHORIZED_JOBS block) and
+        open the shared HTTP clients, so the first request does not pay for it.
+        """
+        CV_PROMPT.format_messages(cv_text="")
+        JOB_PROMPT.format_messages(job_text="")
+        FUSED_PROMPT.format_messages(cv_text="", job_text="")
+        REPORT_PROMPT.format_messages(**self._report_inputs({}, {}, 0.0))
+        mistral_http.async_client  # created on first access
+
+    @timed("analyze_cv")
+    async def analyze_cv(self, cv_text: str) -> dict:
+        """
+        Extract structured data from CV text using Mistral with structured output.
+        Returns a dict matching CVExtractionResult schema.
+        Results are memoized by hash of the normalized text, prompt version and model.
+        """
+        cache_key = result_cache_key("cv_analysis", cv_text, CV_PROMPT_VERSION, settings.MISTRAL_MODEL)
+        cached = self.result_cache.get(cache_key)
+        if cached is not None:
+            record_cache_status("cv_analysis", "hit")
+            return cached
+        return await self._coalesced("cv_analysis", cache_key, lambda: self._extract_cv(cv_text, cache_key))
+
+    async def _extract_cv(self, cv_text: str, cache_key: str) -> dict:
+        try:
+            result = await self.cv_chain.ainvoke({
+                "cv_text": cv_text
+            }, config=_metrics_config("analyze_cv"))
+           
+            # Convert Pydantic model to dict for compatibility with the rest of the app
+            payload = result.model_dump()
+            self.result_cache.set(cache_key, payload)
+            return payload
         
+        except Exception as e:
+            print(f"Error in analyze_cv: {e}")
+            raise e
+
+    @staticmethod
+    def _document_cache_key(document_hash: str, variant: str) -> str:
+        return result_cache_key("cv_document", f"{document_hash}\x00{variant}", CV_PROMPT_VERSION, settings.MISTRAL_MODEL)
+
+    def cached_cv_document(self, document_hash: str, variant: str = "") -> Optional[dict]:
+        """
+        CV analysis previously stored for an uploaded file, looked up by the
+        SHA-256 computed while receiving it: a re-upload skips text extraction
+        and hashing. `variant` identifies the extraction/preprocessing settings.
+        """
+        cached = self.result_cache.get(self._document_cache_key(document_hash, variant))
+        if cached is not None:
+            record_cache_status("cv_analysis", "hit")
+        return cached
+
+    def remember_cv_document(self, document_hash: str, cv_data: dict, variant: str = "") -> None:
+        self.result_cache.set(self._document_cache_key(document_hash, variant), cv_data)
+
+    @timed("analyze_job_description")
+    async def analyze_job_description(self, job_text: str) -> dict:
+        """
+        Extract key requirements from Job Description using structured output.
+        Results are memoized like analyze_cv.
+        """
+        cache_key = result_cache_key("job_analysis", job_text, JOB_PROMPT_VERSION, settings.MISTRAL_MODEL)
+        cached = self.result_cache.get(cache_key)
+        if cached is not None:
+            record_cache_status("job_analysis", "hit")
+            return cached
+        return await self._coalesced("job_analysis", cache_key, lambda: self._extract_job(job_text, cache_key))
+
+    async def _extract_job(self, job_text: str, cache_key: str) -> dict:
+        try:
+            result = await self.job_chain.ainvoke({
+                "job_text": job_text
+            }, config=_metrics_config("analyze_job_description"))
+
+            payload = result.model_dump()
+            self.result_cache.set(cache_key, payload)
+            return payload
+        except Exception as e:
+            print(f"Error in analyze_job: {e}")
+            raise e
+
+    @timed("analyze_fused")
+    async def analyze_fused(self, cv_text: str, job_text: str) -> dict:
+        """
+        Extract the CV and the job requirements with a single structured call
+        (one system prompt, one AUTHORIZED_JOBS block instead of two calls).
+        Returns {'cv_analysis': <CVExtractionResult dict>, 'job_analysis': <JobDescriptionAnalysis dict>}.
+        Results are memoized on both texts, like analyze_cv.
+        """
+        cache_key = result_cache_key("fused_analysis", f"{cv_text}\x00{job_text}", FUSED_PROMPT_VERSION, settings.MISTRAL_MODEL)
+        cached = self.result_cache.get(cache_key)
+        if cached is not None:
+            record_cache_status("fused_analysis", "hit")
+            return cached
+        return await self._coalesced(
+            "fused_analysis", cache_key, lambda: self._extract_fused(cv_text, job_text, cache_key)
+        )
+
+    async def _extract_fused(self, cv_text: str, job_text: str, cache_key: str) -> dict:
+        try:
+            result = await self.fused_chain.ainvoke({
+                "cv_text": cv_text,
+                "job_text": job_text
+            }, config=_metrics_config("analyze_fused"))
+
+            payload = {
+                'cv_analysis': result.cv.model_dump(),
+                'job_analysis': result.job.model_dump()
+            }
+            self.result_cache.set(cache_key, payload)
+            return payload
+        except Exception as e:
+            logger.exception(f"Error in analyze_fused: {e}")
+            raise e
+
+    async def _coalesced(self, kind: str, cache_key: str, call) -> dict:
+        """
+        Run a cache miss through the single-flight layer: identical concurrent
+        requests (e.g. the same job offer for many candidates) share one LLM call.
+        """
+        coalesced = self.inflight.in_flight(cache_key)
+        record_cache_status(kind, "coalesced" if coalesced else "miss")
+        payload = await self.inflight.do(cache_key, call)
+        # Each waiter gets its own copy of the shared result
+        return copy.deepcopy(payload) if coalesced else payload
+
+    def _report_inputs(self, cv_data: dict, job_data: dict, matching_score: float) -> dict:
+        """Prompt variables for the report."""
         # Extraction des données pour le prompt
         cv_analysis = cv_data.get('cv_analysis', {})
         job_classification = cv_data.get('job_classification', {})
         
-        response = await chain.ainvoke({
+        return {
             "job_title": job_classification.get('job_title', 'Non identifié'),
             "seniority": cv_analysis.get('seniority', 'Non précisé'),
             "cv_skills": ', '.join(cv_analysis.get('technical_skills', [])[:10]) or 'Non précisées',
@@ -174,6 +325,24 @@ Utilise un ton professionnel, concret et objectif.""")
             "job_technologies": ', '.join(job_data.get('required_technologies', [])[:8]) or 'Non précisées',
             "job_experience": job_data.get('required_experience_level', 'Non précisé'),
             "score": matching_score
-        })
-        
+        }
+
+    @timed("generate_report")
+    async def generate_report(self, cv_data: dict, job_data: dict, matching_score: float) -> str:
+        """
+        Generate a human-readable report in Markdown.
+        """
+        response = await self.report_chain.ainvoke(
+            self._report_inputs(cv_data, job_data, matching_score),
+            config=_metrics_config("generate_report")
+        )
         return response.content
+
+    async def stream_report(self, cv_data: dict, job_data: dict, matching_score: float) -> AsyncIterator[str]:
+        """
+        Same report as generate_report, yielded chunk by chunk as the model produces it.
+        """
+        inputs = self._report_inputs(cv_data, job_data, matching_score)
+        async for chunk in self.report_chain.astream(inputs, config=_metrics_config("generate_report")):
+            if chunk.content:
+                yield chunk.content
@@ -0,0 +1,113 @@
+import asyncio
+import threading
+import time
+import weakref
+from typing import Optional
+
+from app.core.metrics import LLM_QUEUE_WAIT
+
+
+class RateLimiter:
+    """
+    Limiteur global des appels au fournisseur :
+    - au plus `max_concurrency` requêtes simultanées (0 = pas de limite) ;
+    - seau à jetons de `rate` requêtes par seconde, avec une rafale de `burst`
+      requêtes (rate = 0 = pas de limite).
+
+    Les requêtes excédentaires attendent localement (FIFO) au lieu de partir
+    vers l'API et de revenir en 429, suivies de retries qui dégradent la latence.
+
+    Le seau à jetons est commun à toutes les boucles d'événements et aux appels
+    synchrones (`acquire_sync`) ; les sémaphores asyncio sont créés à la
+    demande pour chaque boucle (tests, workers démarrant leur propre boucle),
+    les appels synchrones ayant leur propre sémaphore.
+    """
+
+    def __init__(self, max_concurrency: int = 0, rate: float = 0, burst: Optional[int] = None):
+        self.max_concurrency = max_concurrency
+        self.rate = rate
+        self.burst = max(1, burst if burst is not None else int(rate) or 1)
+
+        self._lock = threading.Lock()
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._sync_semaphore = threading.BoundedSemaphore(max_concurrency) if max_concurrency > 0 else None
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+
+    def _semaphore(self) -> Optional[asyncio.Semaphore]:
+        """Sémaphore de la boucle courante (créé au premier appel sur cette boucle)."""
+        if self.max_concurrency <= 0:
+            return None
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphore = self._semaphores.get(loop)
+            if semaphore is None:
+                semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+            return semaphore
+
+    def _reserve_token(self) -> float:
+        """Réserve un jeton ; retourne l'attente (s) avant de l'utiliser."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Jetons négatifs : les réservations sont servies dans l'ordre d'arrivée
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+
+    def _refund_token(self) -> None:
+        with self._lock:
+            self._tokens += 1
+
+    async def acquire(self) -> None:
+        start = time.monotonic()
+        semaphore = self._semaphore()
+        if semaphore is not None:
+            await semaphore.acquire()
+        try:
+            await self._take_token()
+        except BaseException:
+            self.release()
+            raise
+        LLM_QUEUE_WAIT.observe(time.monotonic() - start)
+
+    def release(self) -> None:
+        """Libère la place réservée par `acquire` (sur la même boucle)."""
+        semaphore = self._semaphore()
+        if semaphore is not None:
+            semaphore.release()
+
+    async def _take_token(self) -> None:
+        if self.rate <= 0:
+            return
+        wait = self._reserve_token()
+        if wait:
+            try:
+                await asyncio.sleep(wait)
+            except BaseException:
+                self._refund_token()
+                raise
+
+    def acquire_sync(self) -> None:
+        """Comme `acquire`, pour les appels synchrones (attente bloquante)."""
+        start = time.monotonic()
+        if self._sync_semaphore is not None:
+            self._sync_semaphore.acquire()
+        if self.rate > 0:
+            wait = self._reserve_token()
+            if wait:
+                time.sleep(wait)
+        LLM_QUEUE_WAIT.observe(time.monotonic() - start)
+
+    def release_sync(self) -> None:
+        if self._sync_semaphore is not None:
+            self._sync_semaphore.release()
+
+    async def __aenter__(self) -> "RateLimiter":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self.release()
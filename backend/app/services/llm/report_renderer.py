@@ -0,0 +1,125 @@
+from typing import List, Optional
+
+from app.core.config import settings
+
+# Libellés de la recommandation finale (mêmes termes que l'interface)
+RECOMMENDATION_LABELS = {
+    'strongly_recommended': "✅ Fortement recommandé",
+    'recommended': "⚠️ À considérer (entretien conseillé)",
+    'not_recommended': "❌ Non recommandé",
+}
+
+CONCLUSIONS = {
+    'strongly_recommended': "Le profil répond aux principales exigences du poste. "
+                            "Un entretien permettra de confirmer la maîtrise des compétences clés.",
+    'recommended': "Le profil présente une adéquation partielle avec le poste. "
+                   "Un entretien est conseillé pour évaluer les écarts identifiés et la capacité de montée en compétences.",
+    'not_recommended': "Les écarts avec les exigences du poste sont importants. "
+                       "La candidature ne semble pas adaptée en l'état.",
+}
+
+# Sous-scores présentés dans la synthèse
+SCORE_LABELS = (
+    ('skills_score', "Compétences techniques"),
+    ('soft_skills_score', "Soft skills"),
+    ('experience_score', "Expérience"),
+    ('technologies_score', "Technologies"),
+)
+
+
+def _bullets(items: List[str]) -> str:
+    return "\n".join(f"- {item}" for item in items)
+
+
+def _strengths(matching: dict) -> List[str]:
+    """Points forts du scoring ; à défaut (résultat re-scoré), dérivés des sous-scores."""
+    if matching.get('strengths'):
+        return matching['strengths']
+    details = matching.get('details') or {}
+    strengths = [
+        f"{label} : **{details[key]:.0f}/100**"
+        for key, label in SCORE_LABELS if details.get(key, 0) >= 80
+    ]
+    matched = matching.get('matched_skills') or []
+    if matched:
+        strengths.insert(0, f"Compétences requises maîtrisées : **{', '.join(matched[:8])}**")
+    return strengths or ["Profil avec des bases solides à développer"]
+
+
+def _concerns(matching: dict) -> List[str]:
+    if matching.get('concerns'):
+        return matching['concerns']
+    details = matching.get('details') or {}
+    concerns = []
+    missing = matching.get('missing_skills') or []
+    if missing:
+        concerns.append(f"Compétences requises manquantes : **{', '.join(missing[:8])}**")
+    concerns.extend(
+        f"{label} en retrait : **{details[key]:.0f}/100**"
+        for key, label in SCORE_LABELS if details.get(key, 100) < 60
+    )
+    return concerns or ["Aucun point d'attention majeur identifié"]
+
+
+def render_report(cv_data: dict, job_data: dict, matching: dict) -> str:
+    """
+    Rapport d'évaluation Markdown construit localement à partir du résultat
+    de MatchingService (scores, compétences, points forts et de vigilance),
+    avec les mêmes sections que le rapport LLM (Synthèse Globale, Points
+    Forts, Points de Vigilance, Conclusion, RECOMMANDATION FINALE).
+    Aucun appel réseau : quelques microsecondes par rapport.
+    """
+    cv_analysis = cv_data.get('cv_analysis') or {}
+    job_classification = cv_data.get('job_classification') or {}
+    details = matching.get('details') or {}
+    recommendation = matching.get('recommendation', 'not_recommended')
+
+    matched = matching.get('matched_skills') or []
+    required = len(matched) + len(matching.get('missing_skills') or [])
+    coverage = f" Il couvre **{len(matched)}/{required}** des compétences requises." if required else ""
+    scores = " · ".join(f"{label} : {details.get(key, 0.0):.0f}/100" for key, label in SCORE_LABELS)
+
+    return f"""## Synthèse Globale
+Le profil de **{job_classification.get('job_title') or 'Non identifié'}** (niveau {cv_analysis.get('seniority') or 'non précisé'}) \
+obtient un score de compatibilité de **{matching.get('overall_score', 0.0)}/100** pour ce poste \
+(niveau requis : {job_data.get('required_experience_level') or 'non précisé'}).{coverage}
+
+{scores}
+
+## Points Forts
+{_bullets(_strengths(matching))}
+
+## Points de Vigilance
+{_bullets(_concerns(matching))}
+
+## Conclusion
+{CONCLUSIONS.get(recommendation, CONCLUSIONS['not_recommended'])}
+
+## RECOMMANDATION FINALE
+**{RECOMMENDATION_LABELS.get(recommendation, recommendation)}**
+"""
+
+
+REPORT_POLICIES = ('llm', 'template', 'threshold')
+
+
+class ReportPolicy:
+    """
+    Choix du moteur de rapport pour un résultat de matching :
+
+    - llm : rapport toujours rédigé par le LLM ;
+    - template : rapport toujours rendu localement (render_report) ;
+    - threshold : LLM seulement pour les candidats à partir de `min_score`,
+      template pour les autres (tri de gros volumes de candidatures).
+    """
+
+    def __init__(self, mode: Optional[str] = None, min_score: Optional[float] = None):
+        self.mode = (mode or settings.REPORT_POLICY).lower()
+        if self.mode not in REPORT_POLICIES:
+            raise ValueError(f"Politique de rapport inconnue: {self.mode} (valeurs possibles : {', '.join(REPORT_POLICIES)})")
+        self.min_score = settings.LLM_REPORT_MIN_SCORE if min_score is None else min_score
+
+    def use_llm(self, matching: dict) -> bool:
+        if self.mode == 'threshold':
+            return matching.get('overall_score', 0.0) >= self.min_score
+        return self.mode == 'llm'
@@ -0,0 +1,217 @@
+import contextvars
+import copy
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import CACHE_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+
+def result_cache_key(kind: str, text: str, prompt_version: str, model: str) -> str:
+    """Hash du texte normalisé, de la version du prompt et du modèle."""
+    normalized = " ".join(text.split())
+    payload = f"{kind}\x00{prompt_version}\x00{model}\x00{normalized}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class NullResultCache:
+    """Cache désactivé."""
+
+    def get(self, key: str) -> Optional[dict]:
+        return None
+
+    def set(self, key: str, value: dict) -> None:
+        pass
+
+
+class MemoryResultCache:
+    """Cache mémoire avec expiration (TTL) et éviction LRU au-delà de `max_entries`."""
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            # Copie pour qu'un appelant ne modifie pas l'entrée partagée
+            return copy.deepcopy(value)
+
+    def set(self, key: str, value: dict) -> None:
+        with self._lock:
+            self._entries[key] = (time.time() + self.ttl, copy.deepcopy(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class SQLiteResultCache:
+    """
+    Cache persistant dans un fichier SQLite local, avec TTL et taille bornée.
+
+    L'éviction (entrées expirées, puis les moins récemment lues au-delà de
+    `max_entries`) n'est pas faite à chaque écriture : elle est lancée dans un
+    thread quand le nombre estimé d'entrées dépasse la limite, ou toutes les
+    `EVICTION_INTERVAL` écritures, et ramène le cache à 90 % de la limite.
+    """
+
+    EVICTION_INTERVAL = 500
+
+    def __init__(self, path: str, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max(1, max_entries)
+        self._lock = threading.Lock()
+        self._evictor: Optional[threading.Thread] = None
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS llm_results ("
+            "key TEXT PRIMARY KEY, payload TEXT NOT NULL, expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_llm_results_accessed ON llm_results (accessed_at)")
+        self._db.commit()
+        # Nombre d'entrées estimé (un remplacement est compté comme un ajout)
+        self._entries = self._db.execute("SELECT COUNT(*) FROM llm_results").fetchone()[0]
+        self._writes = 0
+
+    def get(self, key: str) -> Optional[dict]:
+        now = time.time()
+        with self._lock:
+            try:
+                row = self._db.execute(
+                    "SELECT payload, expires_at FROM llm_results WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                if row[1] < now:
+                    self._db.execute("DELETE FROM llm_results WHERE key = ?", (key,))
+                    self._db.commit()
+                    return None
+                self._db.execute("UPDATE llm_results SET accessed_at = ? WHERE key = ?", (now, key))
+                self._db.commit()
+                return json.loads(row[0])
+            except sqlite3.Error as e:
+                logger.warning(f"Lecture du cache LLM impossible: {e}")
+                return None
+
+    def set(self, key: str, value: dict) -> None:
+        now = time.time()
+        with self._lock:
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO llm_results (key, payload, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(value, ensure_ascii=False), now + self.ttl, now)
+                )
+                self._db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Écriture du cache LLM impossible: {e}")
+                return
+            self._entries += 1
+            self._writes += 1
+            if self._entries <= self.max_entries and self._writes < self.EVICTION_INTERVAL:
+                return
+            if self._evictor is not None and self._evictor.is_alive():
+                return
+            self._writes = 0
+            self._evictor = threading.Thread(target=self.evict, name="llm-cache-eviction", daemon=True)
+            self._evictor.start()
+
+    def evict(self) -> None:
+        """Supprime les entrées expirées, puis les moins récemment lues au-delà de 90 % de `max_entries`."""
+        keep = max(1, int(self.max_entries * 0.9))
+        with self._lock:
+            try:
+                self._db.execute("DELETE FROM llm_results WHERE expires_at < ?", (time.time(),))
+                # Date de lecture de la `keep`-ième entrée la plus récente (index sur accessed_at)
+                boundary = self._db.execute(
+                    "SELECT accessed_at FROM llm_results ORDER BY accessed_at DESC LIMIT 1 OFFSET ?", (keep - 1,)
+                ).fetchone()
+                if boundary is not None:
+                    self._db.execute("DELETE FROM llm_results WHERE accessed_at < ?", (boundary[0],))
+                self._db.commit()
+                self._entries = self._db.execute("SELECT COUNT(*) FROM llm_results").fetchone()[0]
+            except sqlite3.Error as e:
+                logger.warning(f"Éviction du cache LLM impossible: {e}")
+
+    def flush(self) -> None:
+        """Attend la fin de l'éviction en cours."""
+        evictor = self._evictor
+        if evictor is not None:
+            evictor.join()
+
+
+def build_result_cache():
+    """Instancie le backend de cache configuré (memory, sqlite ou none)."""
+    backend = settings.LLM_CACHE_BACKEND.lower()
+    if backend == "none":
+        return NullResultCache()
+    if backend == "sqlite":
+        try:
+            return SQLiteResultCache(settings.LLM_CACHE_PATH, settings.LLM_CACHE_TTL, settings.LLM_CACHE_MAX_ENTRIES)
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Cache LLM SQLite indisponible ({settings.LLM_CACHE_PATH}), repli en mémoire: {e}")
+    return MemoryResultCache(settings.LLM_CACHE_TTL, settings.LLM_CACHE_MAX_ENTRIES)
+
+
+# --- Suivi du statut du cache par requête (exposé en en-tête HTTP) ---
+
+_cache_statuses: contextvars.ContextVar[Optional[List[Tuple[str, str]]]] = contextvars.ContextVar(
+    "llm_cache_statuses", default=None
+)
+
+
+def begin_cache_tracking() -> List[Tuple[str, str]]:
+    """
+    Démarre le suivi pour la requête courante. La liste retournée est partagée
+    avec les tâches asyncio créées ensuite (le contexte est copié, pas la liste).
+    """
+    statuses: List[Tuple[str, str]] = []
+    _cache_statuses.set(statuses)
+    return statuses
+
+
+def record_cache_status(kind: str, status: str) -> None:
+    CACHE_REQUESTS.inc(cache=kind, result=status)
+    statuses = _cache_statuses.get()
+    if statuses is not None:
+        statuses.append((kind, status))
+
+
+def format_cache_statuses(statuses: List[Tuple[str, str]]) -> str:
+    """
+    Formate les statuts pour l'en-tête `X-LLM-Cache`, par exemple
+    `cv_analysis=hit, job_analysis=miss` ou, pour un lot, `cv_analysis=hit:3;miss:2`.
+    """
+    grouped: Dict[str, Dict[str, int]] = {}
+    for kind, status in statuses:
+        counts = grouped.setdefault(kind, {})
+        counts[status] = counts.get(status, 0) + 1
+
+    parts = []
+    for kind, counts in grouped.items():
+        if sum(counts.values()) == 1:
+            parts.append(f"{kind}={next(iter(counts))}")
+        else:
+            parts.append(f"{kind}=" + ";".join(f"{status}:{n}" for status, n in counts.items()))
+    return ", ".join(parts)
@@ -0,0 +1,370 @@
+import json
+import logging
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.services.matching.skill_matcher import normalize_rows
+
+logger = logging.getLogger(__name__)
+
+# Ordre des blocs dans un vecteur candidat : [technique | soft skills | outils]
+PROFILE_FIELDS = ('technical', 'soft', 'tools')
+
+
+def _ensure_capacity(array: np.ndarray, size: int) -> np.ndarray:
+    """Agrandit un tableau 1D par doublement pour des ajouts en O(1) amorti."""
+    if size <= array.shape[0]:
+        return array
+    grown = np.zeros(max(size, 2 * array.shape[0], 16), dtype=array.dtype)
+    grown[:array.shape[0]] = array
+    return grown
+
+
+class CandidateIndex:
+    """
+    Index vectoriel des candidats déjà analysés.
+
+    Chaque candidat est représenté par la concaténation de ses trois embeddings
+    agrégés (techniques, soft skills, outils), chacun normalisé. Le produit
+    scalaire avec une requête pondérée donne donc directement la partie
+    « embeddings » du score de MatchingService.
+
+    - Mode exact : parcours du tableau complet, par blocs de lignes.
+    - Mode approximatif (IVF) : partitionnement k-means, seules les listes
+      les plus proches de la requête sont parcourues.
+
+    Avec un répertoire `path`, les vecteurs sont ajoutés en append-only dans un
+    fichier binaire relu par memory-map, et les profils CV dans un JSONL lu à
+    la demande : la mémoire résidente reste faible même avec 100k profils.
+
+    Le partitionnement IVF est à réentraîner (`needs_training`) quand le
+    nombre de candidats a été multiplié par `retrain_factor` depuis
+    l'entraînement. Il est calculé hors du verrou (les recherches continuent
+    sur l'ancien), puis remplacé d'un bloc ; avec `path`, il est enregistré
+    dans `ivf.npz` et rechargé au démarrage.
+    """
+
+    CHUNK_ROWS = 8192
+
+    def __init__(self, path: Optional[str] = None, dtype: str = "float32", retrain_factor: float = 2.0):
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self.dim: Optional[int] = None  # dimension d'un bloc (embedding unique)
+        self.retrain_factor = max(1.0, retrain_factor)
+
+        self._ids: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._levels = np.zeros(0, dtype=np.int8)
+        self._active = np.zeros(0, dtype=bool)
+        self._profiles: List = []  # cv_data (mémoire) ou (offset, longueur) (disque)
+
+        self._vectors: Optional[np.ndarray] = None
+        self._size = 0
+        self._memmap_stale = False
+
+        self._centroids: Optional[np.ndarray] = None
+        self._assignments = np.zeros(0, dtype=np.int32)
+        self._trained_size = 0  # candidats actifs lors de l'entraînement
+
+        self._lock = threading.Lock()
+        self._training = threading.Lock()
+
+        if path:
+            os.makedirs(path, exist_ok=True)
+            self._load()
+
+    def __len__(self) -> int:
+        return int(self._active[:self._size].sum())
+
+    @property
+    def is_trained(self) -> bool:
+        return self._centroids is not None
+
+    @property
+    def needs_training(self) -> bool:
+        """Partitionnement IVF absent, ou entraîné sur trop peu de candidats par rapport à l'index actuel."""
+        return self._centroids is None or len(self) >= self._trained_size * self.retrain_factor
+
+    # ------------------------------------------------------------------ écriture
+
+    def add(self, candidate_id: str, vectors: Dict[str, np.ndarray], seniority_level: int, cv_data: dict) -> None:
+        """
+        Ajoute (ou remplace) un candidat.
+        `vectors` contient un embedding par champ de PROFILE_FIELDS ; un champ
+        absent est représenté par un vecteur nul (similarité 0).
+        """
+        with self._lock:
+            row = self._build_row(vectors)
+            previous = self._positions.get(candidate_id)
+            if previous is not None:
+                self._active[previous] = False
+
+            position = self._size
+            self._append_row(row)
+            self._ids.append(candidate_id)
+            self._positions[candidate_id] = position
+
+            self._levels = _ensure_capacity(self._levels, self._size)
+            self._active = _ensure_capacity(self._active, self._size)
+            self._levels[position] = seniority_level
+            self._active[position] = True
+            self._profiles.append(self._store_profile(candidate_id, seniority_level, cv_data))
+
+            if self._centroids is not None:
+                self._assignments = _ensure_capacity(self._assignments, self._size)
+                self._assignments[position] = self._nearest_centroid(row[None, :])[0]
+
+    def get_profile(self, candidate_id: str) -> Optional[dict]:
+        position = self._positions.get(candidate_id)
+        if position is None:
+            return None
+        stored = self._profiles[position]
+        if not self.path:
+            return stored
+        offset, length = stored
+        with open(os.path.join(self.path, "profiles.jsonl"), "rb") as f:
+            f.seek(offset)
+            return json.loads(f.read(length).decode("utf-8"))
+
+    # ------------------------------------------------------------------ recherche
+
+    def search(
+        self,
+        query: np.ndarray,
+        level_scores: np.ndarray,
+        top_k: int,
+        approximate: bool = False,
+        nprobe: int = 8
+    ) -> List[Tuple[str, float]]:
+        """
+        Retourne les `top_k` candidats (id, score estimé) pour une requête.
+
+        `query` est le vecteur concaténé déjà pondéré et mis à l'échelle (0-100),
+        `level_scores[n]` le score d'expérience pondéré d'un candidat de niveau n.
+        """
+        with self._lock:
+            vectors = self._matrix()
+            if vectors is None or top_k <= 0:
+                return []
+
+            active = self._active[:self._size]
+            if approximate and self._centroids is not None:
+                probes = np.argsort(-(self._centroids @ query))[:max(1, nprobe)]
+                rows = np.flatnonzero(np.isin(self._assignments[:self._size], probes) & active)
+            else:
+                rows = np.flatnonzero(active)
+
+            if rows.size == 0:
+                return []
+
+            scores = np.empty(rows.size, dtype=np.float32)
+            for start in range(0, rows.size, self.CHUNK_ROWS):
+                chunk = rows[start:start + self.CHUNK_ROWS]
+                block = np.asarray(vectors[chunk], dtype=np.float32)
+                scores[start:start + chunk.size] = block @ query + level_scores[self._levels[chunk]]
+
+            k = min(top_k, rows.size)
+            best = np.argpartition(-scores, k - 1)[:k]
+            best = best[np.argsort(-scores[best])]
+            return [(self._ids[rows[i]], float(scores[i])) for i in best]
+
+    def build_ivf(self, nlist: Optional[int] = None, iterations: int = 10, sample_size: int = 20000, seed: int = 0) -> None:
+        """
+        Entraîne le partitionnement IVF (k-means sphérique sur un échantillon).
+        Le calcul se fait hors du verrou sur les lignes présentes au départ ;
+        les lignes ajoutées entre-temps sont affectées au moment du remplacement.
+        Un entraînement déjà en cours n'est pas relancé.
+        """
+        if not self._training.acquire(blocking=False):
+            return
+        try:
+            with self._lock:
+                vectors = self._matrix()
+                size = self._size
+                active_rows = np.flatnonzero(self._active[:size])
+            if vectors is None or active_rows.size == 0:
+                return
+
+            nlist = nlist or max(1, int(np.sqrt(active_rows.size)))
+            nlist = min(nlist, active_rows.size)
+            rng = np.random.default_rng(seed)
+            sample_rows = active_rows if active_rows.size <= sample_size else rng.choice(active_rows, sample_size, replace=False)
+            sample = normalize_rows(np.asarray(vectors[np.sort(sample_rows)], dtype=np.float32))
+
+            centroids = sample[rng.choice(sample.shape[0], nlist, replace=False)]
+            for _ in range(iterations):
+                labels = (sample @ centroids.T).argmax(axis=1)
+                for c in range(nlist):
+                    members = sample[labels == c]
+                    if len(members):
+                        centroids[c] = members.mean(axis=0)
+                centroids = normalize_rows(centroids)
+
+            assignments = self._assign(vectors, centroids, 0, size)
+
+            with self._lock:
+                # Lignes ajoutées pendant l'entraînement
+                if self._size > size:
+                    tail = self._assign(self._matrix(), centroids, size, self._size)
+                    assignments = np.concatenate([assignments, tail])
+                self._centroids = centroids
+                self._assignments = assignments
+                self._trained_size = int(active_rows.size)
+                if self.path:
+                    self._save_ivf()
+            logger.info(f"Index IVF construit : {nlist} listes pour {active_rows.size} candidats")
+        finally:
+            self._training.release()
+
+    # ------------------------------------------------------------------ interne
+
+    def _build_row(self, vectors: Dict[str, np.ndarray]) -> np.ndarray:
+        present = [np.asarray(v, dtype=np.float32) for v in vectors.values() if v is not None]
+        if self.dim is None:
+            if not present:
+                raise ValueError("Au moins un embedding est requis pour indexer un candidat.")
+            self.dim = int(present[0].shape[0])
+
+        blocks = []
+        for field in PROFILE_FIELDS:
+            vec = vectors.get(field)
+            if vec is None:
+                blocks.append(np.zeros(self.dim, dtype=np.float32))
+                continue
+            vec = np.asarray(vec, dtype=np.float32)
+            if vec.shape[0] != self.dim:
+                raise ValueError(f"Dimension d'embedding incohérente ({vec.shape[0]} au lieu de {self.dim}).")
+            norm = np.linalg.norm(vec)
+            blocks.append(vec / norm if norm else vec)
+        return np.concatenate(blocks).astype(self.dtype)
+
+    def _nearest_centroid(self, rows: np.ndarray, centroids: Optional[np.ndarray] = None) -> np.ndarray:
+        centroids = self._centroids if centroids is None else centroids
+        return (np.asarray(rows, dtype=np.float32) @ centroids.T).argmax(axis=1).astype(np.int32)
+
+    def _assign(self, vectors: np.ndarray, centroids: np.ndarray, start: int, stop: int) -> np.ndarray:
+        """Liste IVF des lignes [start, stop), par blocs."""
+        assignments = np.zeros(stop - start, dtype=np.int32)
+        for offset in range(start, stop, self.CHUNK_ROWS):
+            block = np.asarray(vectors[offset:min(offset + self.CHUNK_ROWS, stop)], dtype=np.float32)
+            assignments[offset - start:offset - start + block.shape[0]] = self._nearest_centroid(block, centroids)
+        return assignments
+
+    def _save_ivf(self) -> None:
+        """Enregistre centroïdes et affectations (fichier remplacé d'un bloc)."""
+        path = os.path.join(self.path, "ivf.npz")
+        temporary = path + ".tmp.npz"
+        try:
+            np.savez(temporary, centroids=self._centroids, assignments=self._assignments[:self._size],
+                     trained_size=np.int64(self._trained_size))
+            os.replace(temporary, path)
+        except OSError as e:
+            logger.warning(f"Enregistrement de l'index IVF impossible ({path}): {e}")
+
+    def _load_ivf(self) -> None:
+        path = os.path.join(self.path, "ivf.npz")
+        if not os.path.exists(path):
+            return
+        try:
+            with np.load(path) as ivf:
+                centroids, assignments = ivf["centroids"], ivf["assignments"]
+                trained_size = int(ivf["trained_size"])
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Index IVF illisible ({path}), à réentraîner: {e}")
+            return
+        if centroids.shape[1] != 3 * self.dim or assignments.shape[0] > self._size:
+            return
+        self._centroids = centroids.astype(np.float32)
+        self._trained_size = trained_size
+        # Candidats ajoutés après le dernier enregistrement
+        self._assignments = np.concatenate([
+            assignments.astype(np.int32), self._assign(self._matrix(), self._centroids, assignments.shape[0], self._size)
+        ])
+
+    def _append_row(self, row: np.ndarray) -> None:
+        if self.path:
+            with open(os.path.join(self.path, "vectors.bin"), "ab") as f:
+                f.write(row.tobytes())
+            if self._size == 0:
+                self._write_meta()
+            self._memmap_stale = True
+        else:
+            if self._vectors is None:
+                self._vectors = np.zeros((16, row.shape[0]), dtype=self.dtype)
+            elif self._size == self._vectors.shape[0]:
+                grown = np.zeros((self._vectors.shape[0] * 2, row.shape[0]), dtype=self.dtype)
+                grown[:self._size] = self._vectors[:self._size]
+                self._vectors = grown
+            self._vectors[self._size] = row
+        self._size += 1
+
+    def _matrix(self) -> Optional[np.ndarray]:
+        if self._size == 0:
+            return None
+        if self.path and (self._memmap_stale or self._vectors is None):
+            self._vectors = np.memmap(
+                os.path.join(self.path, "vectors.bin"), dtype=self.dtype, mode="r",
+                shape=(self._size, 3 * self.dim)
+            )
+            self._memmap_stale = False
+        return self._vectors
+
+    def _store_profile(self, candidate_id: str, level: int, cv_data: dict):
+        if not self.path:
+            return cv_data
+
+        payload = json.dumps(cv_data, ensure_ascii=False).encode("utf-8")
+        profiles_path = os.path.join(self.path, "profiles.jsonl")
+        with open(profiles_path, "ab") as f:
+            offset = f.tell()
+            f.write(payload + b"\n")
+        with open(os.path.join(self.path, "index.jsonl"), "a", encoding="utf-8") as f:
+            f.write(json.dumps({"id": candidate_id, "level": int(level), "offset": offset, "length": len(payload)}) + "\n")
+        return (offset, len(payload))
+
+    def _write_meta(self) -> None:
+        with open(os.path.join(self.path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump({"dim": self.dim, "dtype": self.dtype.name}, f)
+
+    def _load(self) -> None:
+        meta_path = os.path.join(self.path, "meta.json")
+        index_path = os.path.join(self.path, "index.jsonl")
+        if not os.path.exists(meta_path) or not os.path.exists(index_path):
+            return
+
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        self.dim = meta["dim"]
+        self.dtype = np.dtype(meta["dtype"])
+
+        levels, active = [], []
+        with open(index_path, encoding="utf-8") as f:
+            for line in f:
+                entry = json.loads(line)
+                previous = self._positions.get(entry["id"])
+                if previous is not None:
+                    active[previous] = False
+                self._positions[entry["id"]] = len(self._ids)
+                self._ids.append(entry["id"])
+                levels.append(entry["level"])
+                active.append(True)
+                self._profiles.append((entry["offset"], entry["length"]))
+
+        self._size = len(self._ids)
+        self._levels = np.array(levels, dtype=np.int8)
+        self._active = np.array(active, dtype=bool)
+
+        # Un vecteur écrit sans son entrée d'index (arrêt brutal) est tronqué
+        vectors_path = os.path.join(self.path, "vectors.bin")
+        expected = self._size * 3 * self.dim * self.dtype.itemsize
+        if os.path.exists(vectors_path) and os.path.getsize(vectors_path) > expected:
+            with open(vectors_path, "r+b") as f:
+                f.truncate(expected)
+
+        self._memmap_stale = True
+        if self._size:
+            self._load_ivf()
+        logger.info(f"Index candidats chargé : {len(self)} profils ({self.path})")
@@ -0,0 +1,140 @@
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.matching.candidate_index import CandidateIndex, PROFILE_FIELDS
+from app.services.matching.job_profile import JobProfile
+from app.services.matching.scorer import MatchingService
+
+logger = logging.getLogger(__name__)
+
+# Correspondance entre les blocs de l'index et les poids du scorer
+FIELD_WEIGHTS = {
+    'technical': 'technical_skills',
+    'soft': 'soft_skills',
+    'tools': 'technologies',
+}
+
+
+class CandidateSearchService:
+    """
+    Recherche inversée : classe le vivier de candidats pour une nouvelle offre.
+
+    1. L'index estime la partie embeddings + expérience du score pour tous les
+       profils (ou une partie en mode approximatif) en quelques produits scalaires.
+    2. Seule la présélection (top_k × facteur) passe par le calcul exact
+       `MatchingService.calculate_score`.
+    """
+
+    def __init__(
+        self,
+        matching_service: MatchingService,
+        index: Optional[CandidateIndex] = None,
+        shortlist_factor: Optional[int] = None,
+        nprobe: Optional[int] = None
+    ):
+        self.matching_service = matching_service
+        self.index = index if index is not None else self._build_index()
+        self.shortlist_factor = max(1, shortlist_factor or settings.CANDIDATE_SHORTLIST_FACTOR)
+        self.nprobe = nprobe or settings.CANDIDATE_INDEX_NPROBE
+        self._retraining: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def _build_index() -> CandidateIndex:
+        try:
+            return CandidateIndex(
+                path=settings.CANDIDATE_INDEX_PATH or None, retrain_factor=settings.CANDIDATE_INDEX_RETRAIN_FACTOR
+            )
+        except OSError as e:
+            logger.warning(f"Index de candidats indisponible ({settings.CANDIDATE_INDEX_PATH}), repli en mémoire: {e}")
+            return CandidateIndex(retrain_factor=settings.CANDIDATE_INDEX_RETRAIN_FACTOR)
+
+    async def _profile_vectors(self, texts: Dict[str, str]) -> Dict[str, Optional[np.ndarray]]:
+        embedding_map = await self.matching_service._get_embeddings_batch(list(texts.values()))
+        return {field: embedding_map.get(texts[field]) if texts[field] else None for field in PROFILE_FIELDS}
+
+    async def add_candidate(self, candidate_id: str, cv_data: dict) -> None:
+        """Vectorise les textes agrégés du CV et ajoute le candidat à l'index."""
+        vectors = await self._profile_vectors(self.matching_service._cv_profile_texts(cv_data))
+        seniority = self.matching_service._extract_value(cv_data, 'cv_analysis', 'seniority', default='Junior')
+        level = self.matching_service._seniority_value(seniority)
+        await asyncio.to_thread(self.index.add, candidate_id, vectors, level, cv_data)
+
+    def _build_query(self, job: JobProfile) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Construit la requête pondérée de sorte que `ligne @ requête` reproduise
+        la partie embeddings du score global (échelle 0-100).
+        """
+        weights = self.matching_service.WEIGHTS
+        dim = self.index.dim
+        constant = 0.0
+        blocks = []
+        for field in PROFILE_FIELDS:
+            weight = weights[FIELD_WEIGHTS[field]]
+            vec = job.vectors.get(field)
+            if not job.texts[field]:
+                # Sans exigence sur ce champ, le scorer accorde 100
+                constant += 100.0 * weight
+                blocks.append(np.zeros(dim, dtype=np.float32))
+            elif vec is None:
+                blocks.append(np.zeros(dim, dtype=np.float32))
+            else:
+                # Vecteurs de l'offre déjà normalisés à la compilation
+                blocks.append(100.0 * weight * vec)
+
+        max_level = max(self.matching_service.SENIORITY_LEVELS.values())
+        level_scores = np.array([
+            weights['experience'] * self.matching_service._experience_score_from_levels(level, job.level) + constant
+            for level in range(max_level + 1)
+        ], dtype=np.float32)
+        return np.concatenate(blocks), level_scores
+
+    async def search(self, job_data: dict, top_k: int = 10, approximate: bool = False) -> Dict[str, Any]:
+        """Retourne les `top_k` meilleurs candidats, classés par score exact."""
+        if len(self.index) == 0:
+            return {'indexed_candidates': 0, 'shortlisted': 0, 'approximate': approximate, 'results': []}
+
+        job = await self.matching_service.job_profile(job_data)
+        query, level_scores = self._build_query(job)
+
+        if approximate and not self.index.is_trained:
+            await asyncio.to_thread(self.index.build_ivf)
+        elif approximate and self.index.needs_training and (self._retraining is None or self._retraining.done()):
+            # Réentraînement en arrière-plan : la recherche utilise l'IVF actuel
+            self._retraining = asyncio.ensure_future(asyncio.to_thread(self.index.build_ivf))
+
+        shortlist = await asyncio.to_thread(
+            self.index.search, query, level_scores, top_k * self.shortlist_factor, approximate, self.nprobe
+        )
+        estimates = dict(shortlist)
+
+        semaphore = asyncio.Semaphore(settings.BATCH_CONCURRENCY)
+
+        async def rescore(candidate_id: str) -> Optional[Dict[str, Any]]:
+            cv_data = await asyncio.to_thread(self.index.get_profile, candidate_id)
+            if cv_data is None:
+                return None
+            async with semaphore:
+                matching = await self.matching_service.calculate_score(cv_data, job, candidate_id=candidate_id)
+            return {
+                'candidate_id': candidate_id,
+                'estimated_score': round(estimates[candidate_id], 1),
+                'job_classification': cv_data.get('job_classification'),
+                'matching': matching,
+            }
+
+        scored = [r for r in await asyncio.gather(*(rescore(cid) for cid, _ in shortlist)) if r]
+        scored.sort(key=lambda r: r['matching']['overall_score'], reverse=True)
+        results: List[Dict[str, Any]] = scored[:top_k]
+        for rank, result in enumerate(results, start=1):
+            result['rank'] = rank
+
+        return {
+            'indexed_candidates': len(self.index),
+            'shortlisted': len(shortlist),
+            'approximate': approximate and self.index.is_trained,
+            'results': results,
+        }
@@ -0,0 +1,107 @@
+import asyncio
+import itertools
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.metrics import EMBEDDING_QUEUE_WAIT
+
+EmbedFunction = Callable[[List[str]], Awaitable[Dict[str, np.ndarray]]]
+
+
+class EmbeddingBatcher:
+    """
+    Micro-batching des appels d'embeddings : les textes demandés par les
+    scorings simultanés sont regroupés, dédoublonnés et envoyés en un seul
+    appel au fournisseur, puis chaque demandeur reçoit ses vecteurs.
+
+    La fenêtre est adaptative : sans appel en cours, le lot part dès le tour
+    de boucle suivant (pas de latence ajoutée à faible charge) ; pendant un
+    appel, les textes s'accumulent au plus `window_ms` millisecondes, ou
+    jusqu'à `max_batch_size` textes.
+    """
+
+    def __init__(
+        self,
+        embed: EmbedFunction,
+        name: str,
+        window_ms: Optional[float] = None,
+        max_batch_size: Optional[int] = None
+    ):
+        self._embed = embed
+        self.name = name
+        self.window = (settings.EMBEDDING_BATCH_WINDOW_MS if window_ms is None else window_ms) / 1000
+        self.max_batch_size = max(1, max_batch_size or settings.EMBEDDING_BATCH_MAX_SIZE)
+        # Texte -> (future partagée, instant de mise en attente)
+        self._pending: Dict[str, Tuple[asyncio.Future, float]] = {}
+        # Textes des lots déjà envoyés, attendus plutôt que redemandés
+        self._sent: Dict[str, asyncio.Future] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._in_flight = 0
+        self._tasks = set()
+
+    async def embed(self, texts: List[str]) -> Dict[str, np.ndarray]:
+        """Vecteurs de `texts` (textes absents du résultat en cas de réponse incomplète)."""
+        loop = asyncio.get_running_loop()
+        now = time.perf_counter()
+        futures = {}
+        for text in texts:
+            if text in self._sent:
+                futures[text] = self._sent[text]
+                continue
+            entry = self._pending.get(text)
+            if entry is None:
+                entry = self._pending[text] = (loop.create_future(), now)
+            futures[text] = entry[0]
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window if self._in_flight else 0, self._flush)
+
+        # shield : l'annulation d'un demandeur n'annule pas les futures partagées
+        vectors = await asyncio.gather(*(asyncio.shield(future) for future in futures.values()))
+        return {text: vector for text, vector in zip(futures, vectors) if vector is not None}
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._pending:
+            self._send(dict(itertools.islice(self._pending.items(), self.max_batch_size)))
+
+    def _send(self, batch: Dict[str, Tuple[asyncio.Future, float]]) -> None:
+        for text, (future, _) in batch.items():
+            del self._pending[text]
+            self._sent[text] = future
+        self._in_flight += 1
+        task = asyncio.ensure_future(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: Dict[str, Tuple[asyncio.Future, float]]) -> None:
+        started = time.perf_counter()
+        for _, queued_at in batch.values():
+            EMBEDDING_QUEUE_WAIT.observe(started - queued_at, provider=self.name)
+        try:
+            vectors = await self._embed(list(batch))
+        except asyncio.CancelledError:
+            for future, _ in batch.values():
+                future.cancel()
+            raise
+        except Exception as e:
+            for future, _ in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+                    # Exception consommée même si tous les demandeurs sont partis
+                    future.add_done_callback(lambda f: f.exception())
+            return
+        finally:
+            self._in_flight -= 1
+            for text in batch:
+                del self._sent[text]
+        for text, (future, _) in batch.items():
+            if not future.done():
+                future.set_result(vectors.get(text))
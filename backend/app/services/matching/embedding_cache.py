@@ -0,0 +1,214 @@
+import asyncio
+import hashlib
+import logging
+import os
+import queue
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.metrics import CACHE_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_text(text: str) -> str:
+    """Normalise un texte avant calcul de la clé (casse et espaces)."""
+    return " ".join(text.split()).casefold()
+
+
+def cache_key(text: str, model: str) -> str:
+    """Clé adressée par le contenu : hash du modèle et du texte normalisé."""
+    return hashlib.sha256(f"{model}\x00{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Cache d'embeddings à deux niveaux :
+    1. LRU en mémoire (process courant).
+    2. Stockage SQLite local (vecteurs float32), partagé entre redémarrages.
+
+    Les clés sont indépendantes de la casse et des espaces, et incluent le nom
+    du modèle pour ne jamais mélanger deux espaces vectoriels.
+
+    Depuis la boucle d'événements, `aget_many` consulte le LRU directement et
+    lit le disque dans un thread ; les écritures SQLite de `put_many` passent
+    par une file traitée par un thread dédié (validées ensemble).
+    """
+
+    def __init__(self, model: str, max_entries: int = 10000, db_path: Optional[str] = None):
+        self.model = model
+        self.max_entries = max_entries
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        # Connexion partagée entre lectures (threads) et écritures (thread dédié)
+        self._db_lock = threading.Lock()
+        self._writes: "queue.Queue" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if db_path:
+            try:
+                directory = os.path.dirname(db_path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._db = sqlite3.connect(db_path, check_same_thread=False)
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS embeddings ("
+                    "key TEXT PRIMARY KEY, model TEXT NOT NULL, vector BLOB NOT NULL)"
+                )
+                self._db.commit()
+            except (sqlite3.Error, OSError) as e:
+                logger.warning(f"Cache d'embeddings disque indisponible ({db_path}): {e}")
+                self._db = None
+            if self._db is not None:
+                self._writer = threading.Thread(target=self._write_loop, name="embedding-cache-writer", daemon=True)
+                self._writer.start()
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self._memory),
+        }
+
+    def get_many(self, texts: Iterable[str]) -> Tuple[Dict[str, np.ndarray], List[str]]:
+        """
+        Retourne les vecteurs connus et la liste des textes absents du cache.
+        Les entrées trouvées sur disque sont promues dans le LRU. Lecture
+        disque synchrone : depuis la boucle d'événements, utiliser `aget_many`.
+        """
+        found, pending = self._get_memory(texts)
+        return self._get_disk(found, pending)
+
+    async def aget_many(self, texts: Iterable[str]) -> Tuple[Dict[str, np.ndarray], List[str]]:
+        """Comme `get_many`, la lecture du disque (entrées absentes du LRU) étant faite dans un thread."""
+        found, pending = self._get_memory(texts)
+        if pending and self._db is not None:
+            return await asyncio.to_thread(self._get_disk, found, pending)
+        return self._get_disk(found, pending)
+
+    def _get_memory(self, texts: Iterable[str]) -> Tuple[Dict[str, np.ndarray], Dict[str, List[str]]]:
+        """Vecteurs du LRU, et textes à chercher sur disque (par clé)."""
+        found: Dict[str, np.ndarray] = {}
+        pending: Dict[str, List[str]] = {}
+        with self._lock:
+            for text in texts:
+                key = cache_key(text, self.model)
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    found[text] = vector
+                    self.hits += 1
+                else:
+                    pending.setdefault(key, []).append(text)
+        return found, pending
+
+    def _get_disk(
+        self, found: Dict[str, np.ndarray], pending: Dict[str, List[str]]
+    ) -> Tuple[Dict[str, np.ndarray], List[str]]:
+        disk_vectors = self._read_disk(list(pending)) if pending and self._db is not None else {}
+        with self._lock:
+            for key, vector in disk_vectors.items():
+                self._remember(key, vector)
+                for text in pending.pop(key):
+                    found[text] = vector
+                    self.hits += 1
+                    self.disk_hits += 1
+            missing = [text for texts_for_key in pending.values() for text in texts_for_key]
+            self.misses += len(missing)
+
+        CACHE_REQUESTS.inc(len(found), cache="embedding", result="hit")
+        CACHE_REQUESTS.inc(len(missing), cache="embedding", result="miss")
+        return found, missing
+
+    def put_many(self, vectors: Dict[str, np.ndarray]) -> None:
+        """Enregistre de nouveaux vecteurs dans les deux niveaux de cache ; l'écriture SQLite est différée."""
+        rows = []
+        with self._lock:
+            for text, vector in vectors.items():
+                key = cache_key(text, self.model)
+                vector = np.asarray(vector, dtype=np.float32)
+                self._remember(key, vector)
+                rows.append((key, self.model, vector.tobytes()))
+        if rows and self._writer is not None:
+            self._writes.put(rows)
+
+    def _write_loop(self) -> None:
+        while True:
+            batch = [self._writes.get()]
+            while True:
+                try:
+                    batch.append(self._writes.get_nowait())
+                except queue.Empty:
+                    break
+            rows = [row for rows in batch if rows is not None for row in rows]
+            if rows:
+                try:
+                    with self._db_lock:
+                        self._db.executemany(
+                            "INSERT OR REPLACE INTO embeddings (key, model, vector) VALUES (?, ?, ?)", rows
+                        )
+                        self._db.commit()
+                except sqlite3.Error as e:
+                    logger.warning(f"Écriture du cache d'embeddings impossible: {e}")
+            for _ in batch:
+                self._writes.task_done()
+            if any(rows is None for rows in batch):
+                return
+
+    def flush(self) -> None:
+        """Attend l'écriture des vecteurs enregistrés."""
+        if self._writer is not None:
+            self._writes.join()
+
+    def close(self) -> None:
+        """Écrit les vecteurs en attente et ferme le fichier SQLite."""
+        if self._writer is None:
+            return
+        self._writes.put(None)
+        self._writer.join()
+        self._writer = None
+        self._db.close()
+        self._db = None
+
+    def clear(self) -> None:
+        """Vide le cache mémoire (le stockage disque est conservé)."""
+        with self._lock:
+            self._memory.clear()
+
+    def _remember(self, key: str, vector: np.ndarray) -> None:
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def _read_disk(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        result: Dict[str, np.ndarray] = {}
+        try:
+            with self._db_lock:
+                # SQLite limite le nombre de paramètres par requête
+                for i in range(0, len(keys), 500):
+                    chunk = keys[i:i + 500]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows = self._db.execute(
+                        f"SELECT key, vector FROM embeddings WHERE model = ? AND key IN ({placeholders})",
+                        [self.model, *chunk]
+                    ).fetchall()
+                    for key, blob in rows:
+                        result[key] = np.frombuffer(blob, dtype=np.float32)
+        except sqlite3.Error as e:
+            logger.warning(f"Lecture du cache d'embeddings impossible: {e}")
+        return result
@@ -0,0 +1,163 @@
+import json
+import logging
+import os
+import zlib
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.matching.embedding_cache import normalize_text
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingProvider:
+    """
+    Interface des fournisseurs d'embeddings utilisés par MatchingService.
+
+    - `name` identifie l'espace vectoriel (clé du cache d'embeddings) ;
+    - `cacheable` indique si les vecteurs méritent d'être mis en cache
+      (faux pour les calculs locaux, plus rapides qu'une lecture du cache) ;
+    - `skill_threshold` est la similarité minimale pour considérer deux
+      compétences équivalentes dans cet espace (None = seuil du service).
+    """
+
+    name: str = "embeddings"
+    cacheable: bool = True
+    skill_threshold: Optional[float] = None
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        raise NotImplementedError
+
+
+class RemoteEmbeddingProvider(EmbeddingProvider):
+    """Modèle distant via un client LangChain (MistralAIEmbeddings par défaut)."""
+
+    def __init__(self, client, name: str):
+        self.client = client
+        self.name = name
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        return await self.client.aembed_documents(texts)
+
+
+class HashingEmbeddingProvider(EmbeddingProvider):
+    """
+    Embeddings locaux par hachage des trigrammes de caractères : aucun modèle
+    ni réseau, quelques microsecondes par texte. Adapté aux chaînes courtes
+    (noms de compétences) : « react » / « react.js » / « reactjs » sont
+    proches, « java » / « javascript » ne le sont pas assez pour être confondus.
+    """
+
+    cacheable = False
+    skill_threshold = 0.6
+
+    def __init__(self, dim: int = 512):
+        self.dim = dim
+        self.name = f"local-hashing-{dim}"
+
+    def embed(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        padded = f" {normalize_text(text)} "
+        for i in range(len(padded) - 2):
+            vector[zlib.crc32(padded[i:i + 3].encode("utf-8")) % self.dim] += 1.0
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed(text) for text in texts]
+
+
+class VocabularyEmbeddingProvider(EmbeddingProvider):
+    """
+    Table d'embeddings précalculée pour un vocabulaire de compétences,
+    chargée par memory-map (`vectors.npy` + `vocabulary.json` dans `path`).
+
+    Les termes connus sont résolus localement par simple lecture de ligne ;
+    les autres sont délégués à `fallback` (qui doit produire des vecteurs du
+    même espace, typiquement le modèle ayant servi à construire la table) ou,
+    sans fallback, reçoivent un vecteur nul (similarité 0). Avec un fallback
+    distant, les résultats passent par le cache d'embeddings.
+    """
+
+    def __init__(self, path: str, fallback: Optional[EmbeddingProvider] = None):
+        with open(os.path.join(path, "vocabulary.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        # Nom distinct du modèle source : la table a son propre cache et ses propres appels
+        self.name = f"vocab:{meta.get('model', 'vocabulary')}"
+        self.skill_threshold = meta.get("skill_threshold")
+        self._rows: Dict[str, int] = {term: i for i, term in enumerate(meta["terms"])}
+        self._vectors = np.load(os.path.join(path, "vectors.npy"), mmap_mode="r")
+        self.fallback = fallback
+        self.cacheable = fallback is not None
+        logger.info(f"Table d'embeddings chargée : {len(self._rows)} termes ({path})")
+
+    def __contains__(self, text: str) -> bool:
+        return normalize_text(text) in self._rows
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        vectors: List[Optional[np.ndarray]] = []
+        unknown: List[int] = []
+        for i, text in enumerate(texts):
+            row = self._rows.get(normalize_text(text))
+            if row is None:
+                unknown.append(i)
+                vectors.append(None)
+            else:
+                vectors.append(np.asarray(self._vectors[row], dtype=np.float32))
+
+        if unknown:
+            if self.fallback is not None:
+                computed = await self.fallback.aembed_documents([texts[i] for i in unknown])
+                for i, vector in zip(unknown, computed):
+                    vectors[i] = np.asarray(vector, dtype=np.float32)
+            else:
+                zeros = np.zeros(self._vectors.shape[1], dtype=np.float32)
+                for i in unknown:
+                    vectors[i] = zeros
+        return vectors
+
+    @staticmethod
+    async def build(path: str, terms: List[str], provider: EmbeddingProvider, batch_size: int = 256) -> None:
+        """Précalcule la table d'un vocabulaire avec `provider` et l'écrit dans `path`."""
+        terms = list(dict.fromkeys(normalize_text(term) for term in terms if term and term.strip()))
+        rows = []
+        for start in range(0, len(terms), batch_size):
+            rows.extend(await provider.aembed_documents(terms[start:start + batch_size]))
+
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, "vectors.npy"), np.asarray(rows, dtype=np.float32))
+        with open(os.path.join(path, "vocabulary.json"), "w", encoding="utf-8") as f:
+            json.dump({
+                "model": provider.name,
+                "skill_threshold": provider.skill_threshold,
+                "terms": terms,
+            }, f, ensure_ascii=False)
+
+
+def as_provider(embeddings, name: Optional[str] = None) -> EmbeddingProvider:
+    """Accepte un fournisseur ou un client LangChain (aembed_documents) et retourne un fournisseur."""
+    if isinstance(embeddings, EmbeddingProvider):
+        return embeddings
+    return RemoteEmbeddingProvider(embeddings, name or settings.MISTRAL_EMBED_MODEL)
+
+
+def build_embedding_provider(kind: str, remote_factory) -> EmbeddingProvider:
+    """
+    Instancie un fournisseur configuré : `mistral` (distant), `local`
+    (hachage de trigrammes) ou `vocabulary` (table précalculée de
+    EMBEDDING_VOCABULARY_PATH, termes inconnus envoyés au modèle distant).
+    `remote_factory` crée le client distant à la demande.
+    """
+    kind = kind.lower()
+    if kind == "local":
+        return HashingEmbeddingProvider(settings.LOCAL_EMBEDDING_DIM)
+    if kind == "vocabulary":
+        return VocabularyEmbeddingProvider(
+            settings.EMBEDDING_VOCABULARY_PATH,
+            fallback=as_provider(remote_factory())
+        )
+    if kind != "mistral":
+        raise ValueError(f"Fournisseur d'embeddings inconnu: {kind} (mistral, local ou vocabulary).")
+    return as_provider(remote_factory())
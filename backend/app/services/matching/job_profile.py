@@ -0,0 +1,72 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import numpy as np
+
+from app.services.matching.skill_matcher import CompiledSkills
+
+
+def content_id(data: dict) -> str:
+    """Identifiant adressé par le contenu d'une analyse (offre ou CV)."""
+    payload = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class JobProfile:
+    """
+    Offre d'emploi compilée pour le scoring : compétences requises normalisées
+    (avec leur matrice d'embeddings pré-normalisée), textes agrégés et leurs
+    vecteurs unitaires, niveau de séniorité. Construite une fois par offre,
+    elle ne laisse au scoring d'un candidat que le côté CV et quelques
+    produits scalaires.
+    """
+
+    def __init__(
+        self,
+        offer_id: str,
+        job_data: dict,
+        technical: CompiledSkills,
+        soft: CompiledSkills,
+        texts: Dict[str, str],
+        vectors: Dict[str, Optional[np.ndarray]],
+        experience: str,
+        level: int
+    ):
+        self.offer_id = offer_id
+        self.job_data = job_data
+        self.technical = technical
+        self.soft = soft
+        # Textes agrégés (technical, soft, tools) et vecteurs unitaires associés
+        self.texts = texts
+        self.vectors = vectors
+        self.experience = experience
+        self.level = level
+
+
+class JobProfileStore:
+    """Offres compilées indexées par identifiant d'offre (LRU en mémoire)."""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._profiles: "OrderedDict[str, JobProfile]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._profiles)
+
+    def get(self, offer_id: str) -> Optional[JobProfile]:
+        with self._lock:
+            profile = self._profiles.get(offer_id)
+            if profile is not None:
+                self._profiles.move_to_end(offer_id)
+            return profile
+
+    def put(self, profile: JobProfile) -> None:
+        with self._lock:
+            self._profiles[profile.offer_id] = profile
+            self._profiles.move_to_end(profile.offer_id)
+            while len(self._profiles) > self.max_entries:
+                self._profiles.popitem(last=False)
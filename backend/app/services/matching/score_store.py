@@ -0,0 +1,235 @@
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Sous-scores conservés par couple candidat-offre, dans l'ordre des colonnes
+SCORE_COLUMNS = ("skills_score", "soft_skills_score", "experience_score", "technologies_score")
+
+
+class ScoreStore:
+    """
+    Sous-scores et compétences trouvées/manquantes de chaque couple
+    candidat-offre, pour re-pondérer les résultats sans rappeler les modèles.
+
+    Les sous-scores sont tenus en mémoire dans une matrice NumPy (une ligne
+    par couple, offres encodées en entiers) : un re-scoring est un produit
+    matrice-vecteur. Au-delà de `max_rows` couples, les moins récemment
+    enregistrés sont retirés de la mémoire.
+
+    Avec `db_path`, les couples sont aussi écrits dans un fichier SQLite local
+    (les `max_rows` plus récents sont rechargés au démarrage). Les écritures
+    passent par une file traitée par un thread dédié : `record` ne bloque pas
+    la boucle d'événements, et les écritures en attente sont validées
+    ensemble. Le même thread ramène la table aux `max_rows` couples les plus
+    récents dès qu'elle les dépasse.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, max_rows: int = 100_000):
+        self.max_rows = max(1, max_rows)
+        self._lock = threading.Lock()
+        self._rows: Dict[Tuple[str, str], int] = {}
+        self._candidates: List[str] = []
+        self._offers: Dict[str, int] = {}
+        self._offer_ids: List[str] = []
+        self._offer_codes = np.zeros(0, dtype=np.int32)
+        self._scores = np.zeros((0, len(SCORE_COLUMNS)), dtype=np.float64)
+        self._skills: List[Tuple[List[str], List[str]]] = []
+        # Ordre de dernière écriture de chaque ligne (éviction des plus anciennes)
+        self._updated = np.zeros(0, dtype=np.int64)
+        self._sequence = 0
+        self._db_rows = 0
+        self._db: Optional[sqlite3.Connection] = None
+        self._writes: "queue.Queue" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+
+        if db_path:
+            try:
+                directory = os.path.dirname(db_path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._db = sqlite3.connect(db_path, check_same_thread=False)
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS match_scores ("
+                    "candidate_id TEXT NOT NULL, offer_id TEXT NOT NULL, "
+                    f"{', '.join(f'{c} REAL NOT NULL' for c in SCORE_COLUMNS)}, "
+                    "matched TEXT NOT NULL, missing TEXT NOT NULL, updated_at REAL NOT NULL, "
+                    "PRIMARY KEY (candidate_id, offer_id))"
+                )
+                self._db.execute("CREATE INDEX IF NOT EXISTS idx_match_scores_updated ON match_scores (updated_at)")
+                self._db.commit()
+                self._db_rows = self._db.execute("SELECT COUNT(*) FROM match_scores").fetchone()[0]
+                self._load()
+            except (sqlite3.Error, OSError) as e:
+                logger.warning(f"Stockage des scores SQLite indisponible ({db_path}), repli en mémoire: {e}")
+                self._db = None
+            if self._db is not None:
+                self._writer = threading.Thread(target=self._write_loop, name="score-store-writer", daemon=True)
+                self._writer.start()
+
+    def __len__(self) -> int:
+        return len(self._candidates)
+
+    def _load(self) -> None:
+        rows = self._db.execute(
+            f"SELECT candidate_id, offer_id, {', '.join(SCORE_COLUMNS)}, matched, missing FROM match_scores "
+            "ORDER BY updated_at DESC LIMIT ?", (self.max_rows,)
+        ).fetchall()
+        for row in reversed(rows):
+            scores = row[2:2 + len(SCORE_COLUMNS)]
+            matched, missing = json.loads(row[-2]), json.loads(row[-1])
+            self._set(row[0], row[1], scores, matched, missing)
+        if rows:
+            logger.info(f"{len(rows)} couple(s) candidat-offre chargés depuis le stockage des scores")
+
+    def _set(self, candidate_id: str, offer_id: str, scores, matched: List[str], missing: List[str]) -> None:
+        code = self._offers.get(offer_id)
+        if code is None:
+            code = self._offers[offer_id] = len(self._offer_ids)
+            self._offer_ids.append(offer_id)
+
+        row = self._rows.get((candidate_id, offer_id))
+        if row is None:
+            if len(self._candidates) >= self.max_rows:
+                self._evict(max(1, self.max_rows // 10))
+            row = self._rows[(candidate_id, offer_id)] = len(self._candidates)
+            self._candidates.append(candidate_id)
+            self._skills.append((matched, missing))
+            if row >= len(self._scores):
+                # Capacité doublée : ajout en O(1) amorti
+                capacity = max(64, 2 * len(self._scores))
+                grown = np.zeros((capacity, len(SCORE_COLUMNS)), dtype=np.float64)
+                grown[:row] = self._scores[:row]
+                codes = np.zeros(capacity, dtype=np.int32)
+                codes[:row] = self._offer_codes[:row]
+                updated = np.zeros(capacity, dtype=np.int64)
+                updated[:row] = self._updated[:row]
+                self._scores, self._offer_codes, self._updated = grown, codes, updated
+        self._scores[row] = scores
+        self._offer_codes[row] = code
+        self._skills[row] = (matched, missing)
+        self._sequence += 1
+        self._updated[row] = self._sequence
+
+    def _evict(self, count: int) -> None:
+        """Retire les `count` couples les moins récemment enregistrés (compactage des lignes restantes)."""
+        n = len(self._candidates)
+        keep = np.sort(np.argsort(self._updated[:n], kind="stable")[count:])
+        kept = keep.tolist()
+        self._candidates = [self._candidates[row] for row in kept]
+        self._skills = [self._skills[row] for row in kept]
+        self._scores[:keep.size] = self._scores[keep]
+        self._offer_codes[:keep.size] = self._offer_codes[keep]
+        self._updated[:keep.size] = self._updated[keep]
+        self._rows = {
+            (candidate, self._offer_ids[code]): row
+            for row, (candidate, code) in enumerate(zip(self._candidates, self._offer_codes[:keep.size].tolist()))
+        }
+
+    def _write_loop(self) -> None:
+        sql = f"INSERT OR REPLACE INTO match_scores VALUES ({', '.join('?' * (len(SCORE_COLUMNS) + 5))})"
+        while True:
+            batch = [self._writes.get()]
+            while True:
+                try:
+                    batch.append(self._writes.get_nowait())
+                except queue.Empty:
+                    break
+            rows = [row for row in batch if row is not None]
+            if rows:
+                try:
+                    self._db.executemany(sql, rows)
+                    self._db.commit()
+                    self._db_rows += len(rows)
+                    if self._db_rows > self.max_rows:
+                        self._trim()
+                except sqlite3.Error as e:
+                    logger.warning(f"Écriture de {len(rows)} score(s) impossible: {e}")
+            for _ in batch:
+                self._writes.task_done()
+            if len(rows) < len(batch):
+                return
+
+    def _trim(self) -> None:
+        """Supprime de la table les couples au-delà des `max_rows` plus récents."""
+        boundary = self._db.execute(
+            "SELECT updated_at FROM match_scores ORDER BY updated_at DESC LIMIT 1 OFFSET ?", (self.max_rows - 1,)
+        ).fetchone()
+        if boundary is not None:
+            self._db.execute("DELETE FROM match_scores WHERE updated_at < ?", (boundary[0],))
+            self._db.commit()
+        self._db_rows = self._db.execute("SELECT COUNT(*) FROM match_scores").fetchone()[0]
+
+    def flush(self) -> None:
+        """Attend l'écriture des couples enregistrés."""
+        if self._writer is not None:
+            self._writes.join()
+
+    def close(self) -> None:
+        """Écrit les couples en attente et ferme le fichier SQLite."""
+        if self._writer is None:
+            return
+        self._writes.put(None)
+        self._writer.join()
+        self._writer = None
+        self._db.close()
+        self._db = None
+
+    def record(
+        self,
+        candidate_id: str,
+        offer_id: str,
+        scores: Dict[str, float],
+        matched: List[str],
+        missing: List[str]
+    ) -> None:
+        """Enregistre (ou remplace) les sous-scores d'un couple candidat-offre ; l'écriture SQLite est différée."""
+        values = [float(scores[c]) for c in SCORE_COLUMNS]
+        with self._lock:
+            self._set(candidate_id, offer_id, values, list(matched), list(missing))
+        if self._writer is not None:
+            self._writes.put((
+                candidate_id, offer_id, *values,
+                json.dumps(matched, ensure_ascii=False), json.dumps(missing, ensure_ascii=False), time.time()
+            ))
+
+    def select(self, offer_id: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Indices des couples retenus (tous, ou ceux d'une offre) et leur matrice de sous-scores."""
+        with self._lock:
+            n = len(self._candidates)
+            if offer_id is None:
+                rows = np.arange(n)
+            else:
+                code = self._offers.get(offer_id)
+                rows = np.flatnonzero(self._offer_codes[:n] == code) if code is not None else np.arange(0)
+            return rows, self._scores[rows].copy()
+
+    def pair(self, candidate_id: str, offer_id: str) -> Optional[dict]:
+        """Sous-scores et compétences trouvées/manquantes d'un couple (None s'il n'est pas conservé)."""
+        with self._lock:
+            row = self._rows.get((candidate_id, offer_id))
+            if row is None:
+                return None
+            return {
+                'details': dict(zip(SCORE_COLUMNS, self._scores[row].round(1).tolist())),
+                'matched_skills': self._skills[row][0],
+                'missing_skills': self._skills[row][1],
+            }
+
+    def pairs(self, rows) -> List[dict]:
+        """Identifiants et compétences trouvées/manquantes des couples demandés."""
+        with self._lock:
+            return [{
+                'candidate_id': self._candidates[row],
+                'offer_id': self._offer_ids[self._offer_codes[row]],
+                'matched_skills': self._skills[row][0],
+                'missing_skills': self._skills[row][1],
+            } for row in rows]
@@ -1,15 +1,25 @@
-from typing import List, Dict, Tuple, Optional
+import asyncio
+from typing import List, Dict, Tuple, Optional, Union
 import numpy as np
 import logging
-from langchain_mistralai import MistralAIEmbeddings
 from app.core.config import settings
+from app.core.metrics import EMBEDDING_BATCH_SIZE, timed
+from app.core.singleflight import SingleFlight
+from app.services.llm.http_client import mistral_http
+from app.services.matching.embedding_batcher import EmbeddingBatcher
+from app.services.matching.embedding_cache import EmbeddingCache, normalize_text
+from app.services.matching.embedding_providers import EmbeddingProvider, as_provider, build_embedding_provider
+from app.services.matching.job_profile import JobProfile, JobProfileStore, content_id
+from app.services.matching.score_store import SCORE_COLUMNS, ScoreStore
+from app.services.matching.skill_matcher import CompiledSkills, SkillMatcher, SkillMatchResult
+from app.services.matching.taxonomy import SkillTaxonomy, load_default_taxonomy
 
 logger = logging.getLogger(__name__)
 
 class MatchingService:
     """
     Service de matching intelligent entre CV et offres d'emploi.
-    Utilise Mistral Embeddings pour la similarité sémantique.
+    Utilise Mistral Embeddings (ou un fournisseur local) pour la similarité sémantique.
     """
     
     # Poids de pondération pour le score global 
@@ -36,19 +46,101 @@ class MatchingService:
         'expert': 4
     }
 
-    def __init__(self):
+    # Similarité cosinus minimale pour considérer deux compétences équivalentes
+    SKILL_MATCH_THRESHOLD = 0.85
+
+    def __init__(
+        self,
+        embeddings=None,
+        cache: Optional[EmbeddingCache] = None,
+        skill_embeddings=None,
+        taxonomy: Optional[SkillTaxonomy] = None,
+        score_store: Optional[ScoreStore] = None
+    ):
         """
-        Initialise le service avec Mistral Embeddings.
+        Initialise le service avec ses fournisseurs d'embeddings et le cache d'embeddings.
+        `embeddings` vectorise les profils agrégés, `skill_embeddings` les
+        compétences individuelles (par défaut le même fournisseur). Chacun peut
+        être un EmbeddingProvider ou un client LangChain ; sans valeur, ils sont
+        choisis par EMBEDDING_PROVIDER / SKILL_EMBEDDING_PROVIDER.
+        `taxonomy` est le référentiel de compétences (par défaut SKILL_TAXONOMY_PATH),
+        `score_store` conserve les sous-scores pour le re-scoring (SCORE_STORE_PATH).
         """
-        try:
-            self.embeddings = MistralAIEmbeddings(
-                mistral_api_key=settings.MISTRAL_API_KEY,
-                model="mistral-embed"
-            )
-            logger.info("Client Mistral Embeddings initialisé avec succès")
-        except Exception as e:
-            logger.error(f"Erreur lors de l'initialisation de Mistral Embeddings: {e}")
-            raise
+        self._remote_client = None
+        if embeddings is None:
+            embeddings = build_embedding_provider(settings.EMBEDDING_PROVIDER, self._remote_embeddings)
+        if skill_embeddings is None and settings.SKILL_EMBEDDING_PROVIDER:
+            skill_embeddings = build_embedding_provider(settings.SKILL_EMBEDDING_PROVIDER, self._remote_embeddings)
+
+        self.embeddings = as_provider(embeddings)
+        self.skill_embeddings = as_provider(skill_embeddings) if skill_embeddings is not None else self.embeddings
+        self.cache = cache or self._build_cache(self.embeddings.name)
+        self._caches: Dict[str, EmbeddingCache] = {self.embeddings.name: self.cache}
+
+        # Le seuil de similarité dépend de l'espace vectoriel des compétences
+        self.skill_matcher = SkillMatcher(
+            threshold=self.skill_embeddings.skill_threshold or self.SKILL_MATCH_THRESHOLD,
+            taxonomy=taxonomy if taxonomy is not None else load_default_taxonomy()
+        )
+        self.inflight = SingleFlight("embeddings")
+        # Micro-batchs d'appels distants par fournisseur, partagés par tous les scorings
+        self._batchers: Dict[str, EmbeddingBatcher] = {}
+
+        # Offres compilées, réutilisées pour tous les candidats d'une même offre
+        self.job_profiles = JobProfileStore(settings.JOB_PROFILE_CACHE_SIZE)
+        self._compiling = SingleFlight("job_profile")
+
+        self.score_store = score_store if score_store is not None else ScoreStore(
+            settings.SCORE_STORE_PATH or None, max_rows=settings.SCORE_STORE_MAX_ROWS
+        )
+
+    def _remote_embeddings(self):
+        """Client Mistral Embeddings, créé au premier besoin et partagé entre fournisseurs."""
+        if self._remote_client is None:
+            # Import différé : LangChain n'est chargé que si le fournisseur distant est utilisé
+            from langchain_mistralai import MistralAIEmbeddings
+
+            try:
+                self._remote_client = MistralAIEmbeddings(
+                    mistral_api_key=settings.MISTRAL_API_KEY,
+                    model=settings.MISTRAL_EMBED_MODEL,
+                    # Pool de connexions et limiteur partagés avec le client de chat
+                    client=mistral_http.sync_client,
+                    async_client=mistral_http.async_client
+                )
+                logger.info("Client Mistral Embeddings initialisé avec succès")
+            except Exception as e:
+                logger.error(f"Erreur lors de l'initialisation de Mistral Embeddings: {e}")
+                raise
+        return self._remote_client
+
+    @staticmethod
+    def _build_cache(model: str) -> EmbeddingCache:
+        return EmbeddingCache(
+            model=model,
+            max_entries=settings.EMBEDDING_CACHE_SIZE,
+            db_path=settings.EMBEDDING_CACHE_PATH
+        )
+
+    def close(self) -> None:
+        """Écrit les vecteurs et sous-scores en attente et ferme les fichiers SQLite."""
+        for cache in list(self._caches.values()):
+            cache.close()
+        self.score_store.close()
+
+    def _cache_for(self, provider: EmbeddingProvider) -> EmbeddingCache:
+        cache = self._caches.get(provider.name)
+        if cache is None:
+            cache = self._caches[provider.name] = self._build_cache(provider.name)
+        return cache
+
+    @staticmethod
+    def _unit(vec: Optional[np.ndarray]) -> Optional[np.ndarray]:
+        """Vecteur normalisé (None si absent ou nul)."""
+        if vec is None:
+            return None
+        norm = np.linalg.norm(vec)
+        return np.asarray(vec, dtype=np.float32) / norm if norm else None
 
     def _cosine_similarity(self, vec1: np.ndarray, vec2: np.ndarray) -> float:
         """Calcule la similarité cosinus entre deux vecteurs."""
@@ -63,19 +155,85 @@ class MatchingService:
             
         return float(np.dot(vec1, vec2) / (norm1 * norm2))
 
-    async def _get_embeddings_batch(self, texts: List[str]) -> Dict[str, np.ndarray]:
-        """Récupère les embeddings pour une liste de textes en un seul appel."""
+    async def _get_embeddings_batch(
+        self, texts: List[str], provider: Optional[EmbeddingProvider] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Récupère les embeddings pour une liste de textes (fournisseur principal par défaut).
+        Seuls les textes absents du cache sont envoyés à l'API, en un seul appel ;
+        un fournisseur local est appelé directement.
+        """
+        provider = provider or self.embeddings
+
         # Filtrer les textes vides et dédoublonner
         unique_texts = list(set(t for t in texts if t and t.strip()))
         if not unique_texts:
             return {}
 
-        try:
-            embeddings = await self.embeddings.aembed_documents(unique_texts)
-            return {text: np.array(emb) for text, emb in zip(unique_texts, embeddings)}
-        except Exception as e:
-            logger.error(f"Erreur lors de la récupération des embeddings: {e}")
-            return {}
+        if not provider.cacheable:
+            return await self._embed(unique_texts, provider)
+
+        embedding_map, missing = await self._cache_for(provider).aget_many(unique_texts)
+        if not missing:
+            return embedding_map
+
+        # Single-flight par texte : les textes déjà demandés par un appel en
+        # cours sont attendus, seuls les autres partent dans un nouvel appel
+        def flight_key(text: str) -> str:
+            return f"{provider.name}\x00{normalize_text(text)}"
+
+        shared = {}
+        to_fetch = []
+        for text in missing:
+            task = self.inflight.get(flight_key(text))
+            if task is not None:
+                shared.setdefault(task, []).append(text)
+            else:
+                to_fetch.append(text)
+        if shared:
+            self.inflight.record_coalesced(sum(len(texts) for texts in shared.values()))
+
+        tasks = dict(shared)
+        if to_fetch:
+            keys = {flight_key(text) for text in to_fetch}
+            tasks[self.inflight.start(keys, self._fetch_embeddings(to_fetch, provider))] = to_fetch
+
+        outcomes = await asyncio.gather(*(asyncio.shield(task) for task in tasks), return_exceptions=True)
+        for texts_for_task, outcome in zip(tasks.values(), outcomes):
+            if isinstance(outcome, BaseException):
+                logger.error(f"Erreur lors de la récupération des embeddings: {outcome}")
+                continue
+            for text in texts_for_task:
+                vector = outcome.get(normalize_text(text))
+                if vector is not None:
+                    embedding_map[text] = vector
+
+        return embedding_map
+
+    async def _embed(self, texts: List[str], provider: EmbeddingProvider) -> Dict[str, np.ndarray]:
+        EMBEDDING_BATCH_SIZE.observe(len(texts), provider=provider.name)
+        embeddings = await provider.aembed_documents(texts)
+        return {text: np.asarray(emb, dtype=np.float32) for text, emb in zip(texts, embeddings)}
+
+    def _batcher_for(self, provider: EmbeddingProvider) -> Optional[EmbeddingBatcher]:
+        if settings.EMBEDDING_BATCH_WINDOW_MS <= 0:
+            return None
+        batcher = self._batchers.get(provider.name)
+        if batcher is None:
+            batcher = self._batchers[provider.name] = EmbeddingBatcher(
+                lambda texts: self._embed(texts, provider), provider.name
+            )
+        return batcher
+
+    async def _fetch_embeddings(self, texts: List[str], provider: EmbeddingProvider) -> Dict[str, np.ndarray]:
+        """
+        Appel au fournisseur (regroupé avec ceux des scorings simultanés) et
+        mise en cache ; résultat indexé par texte normalisé.
+        """
+        batcher = self._batcher_for(provider)
+        new_vectors = await (batcher.embed(texts) if batcher else self._embed(texts, provider))
+        self._cache_for(provider).put_many(new_vectors)
+        return {normalize_text(text): vector for text, vector in new_vectors.items()}
 
     def _extract_list(self, data: dict, *keys) -> List[str]:
         """Extrait une liste depuis un dictionnaire imbriqué."""
@@ -97,16 +255,14 @@ class MatchingService:
         except (AttributeError, TypeError):
             return default
 
-    def _calculate_experience_match(self, cv_level: str, job_level: str) -> float:
-        """
-        Compare les niveaux d'expérience.
-        """
-        cv_level = cv_level.lower().strip() if cv_level else 'junior'
-        job_level = job_level.lower().strip() if job_level else 'junior'
-        
-        cv_val = self.SENIORITY_LEVELS.get(cv_level, 1)
-        job_val = self.SENIORITY_LEVELS.get(job_level, 1)
-        
+    def _seniority_value(self, level: str) -> int:
+        """Convertit un libellé de séniorité en niveau numérique (1 à 4)."""
+        level = level.lower().strip() if level else 'junior'
+        return self.SENIORITY_LEVELS.get(level, 1)
+
+    @staticmethod
+    def _experience_score_from_levels(cv_val: int, job_val: int) -> float:
+        """Score d'expérience à partir des niveaux numériques."""
         diff = cv_val - job_val
         
         if diff >= 0:
@@ -118,115 +274,176 @@ class MatchingService:
         else:
             return 25.0     # Trop junior
 
+    def _calculate_experience_match(self, cv_level: str, job_level: str) -> float:
+        """
+        Compare les niveaux d'expérience.
+        """
+        return self._experience_score_from_levels(
+            self._seniority_value(cv_level), self._seniority_value(job_level)
+        )
+
+    def _cv_profile_texts(self, cv_data: dict) -> Dict[str, str]:
+        """Textes agrégés du CV à vectoriser : techniques, soft skills, outils."""
+        technical = self._extract_list(cv_data, 'cv_analysis', 'technical_skills')
+        soft = self._extract_list(cv_data, 'cv_analysis', 'soft_skills')
+        technologies = self._extract_list(cv_data, 'cv_analysis', 'technologies')
+
+        tech_str = " ".join(technical) if technical else ""
+        return {
+            'technical': tech_str,
+            'soft': " ".join(soft) if soft else "",
+            'tools': " ".join(technologies) if technologies else tech_str,
+        }
+
+    def _job_profile_texts(self, job_data: dict) -> Dict[str, str]:
+        """Textes agrégés de l'offre à vectoriser : techniques, soft skills, outils."""
+        technical = self._extract_list(job_data, 'required_technical_skills')
+        soft = self._extract_list(job_data, 'required_soft_skills')
+        technologies = self._extract_list(job_data, 'required_technologies')
+
+        tech_str = " ".join(technical) if technical else ""
+        return {
+            'technical': tech_str,
+            'soft': " ".join(soft) if soft else "",
+            'tools': " ".join(technologies) if technologies else tech_str,
+        }
+
     def _identify_matched_and_missing_skills(
         self, 
         cv_skills: List[str], 
-        job_skills: List[str],
+        job_skills: Union[List[str], CompiledSkills],
         embedding_map: Dict[str, np.ndarray]
-    ) -> Tuple[List[str], List[str]]:
+    ) -> SkillMatchResult:
         """
         Identifie les compétences correspondantes et manquantes en utilisant la map d'embeddings.
+        Le calcul est vectorisé (une matrice de similarités par appel) via SkillMatcher.
         """
-        if not cv_skills or not job_skills:
-            return ([], job_skills if job_skills else [])
-        
-        cv_skills_norm = [s.lower().strip() for s in cv_skills if s]
-        job_skills_norm = [s.lower().strip() for s in job_skills if s]
-        
-        matched = []
-        missing = []
-        
-        for job_skill in job_skills_norm:
-            # Match exact
-            if job_skill in cv_skills_norm:
-                matched.append(job_skill)
-                continue
-            
-            # Match sémantique
-            is_match = False
-            job_vec = embedding_map.get(job_skill)
-            
-            if job_vec is not None:
-                for cv_skill in cv_skills_norm:
-                    cv_vec = embedding_map.get(cv_skill)
-                    if cv_vec is not None:
-                        sim = self._cosine_similarity(job_vec, cv_vec)
-                        if sim > 0.85:
-                            matched.append(job_skill)
-                            is_match = True
-                            break
-            
-            if not is_match:
-                missing.append(job_skill)
-        
-        return (matched, missing)
+        return self.skill_matcher.match(cv_skills, job_skills, embedding_map)
+
+    async def job_profile(self, job_data: dict, offer_id: Optional[str] = None) -> JobProfile:
+        """
+        Offre compilée pour le scoring, construite au premier appel puis
+        conservée par identifiant d'offre (par défaut, hash de son analyse).
+        Les compilations simultanées d'une même offre sont regroupées.
+        """
+        offer_id = offer_id or content_id(job_data)
+        profile = self.job_profiles.get(offer_id)
+        if profile is not None:
+            return profile
+        return await self._compiling.do(offer_id, lambda: self._compile_job_profile(job_data, offer_id))
+
+    async def _compile_job_profile(self, job_data: dict, offer_id: str) -> JobProfile:
+        technical = self._extract_list(job_data, 'required_technical_skills')
+        soft = self._extract_list(job_data, 'required_soft_skills')
+        experience = self._extract_value(job_data, 'required_experience_level', default='Junior')
+        texts = self._job_profile_texts(job_data)
+
+        # Toutes les compétences requises sont vectorisées une fois pour l'offre
+        skills = [s.lower().strip() for s in technical + soft if s]
+        if self.skill_embeddings is self.embeddings:
+            embedding_map = await self._get_embeddings_batch(list(texts.values()) + skills)
+            skill_embedding_map = embedding_map
+        else:
+            embedding_map, skill_embedding_map = await asyncio.gather(
+                self._get_embeddings_batch(list(texts.values())),
+                self._get_embeddings_batch(skills, self.skill_embeddings)
+            )
+
+        profile = JobProfile(
+            offer_id=offer_id,
+            job_data=job_data,
+            technical=self.skill_matcher.compile(technical, skill_embedding_map),
+            soft=self.skill_matcher.compile(soft, skill_embedding_map),
+            texts=texts,
+            vectors={field: self._unit(embedding_map.get(text)) if text else None for field, text in texts.items()},
+            experience=experience,
+            level=self._seniority_value(experience)
+        )
+        # Profil incomplet (erreur du fournisseur d'embeddings) : utilisé pour
+        # cette requête mais pas conservé, la suivante retentera la vectorisation
+        complete = (
+            all(skill in skill_embedding_map for skill in skills if skill) and
+            all(text in embedding_map for text in texts.values() if text and text.strip())
+        )
+        if complete:
+            self.job_profiles.put(profile)
+        else:
+            logger.warning(f"Offre {offer_id[:12]} compilée sans tous ses embeddings : profil non mis en cache")
+        return profile
 
-    async def calculate_score(self, cv_data: dict, job_data: dict) -> dict:
+    @timed("calculate_score")
+    async def calculate_score(self, cv_data: dict, job_data, candidate_id: Optional[str] = None) -> dict:
         """
         Calcule le score de correspondance CV ↔ offre.
+        `job_data` est l'analyse de l'offre ou son JobProfile : l'offre n'est
+        compilée (et vectorisée) qu'une fois, seul le côté CV est calculé ici.
+        Les sous-scores sont enregistrés pour le couple (`candidate_id`, par
+        défaut hash de l'analyse du CV ; identifiant de l'offre).
         """
-        try:            
+        try:
+            job = job_data if isinstance(job_data, JobProfile) else await self.job_profile(job_data)
+
             # Extraction des informations clés du CV
             cv_technical = self._extract_list(cv_data, 'cv_analysis', 'technical_skills')
             cv_soft = self._extract_list(cv_data, 'cv_analysis', 'soft_skills')
-            cv_technologies = self._extract_list(cv_data, 'cv_analysis', 'technologies')
 
             cv_seniority = self._extract_value(cv_data, 'cv_analysis', 'seniority', default='Junior')
             cv_experiences = self._extract_list(cv_data, 'cv_analysis', 'experiences')
             
-            # Extraction des informations clés de l'offre
-            job_technical = self._extract_list(job_data, 'required_technical_skills')
-            job_soft = self._extract_list(job_data, 'required_soft_skills')
-            job_technologies = self._extract_list(job_data, 'required_technologies')
-
-            job_experience = self._extract_value(job_data, 'required_experience_level', default='Junior')
+            # Informations clés de l'offre (compilée)
+            job_technical = job.technical.raw
+            job_soft = job.soft.raw
+            job_experience = job.experience
             
             # Préparation des textes pour embedding
-            cv_tech_str = " ".join(cv_technical) if cv_technical else ""
-            job_tech_str = " ".join(job_technical) if job_technical else ""
-            
-            cv_soft_str = " ".join(cv_soft) if cv_soft else ""
-            job_soft_str = " ".join(job_soft) if job_soft else ""
-            
-            cv_tools_str = " ".join(cv_technologies) if cv_technologies else cv_tech_str
-            job_tools_str = " ".join(job_technologies) if job_technologies else job_tech_str
+            cv_texts = self._cv_profile_texts(cv_data)
+            job_texts = job.texts
+
+            cv_tech_str, job_tech_str = cv_texts['technical'], job_texts['technical']
+            cv_soft_str, job_soft_str = cv_texts['soft'], job_texts['soft']
+            cv_tools_str, job_tools_str = cv_texts['tools'], job_texts['tools']
             
-            # Collecte de tous les textes uniques à vectoriser
-            texts_to_embed = [
-                cv_tech_str, job_tech_str,
-                cv_soft_str, job_soft_str,
-                cv_tools_str, job_tools_str
-            ]
+            # Seuls les textes du CV restent à vectoriser
+            texts_to_embed = [cv_tech_str, cv_soft_str, cv_tools_str]
             
-            # Ajout des compétences individuelles pour le matching détaillé
-            cv_skills_all = [s.lower().strip() for s in cv_technical + cv_soft if s]
-            job_skills_all = [s.lower().strip() for s in job_technical + job_soft if s]
-            texts_to_embed.extend(cv_skills_all)
-            texts_to_embed.extend(job_skills_all)
+            # Compétences individuelles pour le matching détaillé : seules celles
+            # que le référentiel ne résout pas sont vectorisées
+            skills_to_embed = (
+                self.skill_matcher.skills_to_embed(cv_technical, job.technical) +
+                self.skill_matcher.skills_to_embed(cv_soft, job.soft)
+            )
             
-            # Récupération des embeddings en batch
-            embedding_map = await self._get_embeddings_batch(texts_to_embed)
+            # Récupération des embeddings en batch : un seul appel si profils et
+            # compétences partagent le même fournisseur, sinon deux en parallèle
+            if self.skill_embeddings is self.embeddings:
+                embedding_map = await self._get_embeddings_batch(texts_to_embed + skills_to_embed)
+                skill_embedding_map = embedding_map
+            else:
+                embedding_map, skill_embedding_map = await asyncio.gather(
+                    self._get_embeddings_batch(texts_to_embed),
+                    self._get_embeddings_batch(skills_to_embed, self.skill_embeddings)
+                )
 
             # ========== CALCUL DES SCORES  ==========
             # 1. Score Compétences Techniques
             technical_score = self._cosine_similarity(
                 embedding_map.get(cv_tech_str), 
-                embedding_map.get(job_tech_str)
+                job.vectors['technical']
             ) * 100 if job_tech_str else 100.0
             
             # 2. Score Compétences Comportementales
             soft_score = self._cosine_similarity(
                 embedding_map.get(cv_soft_str), 
-                embedding_map.get(job_soft_str)
+                job.vectors['soft']
             ) * 100 if job_soft_str else 100.0
             
             # 3. Score Expérience
-            experience_score = self._calculate_experience_match(cv_seniority, job_experience)
+            experience_score = self._experience_score_from_levels(self._seniority_value(cv_seniority), job.level)
             
             # 4. Score Technologies/Outils
             technology_score = self._cosine_similarity(
                 embedding_map.get(cv_tools_str), 
-                embedding_map.get(job_tools_str)
+                job.vectors['tools']
             ) * 100 if job_tools_str else 100.0
             
             # Score Global avec pondération
@@ -238,16 +455,19 @@ class MatchingService:
             )
             
             # ========== IDENTIFICATION DES ÉCARTS  ==========
-            matched_technical, missing_technical = self._identify_matched_and_missing_skills(
-                cv_technical, job_technical, embedding_map
+            technical_match = self._identify_matched_and_missing_skills(
+                cv_technical, job.technical, skill_embedding_map
             )
-            matched_soft, missing_soft = self._identify_matched_and_missing_skills(
-                cv_soft, job_soft, embedding_map
+            soft_match = self._identify_matched_and_missing_skills(
+                cv_soft, job.soft, skill_embedding_map
             )
+            matched_technical, missing_technical = technical_match.matched, technical_match.missing
+            matched_soft, missing_soft = soft_match.matched, soft_match.missing
             
             # Combinaison pour le rapport
             matched_skills = matched_technical + matched_soft
             missing_skills = missing_technical + missing_soft
+            skill_matches = technical_match.details + soft_match.details
             
             # ========== RECOMMANDATION FINALE  ==========
             if overall_score >= self.RECOMMENDATION_THRESHOLDS['strongly_recommended']:
@@ -256,6 +476,15 @@ class MatchingService:
                 recommendation = 'consider'
             else:
                 recommendation = 'not_recommended'
+
+            # Sous-scores conservés pour un re-scoring ultérieur
+            candidate_id = candidate_id or content_id(cv_data)
+            self.score_store.record(candidate_id, job.offer_id, {
+                'skills_score': technical_score,
+                'soft_skills_score': soft_score,
+                'experience_score': experience_score,
+                'technologies_score': technology_score,
+            }, matched_skills, missing_skills)
             
 
             # ========== GÉNÉRATION DES POINTS FORTS  ==========
@@ -298,10 +527,15 @@ class MatchingService:
             
             # ========== STRUCTURE FINALE DU RAPPORT  ==========
             return {
+                'candidate_id': candidate_id,
+                'offer_id': job.offer_id,
                 'overall_score': round(overall_score, 1),
                 'matched_skills': matched_skills,
                 'missing_skills': missing_skills,
+                'skill_matches': skill_matches,
                 'recommendation': recommendation if recommendation != 'consider' else 'recommended',
+                'strengths': strengths,
+                'concerns': concerns,
                 'details': {
                     'skills_score': round(technical_score, 1),
                     'soft_skills_score': round(soft_score, 1),
@@ -316,7 +550,10 @@ class MatchingService:
                 'overall_score': 0.0,
                 'matched_skills': [],
                 'missing_skills': [],
+                'skill_matches': [],
                 'recommendation': 'not_recommended',
+                'strengths': [],
+                'concerns': [],
                 'details': {
                     'skills_score': 0.0,
                     'soft_skills_score': 0.0,
@@ -324,3 +561,69 @@ class MatchingService:
                     'technologies_score': 0.0
                 }
             }
+
+    def _scoring_profile(self, weights: Optional[Dict[str, float]], thresholds: Optional[Dict[str, float]]) -> Tuple[Dict[str, float], Dict[str, float]]:
+        """Complète et valide un profil de pondération (poids ramenés à une somme de 1)."""
+        unknown = set(weights or {}) - set(self.WEIGHTS)
+        if unknown:
+            raise ValueError(f"Poids inconnus: {', '.join(sorted(unknown))} (valeurs possibles : {', '.join(self.WEIGHTS)}).")
+        unknown = set(thresholds or {}) - set(self.RECOMMENDATION_THRESHOLDS)
+        if unknown:
+            raise ValueError(f"Seuils inconnus: {', '.join(sorted(unknown))} (valeurs possibles : {', '.join(self.RECOMMENDATION_THRESHOLDS)}).")
+
+        weights = {**self.WEIGHTS, **(weights or {})}
+        total = sum(weights.values())
+        if any(w < 0 for w in weights.values()) or total <= 0:
+            raise ValueError("Les poids doivent être positifs et de somme non nulle.")
+        thresholds = {**self.RECOMMENDATION_THRESHOLDS, **(thresholds or {})}
+        if thresholds['consider'] > thresholds['strongly_recommended']:
+            raise ValueError("Le seuil 'consider' ne peut pas dépasser 'strongly_recommended'.")
+        return {k: w / total for k, w in weights.items()}, thresholds
+
+    def rescore(
+        self,
+        weights: Optional[Dict[str, float]] = None,
+        thresholds: Optional[Dict[str, float]] = None,
+        offer_id: Optional[str] = None,
+        top_k: Optional[int] = None
+    ) -> dict:
+        """
+        Applique un profil de pondération (poids et seuils, par défaut ceux du
+        service) aux sous-scores enregistrés, sans appel aux modèles : un
+        produit matrice-vecteur sur tous les couples (ou ceux d'une offre).
+        """
+        weights, thresholds = self._scoring_profile(weights, thresholds)
+        # Ordre des colonnes de ScoreStore : techniques, soft skills, expérience, outils
+        weight_vector = np.array([
+            weights['technical_skills'], weights['soft_skills'], weights['experience'], weights['technologies']
+        ])
+
+        rows, scores = self.score_store.select(offer_id)
+        overall = scores @ weight_vector
+        recommendations = np.select(
+            [overall >= thresholds['strongly_recommended'], overall >= thresholds['consider']],
+            ['strongly_recommended', 'recommended'],
+            default='not_recommended'
+        )
+
+        order = np.argsort(-overall, kind='stable')
+        if top_k is not None:
+            order = order[:top_k]
+
+        # Conversions groupées : une seule boucle Python pour construire les résultats
+        pairs = self.score_store.pairs(rows[order].tolist())
+        results = [
+            {**pair, 'rank': rank, 'overall_score': score, 'recommendation': recommendation,
+             'details': dict(zip(SCORE_COLUMNS, details))}
+            for rank, (pair, score, recommendation, details) in enumerate(zip(
+                pairs, overall[order].round(1).tolist(), recommendations[order].tolist(),
+                scores[order].round(1).tolist()
+            ), start=1)
+        ]
+
+        return {
+            'total': len(rows),
+            'weights': weights,
+            'thresholds': thresholds,
+            'results': results,
+        }
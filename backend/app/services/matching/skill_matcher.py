@@ -0,0 +1,158 @@
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+from app.services.matching.taxonomy import SkillTaxonomy
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """Normalise chaque ligne (norme L2) ; les lignes nulles restent nulles."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class SkillMatchResult:
+    """Résultat du rapprochement compétence par compétence."""
+
+    def __init__(self, matched: List[str], missing: List[str], details: List[dict]):
+        self.matched = matched
+        self.missing = missing
+        # Pour chaque compétence requise : meilleure compétence du CV et similarité
+        self.details = details
+
+
+class CompiledSkills:
+    """
+    Compétences requises prêtes pour le rapprochement : libellés normalisés,
+    identifiants canoniques du référentiel et matrice d'embeddings
+    pré-normalisée (une ligne par compétence disposant d'un vecteur).
+    """
+
+    def __init__(self, skills: List[str], embedding_map: Dict[str, np.ndarray], taxonomy: Optional[SkillTaxonomy] = None):
+        self.raw = list(skills)
+        self.skills = [s.lower().strip() for s in skills if s]
+        self.canonicals = [taxonomy.canonical(s) if taxonomy else None for s in self.skills]
+
+        with_vec = [s for s in dict.fromkeys(self.skills) if embedding_map.get(s) is not None]
+        self.rows: Dict[str, int] = {s: i for i, s in enumerate(with_vec)}
+        if with_vec:
+            self.matrix = normalize_rows(np.vstack([embedding_map[s] for s in with_vec]).astype(np.float32))
+        else:
+            self.matrix = np.zeros((0, 0), dtype=np.float32)
+        self.known = np.array([bool(taxonomy and taxonomy.canonical(s)) for s in with_vec], dtype=bool)
+
+
+class SkillMatcher:
+    """
+    Moteur de rapprochement vectorisé entre compétences du CV et de l'offre.
+
+    Les vecteurs sont empilés dans deux matrices pré-normalisées : une seule
+    multiplication matricielle donne toutes les similarités cosinus, seuillées
+    en une passe. Les correspondances exactes sont résolues par ensemble.
+
+    Avec un référentiel (`taxonomy`), les alias et la hiérarchie sont résolus
+    par simple recherche (« ReactJS » couvre « React », « Django » couvre
+    « Python ») ; les embeddings ne départagent que les compétences absentes
+    du référentiel.
+    """
+
+    def __init__(self, threshold: float = 0.85, taxonomy: Optional[SkillTaxonomy] = None):
+        self.threshold = threshold
+        self.taxonomy = taxonomy
+
+    def compile(self, skills: List[str], embedding_map: Dict[str, np.ndarray]) -> "CompiledSkills":
+        """Prépare une liste de compétences requises (réutilisable pour plusieurs CV)."""
+        return CompiledSkills(skills, embedding_map, self.taxonomy)
+
+    def skills_to_embed(self, cv_skills: List[str], job_skills: Union[List[str], "CompiledSkills"]) -> List[str]:
+        """
+        Compétences (normalisées) dont `match` aura besoin de l'embedding ;
+        celles d'une liste compilée disposent déjà du leur.
+        """
+        compiled = job_skills if isinstance(job_skills, CompiledSkills) else None
+        cv_skills_norm = [s.lower().strip() for s in cv_skills if s]
+        job_skills_norm = compiled.skills if compiled else [s.lower().strip() for s in job_skills if s]
+        if not cv_skills_norm or not job_skills_norm:
+            return []
+        cv_skill_set = set(cv_skills_norm)
+        pending = [s for s in job_skills_norm if s not in cv_skill_set]
+        if self.taxonomy is None:
+            texts = list(dict.fromkeys(cv_skills_norm + pending)) if pending else []
+        else:
+            texts = sorted(self.taxonomy.skills_to_embed(cv_skills_norm, pending))
+        return [s for s in texts if compiled is None or s not in compiled.rows]
+
+    def match(
+        self,
+        cv_skills: List[str],
+        job_skills: Union[List[str], "CompiledSkills"],
+        embedding_map: Dict[str, np.ndarray]
+    ) -> SkillMatchResult:
+        job = job_skills if isinstance(job_skills, CompiledSkills) else self.compile(job_skills, embedding_map)
+        if not cv_skills or not job.raw:
+            details = [self._detail(skill, False, None, 0.0) for skill in job.raw]
+            return SkillMatchResult([], list(job.raw), details)
+
+        cv_skills_norm = [s.lower().strip() for s in cv_skills if s]
+        job_skills_norm = job.skills
+        cv_skill_set = set(cv_skills_norm)
+
+        # Résolution par le référentiel : compétence canonique ou ancêtre couvert
+        resolved: Dict[str, str] = {}
+        if self.taxonomy is not None:
+            covered = self.taxonomy.coverage(cv_skills_norm)
+            for s, canonical in zip(job_skills_norm, job.canonicals):
+                if s not in cv_skill_set and canonical in covered:
+                    resolved[s] = covered[canonical]
+
+        # Compétences du CV disposant d'un embedding (ordre conservé, sans doublon)
+        cv_with_vec = [s for s in dict.fromkeys(cv_skills_norm) if embedding_map.get(s) is not None]
+        # Compétences requises à résoudre sémantiquement (lignes de la matrice compilée)
+        job_with_vec = list(dict.fromkeys(
+            s for s in job_skills_norm
+            if s not in cv_skill_set and s not in resolved and s in job.rows
+        ))
+
+        best: Dict[str, tuple] = {}
+        if cv_with_vec and job_with_vec:
+            cv_matrix = normalize_rows(np.vstack([embedding_map[s] for s in cv_with_vec]).astype(np.float32))
+            job_rows = [job.rows[s] for s in job_with_vec]
+
+            similarities = job.matrix[job_rows] @ cv_matrix.T
+            if self.taxonomy is not None:
+                # Deux compétences du référentiel non reliées par la hiérarchie
+                # sont distinctes : leur similarité vectorielle est ignorée
+                known_cv = np.array([self.taxonomy.canonical(s) is not None for s in cv_with_vec])
+                similarities[np.outer(job.known[job_rows], known_cv)] = -np.inf
+            best_idx = similarities.argmax(axis=1)
+            best_sim = similarities[np.arange(len(job_with_vec)), best_idx]
+
+            for skill, idx, sim in zip(job_with_vec, best_idx, best_sim):
+                if np.isfinite(sim):
+                    best[skill] = (cv_with_vec[idx], float(sim))
+
+        matched, missing, details = [], [], []
+        for job_skill in job_skills_norm:
+            exact = job_skill in cv_skill_set or job_skill in resolved
+            if job_skill in cv_skill_set:
+                best_match, similarity = job_skill, 1.0
+            elif job_skill in resolved:
+                best_match, similarity = resolved[job_skill], 1.0
+            else:
+                best_match, similarity = best.get(job_skill, (None, 0.0))
+
+            is_match = exact or similarity > self.threshold
+            (matched if is_match else missing).append(job_skill)
+            details.append(self._detail(job_skill, is_match, best_match, similarity))
+
+        return SkillMatchResult(matched, missing, details)
+
+    @staticmethod
+    def _detail(skill: str, matched: bool, best_match: Optional[str], similarity: float) -> dict:
+        return {
+            'skill': skill,
+            'matched': matched,
+            'best_match': best_match,
+            'similarity': round(similarity, 4),
+        }
@@ -0,0 +1,128 @@
+import json
+import logging
+import os
+import re
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(__file__), "skill_taxonomy.json")
+
+_SEPARATORS = re.compile(r"[\s.\-_/]+")
+
+
+def taxonomy_key(text: str) -> str:
+    """
+    Clé de recherche d'une compétence : casse, accents et séparateurs ignorés
+    (« React.js », « reactjs » et « React JS » donnent la même clé).
+    """
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    without_accents = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return _SEPARATORS.sub("", without_accents)
+
+
+class SkillTaxonomy:
+    """
+    Référentiel de compétences : nom canonique, alias et hiérarchie
+    (Django → Python), compilé en un index de hachage clé → compétence.
+
+    Une compétence du CV couvre aussi ses ancêtres : un candidat Django
+    satisfait une exigence Python, l'inverse n'est pas vrai.
+    """
+
+    def __init__(self, entries: Iterable[dict]):
+        self._index: Dict[str, str] = {}
+        self._names: Dict[str, str] = {}  # identifiant canonique → nom affiché
+        parents: Dict[str, Optional[str]] = {}
+
+        for entry in entries:
+            canonical = taxonomy_key(entry["name"])
+            self._names[canonical] = entry["name"]
+            parents[canonical] = taxonomy_key(entry["parent"]) if entry.get("parent") else None
+            for alias in [entry["name"], *entry.get("aliases", [])]:
+                key = taxonomy_key(alias)
+                existing = self._index.get(key)
+                if existing is not None and existing != canonical:
+                    raise ValueError(f"Alias de compétence ambigu: '{alias}' ({existing} / {canonical}).")
+                self._index[key] = canonical
+
+        self._ancestors: Dict[str, Tuple[str, ...]] = {}
+        for canonical in parents:
+            chain, parent = [], parents[canonical]
+            while parent is not None and parent not in chain:
+                if parent not in parents:
+                    raise ValueError(f"Compétence parente inconnue: '{parent}'.")
+                chain.append(parent)
+                parent = parents[parent]
+            self._ancestors[canonical] = tuple(chain)
+
+    @classmethod
+    def load(cls, path: str) -> "SkillTaxonomy":
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        taxonomy = cls(data["skills"])
+        logger.info(f"Référentiel de compétences chargé : {len(taxonomy)} compétences, {len(taxonomy._index)} alias")
+        return taxonomy
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def canonical(self, skill: str) -> Optional[str]:
+        """Identifiant canonique d'une compétence, ou None si elle est inconnue."""
+        return self._index.get(taxonomy_key(skill))
+
+    def display_name(self, skill: str) -> str:
+        """Nom canonique affichable (la compétence telle quelle si elle est inconnue)."""
+        canonical = self.canonical(skill)
+        return self._names[canonical] if canonical else skill
+
+    def coverage(self, skills: Iterable[str]) -> Dict[str, str]:
+        """
+        Compétences canoniques couvertes par une liste (compétences et leurs
+        ancêtres), associées à la compétence qui les apporte.
+        """
+        covered: Dict[str, str] = {}
+        for skill in skills:
+            canonical = self.canonical(skill)
+            if canonical is None:
+                continue
+            covered.setdefault(canonical, skill)
+            for ancestor in self._ancestors[canonical]:
+                covered.setdefault(ancestor, skill)
+        return covered
+
+    def skills_to_embed(self, cv_skills: List[str], job_skills: List[str]) -> Set[str]:
+        """
+        Compétences dont l'embedding reste nécessaire après résolution par le
+        référentiel : exigences non couvertes comparables à au moins une
+        compétence du CV, et ces compétences du CV. Deux compétences connues
+        du référentiel ne sont jamais comparées par embeddings.
+        """
+        covered = self.coverage(cv_skills)
+        unknown_cv = [s for s in cv_skills if self.canonical(s) is None]
+
+        texts: Set[str] = set()
+        for skill in job_skills:
+            canonical = self.canonical(skill)
+            if canonical is not None and canonical in covered:
+                continue
+            comparable = unknown_cv if canonical is not None else cv_skills
+            if comparable:
+                texts.add(skill)
+                texts.update(comparable)
+        return texts
+
+
+def load_default_taxonomy() -> Optional[SkillTaxonomy]:
+    """Référentiel configuré (SKILL_TAXONOMY_PATH, vide = fichier fourni, `none` = désactivé)."""
+    path = settings.SKILL_TAXONOMY_PATH or DEFAULT_TAXONOMY_PATH
+    if path.lower() == "none":
+        return None
+    try:
+        return SkillTaxonomy.load(path)
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning(f"Référentiel de compétences indisponible ({path}): {e}")
+        return None
@@ -1,79 +1,167 @@
 import io
-from typing import Optional
-import pypdf
-import docx
+import logging
+from typing import Iterable, Iterator, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
 
 class TextExtractor:
+    """
+    Text extraction from uploaded documents.
+
+    Documents are read as a stream of chunks (PDF pages, DOCX paragraphs) that
+    are joined once at the end. Reading stops as soon as the character budget
+    (`max_chars`, default settings.EXTRACTION_MAX_CHARS, 0 = unlimited) is
+    reached, so the remaining pages are never parsed nor rasterized.
+
+    The parsing libraries (pypdf, python-docx) are imported on first use, so
+    importing this module does not slow down application startup.
+    """
+
+    @staticmethod
+    def preload() -> None:
+        """Import the parsing libraries ahead of the first document (warm-up)."""
+        import pypdf  # noqa: F401
+        import docx  # noqa: F401
+
+    @staticmethod
+    def join_chunks(chunks: Iterable[str], max_chars: Optional[int] = None) -> str:
+        """Join text chunks with newlines, stopping once `max_chars` is reached."""
+        parts = []
+        total = 0
+        for chunk in chunks:
+            parts.append(chunk)
+            total += len(chunk) + 1
+            if max_chars and total >= max_chars:
+                break
+
+        text = "\n".join(parts).strip()
+        return text[:max_chars] if max_chars else text
+
     @staticmethod
-    def extract_text_from_pdf(file_content: bytes) -> str:
-        """Extract text from a PDF file content, with OCR fallback for scanned documents."""
+    def _ocr_available() -> bool:
+        try:
+            import pytesseract  # noqa: F401
+            from pdf2image import convert_from_bytes  # noqa: F401
+            return True
+        except ImportError:
+            # Log warning but don't fail if OCR libs aren't installed
+            logger.warning("OCR libraries (pytesseract, pdf2image) not found. Skipping OCR.")
+            return False
+
+    @staticmethod
+    def iter_pdf_pages(file_content: bytes, ocr: bool = True, dpi: Optional[int] = None) -> Iterator[str]:
+        """
+        Yield the text of each PDF page.
+        If no page contains native text (scanned PDF) and ocr=True, pages are
+        rasterized and OCRed one at a time.
+        """
+        import pypdf
+
         try:
-            # First try standard extraction
             pdf_reader = pypdf.PdfReader(io.BytesIO(file_content))
-            text = ""
-            for page in pdf_reader.pages:
+            page_count = len(pdf_reader.pages)
+        except Exception as e:
+            raise ValueError(f"Une erreur s'est produite lors de la lecture du PDF: {str(e)}")
+
+        has_text = False
+        for page in pdf_reader.pages:
+            try:
                 extracted = page.extract_text()
-                if extracted:
-                    text += extracted + "\n"
-            
-            text = text.strip()
-
-            # If no text extracted (scanned PDF), try OCR
-            if not text:
-                try:
-                    import pytesseract
-                    from pdf2image import convert_from_bytes
-                    
-                    # Convert PDF to images
-                    images = convert_from_bytes(file_content)
-                    
-                    # Extract text from each image
-                    for image in images:
-                        text += pytesseract.image_to_string(image) + "\n"
-                    
-                    text = text.strip()
-                except ImportError:
-                    # Log warning but don't fail if OCR libs aren't installed
-                    print("Warning: OCR libraries (pytesseract, pdf2image) not found. Skipping OCR.")
-                except Exception as e:
-                    # Log warning for OCR specific errors ( mfor example missing tesseract binary)
-                    print(f"Warning: OCR extraction failed: {str(e)}")
-
-            return text
+            except Exception as e:
+                raise ValueError(f"Une erreur s'est produite lors de la lecture du PDF: {str(e)}")
+            if extracted:
+                has_text = has_text or bool(extracted.strip())
+                yield extracted
+
+        # If no text extracted (scanned PDF), try OCR
+        if not has_text and ocr and TextExtractor._ocr_available():
+            for page_number in range(1, page_count + 1):
+                text = TextExtractor.ocr_pdf_page(file_content, page_number, dpi=dpi)
+                if text:
+                    yield text
+
+    @staticmethod
+    def extract_text_from_pdf(file_content: bytes, ocr: bool = True, max_chars: Optional[int] = None) -> str:
+        """
+        Extract text from a PDF file content, with OCR fallback for scanned documents.
+        With ocr=False, scanned documents return an empty string (the caller can
+        then OCR the pages itself, e.g. in parallel with ocr_pdf_page).
+        """
+        return TextExtractor.join_chunks(TextExtractor.iter_pdf_pages(file_content, ocr=ocr), max_chars)
+
+    @staticmethod
+    def pdf_page_count(file_content: bytes) -> int:
+        """Number of pages of a PDF file content."""
+        import pypdf
 
+        try:
+            return len(pypdf.PdfReader(io.BytesIO(file_content)).pages)
         except Exception as e:
             raise ValueError(f"Une erreur s'est produite lors de la lecture du PDF: {str(e)}")
 
     @staticmethod
-    def extract_text_from_docx(file_content: bytes) -> str:
-        """Extract text from a DOCX file content."""
+    def ocr_pdf_page(file_content: bytes, page_number: int, dpi: Optional[int] = None) -> str:
+        """OCR a single PDF page (1-based); only this page is rasterized, at `dpi` (default settings.OCR_DPI)."""
+        try:
+            import pytesseract
+            from pdf2image import convert_from_bytes
+
+            images = convert_from_bytes(
+                file_content, dpi=dpi or settings.OCR_DPI, first_page=page_number, last_page=page_number
+            )
+            return "\n".join(pytesseract.image_to_string(image) for image in images).strip()
+        except ImportError:
+            # Already reported by _ocr_available
+            logger.debug(f"OCR libraries not found, page {page_number} skipped.")
+        except Exception as e:
+            # Log warning for OCR specific errors (for example missing tesseract binary)
+            logger.warning(f"OCR extraction failed on page {page_number}: {str(e)}")
+        return ""
+
+    @staticmethod
+    def iter_docx_paragraphs(file_content: bytes) -> Iterator[str]:
+        """Yield the text of each DOCX paragraph."""
+        import docx
+
         try:
             doc = docx.Document(io.BytesIO(file_content))
-            text = ""
             for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            return text.strip()
+                yield paragraph.text
         except Exception as e:
             raise ValueError(f"Une erreur s'est produite lors de la lecture du DOCX: {str(e)}")
 
     @staticmethod
-    def extract_text_from_txt(file_content: bytes) -> str:
+    def extract_text_from_docx(file_content: bytes, max_chars: Optional[int] = None) -> str:
+        """Extract text from a DOCX file content."""
+        return TextExtractor.join_chunks(TextExtractor.iter_docx_paragraphs(file_content), max_chars)
+
+    @staticmethod
+    def extract_text_from_txt(file_content: bytes, max_chars: Optional[int] = None) -> str:
         """Extract text from a TXT file content."""
         try:
-            return file_content.decode("utf-8").strip()
+            return TextExtractor.join_chunks([file_content.decode("utf-8")], max_chars)
         except Exception as e:
             raise ValueError(f"Une erreur s'est produite lors de la lecture du fichier texte: {str(e)}")
 
     @classmethod
-    def extract(cls, filename: str, content: bytes) -> str:
-        """Main entry point to extract text based on file extension."""
+    def iter_text(cls, filename: str, content: bytes, ocr: bool = True) -> Iterator[str]:
+        """Streaming entry point: yield text chunks based on file extension."""
         ext = filename.split('.')[-1].lower()
-        
+
         if ext == 'pdf':
-            return cls.extract_text_from_pdf(content)
+            return cls.iter_pdf_pages(content, ocr=ocr)
         elif ext in ['docx', 'doc']:
-            return cls.extract_text_from_docx(content)
+            return cls.iter_docx_paragraphs(content)
         elif ext == 'txt':
-            return cls.extract_text_from_txt(content)
+            return iter([cls.extract_text_from_txt(content)])
         else:
             raise ValueError(f"Format de fichier non supporté: {ext}")
+
+    @classmethod
+    def extract(cls, filename: str, content: bytes, ocr: bool = True, max_chars: Optional[int] = None) -> str:
+        """Main entry point to extract text based on file extension."""
+        if max_chars is None:
+            max_chars = settings.EXTRACTION_MAX_CHARS
+        return cls.join_chunks(cls.iter_text(filename, content, ocr=ocr), max_chars)
@@ -0,0 +1,190 @@
+import logging
+import re
+import unicodedata
+from typing import Dict, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.core.metrics import CV_TOKENS
+
+logger = logging.getLogger(__name__)
+
+_WORDS = re.compile(r"\w+")
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_SPACES = re.compile(r"[ \t\u00a0\u2000-\u200b]+")
+# Numéros de page : « 2 », « - 2 - », « Page 2 », « 2/3 », « Page 2 sur 3 »
+_PAGE_NUMBER = re.compile(r"^(page\s*)?[-–]?\s*\d{1,3}\s*[-–]?(\s*(/|sur|of)\s*\d{1,3})?$")
+
+# Titres de sections reconnus (clé normalisée sans accents ni ponctuation)
+SECTION_HEADINGS = {
+    'profile': ("profil", "resume", "summary", "a propos", "about", "objectif"),
+    'experience': ("experience", "experiences", "experience professionnelle", "experiences professionnelles",
+                   "parcours professionnel", "work experience", "professional experience", "employment"),
+    'skills': ("competences", "competences techniques", "competences cles", "skills", "technical skills",
+               "savoir faire", "outils", "technologies", "stack technique"),
+    'education': ("formation", "formations", "education", "diplomes", "etudes", "parcours academique"),
+    'projects': ("projets", "projects", "realisations", "projets personnels"),
+    'certifications': ("certifications", "certificats"),
+    'languages': ("langues", "languages"),
+    'interests': ("centres d interet", "centres d interets", "loisirs", "hobbies", "interets", "activites"),
+    'references': ("references",),
+}
+_HEADING_KEYS = {key: section for section, keys in SECTION_HEADINGS.items() for key in keys}
+
+# Ordre de conservation quand le budget est dépassé (le début du CV, avant
+# le premier titre, contient l'intitulé du poste)
+SECTION_PRIORITY = ('skills', 'experience', 'header', 'education', 'languages', 'profile',
+                    'certifications', 'projects', 'interests', 'references')
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimation locale et rapide du nombre de tokens : environ un token par
+    tranche de 4 caractères d'un mot, un par signe de ponctuation.
+    """
+    return sum((len(word) + 3) // 4 for word in _WORDS.findall(text)) + len(_PUNCTUATION.findall(text))
+
+
+def _line_key(line: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", line.casefold())
+    without_accents = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(re.sub(r"[^\w]+", " ", without_accents).split())
+
+
+class PreprocessedText:
+    """Texte prétraité et statistiques associées."""
+
+    def __init__(self, text: str, tokens_before: int, tokens_after: int, sections: List[str], truncated: bool):
+        self.text = text
+        self.tokens_before = tokens_before
+        self.tokens_after = tokens_after
+        self.sections = sections
+        self.truncated = truncated
+
+
+class CVPreprocessor:
+    """
+    Prétraitement du texte extrait d'un CV avant l'appel LLM :
+
+    1. normalisation des espaces et suppression des lignes vides multiples ;
+    2. suppression du bruit de mise en page : numéros de page, en-têtes et
+       pieds de page répétés (lignes courtes répétées près d'un numéro de
+       page, ou au moins REPEATED_LINE_MIN_COUNT fois ; seule la première
+       occurrence est conservée). Les autres lignes répétées du corps du CV
+       (mêmes technologies ou puces sous deux postes) sont conservées ;
+    3. découpage en sections d'après leurs titres (expérience, compétences,
+       formation, langues...) ;
+    4. au-delà de `token_budget` tokens estimés, les sections sont conservées
+       par ordre de priorité (SECTION_PRIORITY), la dernière tronquée à la
+       ligne, puis remises dans leur ordre d'origine.
+
+    Le coût et la latence de l'extraction LLM sont ainsi bornés par CV.
+    """
+
+    # En-tête ou pied de page : ligne courte, répétée près d'un numéro de page
+    # (à PAGE_MARGIN_LINES lignes près) ou au moins REPEATED_LINE_MIN_COUNT fois
+    MAX_BOILERPLATE_LENGTH = 80
+    PAGE_MARGIN_LINES = 2
+    REPEATED_LINE_MIN_COUNT = 4
+
+    def __init__(self, token_budget: Optional[int] = None):
+        self.token_budget = settings.CV_TOKEN_BUDGET if token_budget is None else token_budget
+
+    def _boilerplate(self, lines: List[str], keys: List[str]) -> Set[str]:
+        """Clés des lignes répétées d'en-tête ou de pied de page."""
+        page_numbers = [i for i, line in enumerate(lines) if _PAGE_NUMBER.match(line.casefold())]
+        counts: Dict[str, int] = {}
+        near_page = set()
+        for i, (line, key) in enumerate(zip(lines, keys)):
+            if not key or len(line) > self.MAX_BOILERPLATE_LENGTH:
+                continue
+            counts[key] = counts.get(key, 0) + 1
+            if any(abs(i - p) <= self.PAGE_MARGIN_LINES for p in page_numbers):
+                near_page.add(key)
+        return {
+            key for key, count in counts.items()
+            if count >= self.REPEATED_LINE_MIN_COUNT or (count >= 2 and key in near_page)
+        }
+
+    def clean(self, text: str) -> List[str]:
+        """Lignes utiles du texte (espaces normalisés, bruit de mise en page retiré)."""
+        # Lignes non vides (None marque une ligne vide)
+        normalized = [_SPACES.sub(" ", raw).strip() or None for raw in text.splitlines()]
+        content = [line for line in normalized if line]
+        keys = [_line_key(line) for line in content]
+        boilerplate = self._boilerplate(content, keys)
+
+        lines: List[str] = []
+        seen = set()
+        keys_iter = iter(keys)
+        for line in normalized:
+            if line is None:
+                if lines and lines[-1]:
+                    lines.append("")
+                continue
+            key = next(keys_iter)
+            if not key or _PAGE_NUMBER.match(line.casefold()):
+                continue
+            if key in boilerplate:
+                if key in seen:
+                    continue
+                seen.add(key)
+            lines.append(line)
+        while lines and not lines[-1]:
+            lines.pop()
+        return lines
+
+    @staticmethod
+    def split_sections(lines: List[str]) -> List[Tuple[str, List[str]]]:
+        """Découpe les lignes en sections (nom, lignes) ; `header` précède le premier titre."""
+        sections: List[Tuple[str, List[str]]] = [('header', [])]
+        for line in lines:
+            section = _HEADING_KEYS.get(_line_key(line)) if len(line) <= 60 else None
+            if section is not None:
+                sections.append((section, [line]))
+            else:
+                sections[-1][1].append(line)
+        return [(name, body) for name, body in sections if any(body)]
+
+    def _fit(self, sections: List[Tuple[str, List[str]]]) -> Tuple[List[Tuple[str, List[str]]], bool]:
+        kept = {}
+        remaining = self.token_budget
+        order = sorted(
+            range(len(sections)),
+            key=lambda i: SECTION_PRIORITY.index(sections[i][0]) if sections[i][0] in SECTION_PRIORITY else len(SECTION_PRIORITY)
+        )
+        truncated = False
+        for i in order:
+            lines = []
+            for line in sections[i][1]:
+                cost = estimate_tokens(line) + 1
+                if cost > remaining:
+                    truncated = True
+                    break
+                lines.append(line)
+                remaining -= cost
+            else:
+                kept[i] = lines
+                continue
+            if lines:
+                kept[i] = lines
+            remaining = 0
+        return [(sections[i][0], kept[i]) for i in sorted(kept)], truncated
+
+    def process(self, text: str) -> PreprocessedText:
+        tokens_before = estimate_tokens(text)
+        sections = self.split_sections(self.clean(text))
+
+        truncated = False
+        if self.token_budget and sum(estimate_tokens(" ".join(body)) + len(body) for _, body in sections) > self.token_budget:
+            sections, truncated = self._fit(sections)
+
+        result = "\n".join("\n".join(body).strip("\n") for _, body in sections)
+        tokens_after = estimate_tokens(result)
+
+        CV_TOKENS.observe(tokens_before, stage="raw")
+        CV_TOKENS.observe(tokens_after, stage="preprocessed")
+        logger.info(
+            f"CV prétraité : ~{tokens_before} → ~{tokens_after} tokens"
+            f"{' (tronqué)' if truncated else ''}, sections : {', '.join(name for name, _ in sections) or 'aucune'}"
+        )
+        return PreprocessedText(result, tokens_before, tokens_after, [name for name, _ in sections], truncated)
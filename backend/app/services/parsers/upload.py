@@ -0,0 +1,157 @@
+import hashlib
+from typing import Optional, Set
+
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+
+from app.core.config import settings
+
+# Lecture des fichiers reçus par blocs : jamais plus d'un bloc au-delà de la limite en mémoire
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Signatures attendues en tête de fichier (DOCX et ZIP sont des archives ZIP)
+MAGIC_BYTES = {
+    'pdf': (b"%PDF-",),
+    'docx': (b"PK\x03\x04",),
+    'zip': (b"PK\x03\x04", b"PK\x05\x06"),
+}
+# Octets lus avant de vérifier la signature
+SNIFF_SIZE = 8
+# Marge des autres champs du formulaire (offre d'emploi) et des en-têtes multipart
+FORM_OVERHEAD = 1024 * 1024
+
+
+class UploadRejected(ValueError):
+    """Fichier refusé à la réception ; `status_code` est le code HTTP à renvoyer (413 ou 415)."""
+
+    def __init__(self, message: str, status_code: int):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class IngestedUpload:
+    """Fichier reçu et validé : contenu, taille et empreinte SHA-256 calculée pendant la lecture."""
+
+    def __init__(self, filename: str, content: bytes, sha256: str):
+        self.filename = filename
+        self.content = content
+        self.sha256 = sha256
+
+    @property
+    def size(self) -> int:
+        return len(self.content)
+
+
+def file_extension(filename: str) -> str:
+    return filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+
+
+def sniff_content(extension: str, head: bytes) -> bool:
+    """Vérifie que le début du fichier correspond à son extension (signature, ou texte sans octet nul)."""
+    if extension in MAGIC_BYTES:
+        return head.startswith(MAGIC_BYTES[extension])
+    if extension == 'txt':
+        binary = any(head.startswith(magic) for signatures in MAGIC_BYTES.values() for magic in signatures)
+        return not binary and b"\x00" not in head
+    return False
+
+
+async def ingest_upload(
+    upload,
+    allowed_extensions: Optional[Set[str]] = None,
+    max_size: Optional[int] = None,
+    chunk_size: int = UPLOAD_CHUNK_SIZE
+) -> IngestedUpload:
+    """
+    Lit un fichier reçu (UploadFile) par blocs en appliquant les limites au fil
+    de la lecture : extension autorisée (ALLOWED_EXTENSIONS), signature
+    cohérente avec l'extension dès les premiers octets, taille maximale
+    (MAX_UPLOAD_SIZE, MAX_ARCHIVE_SIZE pour une archive ZIP). Un fichier
+    refusé ne charge au plus qu'un bloc au-delà de la limite en mémoire ; le
+    contenu est haché pendant la lecture.
+
+    Starlette enregistre la partie fichier (fichier temporaire) avant l'appel
+    de l'endpoint : le corps de la requête est borné en amont, pendant sa
+    réception, par UploadSizeLimitMiddleware.
+    """
+    allowed_extensions = settings.ALLOWED_EXTENSIONS if allowed_extensions is None else allowed_extensions
+    filename = upload.filename or ''
+
+    extension = file_extension(filename)
+    if extension not in allowed_extensions:
+        raise UploadRejected(
+            f"Format de fichier non supporté: {filename} (formats acceptés : {', '.join(sorted(allowed_extensions))})", 415
+        )
+    if max_size is None:
+        max_size = settings.MAX_ARCHIVE_SIZE if extension == 'zip' else settings.MAX_UPLOAD_SIZE
+    too_large = f"Fichier trop volumineux: {filename} (maximum {max_size // 1024} Ko)"
+    # Taille de la partie déjà reçue : refus sans la relire
+    size = getattr(upload, 'size', None)
+    if size is not None and size > max_size:
+        raise UploadRejected(too_large, 413)
+
+    digest = hashlib.sha256()
+    buffer = bytearray()
+    sniffed = False
+    while True:
+        chunk = await upload.read(chunk_size)
+        if not chunk:
+            break
+        buffer += chunk
+        if len(buffer) > max_size:
+            raise UploadRejected(too_large, 413)
+        digest.update(chunk)
+        if not sniffed and len(buffer) >= SNIFF_SIZE:
+            if not sniff_content(extension, bytes(buffer[:chunk_size])):
+                raise UploadRejected(f"Le contenu du fichier ne correspond pas à son extension: {filename}", 415)
+            sniffed = True
+
+    if not sniffed and not sniff_content(extension, bytes(buffer)):
+        raise UploadRejected(f"Le contenu du fichier ne correspond pas à son extension: {filename}", 415)
+
+    return IngestedUpload(filename, bytes(buffer), digest.hexdigest())
+
+
+def request_size_limit(path: str) -> int:
+    """Taille maximale du corps d'une requête d'envoi de fichiers (archives acceptées par /analyze/batch)."""
+    limit = settings.MAX_ARCHIVE_SIZE if path.rstrip('/').endswith('/analyze/batch') else settings.MAX_UPLOAD_SIZE
+    return limit + FORM_OVERHEAD
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Middleware ASGI : borne le corps des requêtes multipart avant l'analyse du
+    formulaire. Un `Content-Length` au-delà de la limite est refusé (413) sans
+    rien lire ; sinon les octets sont comptés au fil de la réception et la
+    lecture s'interrompt dès la limite franchie (corps envoyé par blocs).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        headers = dict(scope.get("headers") or [])
+        if (scope["type"] != "http" or scope["method"] != "POST"
+                or not headers.get(b"content-type", b"").startswith(b"multipart/form-data")):
+            await self.app(scope, receive, send)
+            return
+
+        limit = request_size_limit(scope["path"])
+        detail = f"Requête trop volumineuse (maximum {limit // 1024} Ko)."
+        length = headers.get(b"content-length", b"")
+        if length.isdigit() and int(length) > limit:
+            await JSONResponse({"detail": detail}, status_code=413)(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    raise HTTPException(status_code=413, detail=detail)
+            return message
+
+        await self.app(scope, limited_receive, send)
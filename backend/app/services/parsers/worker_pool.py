@@ -0,0 +1,166 @@
+import asyncio
+import concurrent.futures
+import logging
+import multiprocessing
+import os
+import threading
+from typing import Optional
+
+from app.core.config import settings
+from app.core.metrics import timed
+from app.services.parsers.extractor import TextExtractor
+
+logger = logging.getLogger(__name__)
+
+
+class ExtractionPoolSaturated(Exception):
+    """Trop de documents en attente d'extraction : la requête doit être retentée."""
+
+
+# Fonctions exécutées dans les workers (définies au niveau module pour être picklables)
+def _extract_native(filename: str, content: bytes) -> str:
+    return TextExtractor.extract(filename, content, ocr=False)
+
+
+def _pdf_page_count(content: bytes) -> int:
+    return TextExtractor.pdf_page_count(content)
+
+
+def _ocr_page(content: bytes, page_number: int) -> str:
+    return TextExtractor.ocr_pdf_page(content, page_number)
+
+
+def _preload() -> None:
+    TextExtractor.preload()
+
+
+class ExtractionPool:
+    """
+    Exécute l'extraction de texte hors de la boucle d'événements.
+
+    - Pool de processus (par défaut) ou de threads, avec repli automatique sur
+      les threads si les processus ne sont pas disponibles sur la plateforme.
+    - File bornée : au-delà de `queue_size` documents en cours ou en attente,
+      la soumission échoue immédiatement (ExtractionPoolSaturated → HTTP 503).
+    - Timeout par document ; les tâches encore en file sont annulées (une page
+      déjà en cours d'OCR dans un worker va toutefois jusqu'à son terme).
+    - OCR des PDF scannés parallélisé page par page sur les workers.
+    """
+
+    def __init__(
+        self,
+        mode: Optional[str] = None,
+        workers: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        timeout: Optional[float] = None
+    ):
+        self.mode = (mode or settings.EXTRACTION_POOL_MODE).lower()
+        self.workers = workers or settings.EXTRACTION_WORKERS or os.cpu_count() or 1
+        self.queue_size = queue_size or settings.EXTRACTION_QUEUE_SIZE or self.workers * 4
+        self.timeout = settings.EXTRACTION_TIMEOUT if timeout is None else timeout
+
+        self._executor: Optional[concurrent.futures.Executor] = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def _get_executor(self) -> concurrent.futures.Executor:
+        if self._executor is None:
+            if self.mode == "process":
+                try:
+                    self._executor = concurrent.futures.ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn")
+                    )
+                except (OSError, NotImplementedError, ImportError) as e:
+                    logger.warning(f"Pool de processus indisponible, repli sur des threads: {e}")
+                    self.mode = "thread"
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="extraction"
+                )
+        return self._executor
+
+    def warm_up(self) -> None:
+        """
+        Démarre les workers et y importe les bibliothèques d'extraction, pour
+        que le premier document n'en paie pas le coût (appel bloquant).
+        """
+        executor = self._get_executor()
+        concurrent.futures.wait([executor.submit(_preload) for _ in range(self.workers)])
+
+    def _acquire(self) -> None:
+        """Réserve une place dans la file bornée (un document = une place)."""
+        with self._lock:
+            if self._pending >= self.queue_size:
+                raise ExtractionPoolSaturated(
+                    "Le service d'extraction est saturé, veuillez réessayer dans quelques instants."
+                )
+            self._pending += 1
+
+    def _release(self) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    @timed("extraction")
+    async def extract(self, filename: str, content: bytes) -> str:
+        """Extrait le texte d'un document ; OCR page par page si le PDF est scanné."""
+        self._acquire()
+        executor = None
+        futures = []
+
+        def submit(fn, *args) -> "asyncio.Future":
+            future = executor.submit(fn, *args)
+            futures.append(future)
+            return asyncio.wrap_future(future)
+
+        try:
+            # Création (ou recréation) du pool dans le try : un échec libère la place réservée
+            executor = self._get_executor()
+            coro = self._extract(filename, content, submit)
+            if self.timeout and self.timeout > 0:
+                return await asyncio.wait_for(coro, self.timeout)
+            return await coro
+        except concurrent.futures.BrokenExecutor:
+            # Un worker a été tué (OOM, crash) : le pool sera recréé au prochain appel
+            logger.error("Pool d'extraction interrompu, réinitialisation")
+            if executor is not None and self._executor is executor:
+                self._executor = None
+                executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        finally:
+            # Les tâches encore en file (timeout, annulation) ne seront pas exécutées
+            for future in futures:
+                future.cancel()
+            self._release()
+
+    async def _extract(self, filename: str, content: bytes, submit) -> str:
+        text = await submit(_extract_native, filename, content)
+        if text or not filename.lower().endswith('.pdf'):
+            return text
+
+        page_count = await submit(_pdf_page_count, content)
+        if page_count == 0:
+            return ""
+
+        # OCR par vagues de `workers` pages : parallèle, mais arrêt dès que le
+        # budget de caractères est atteint et au plus une vague en mémoire
+        budget = settings.EXTRACTION_MAX_CHARS
+        texts, total = [], 0
+        for first in range(1, page_count + 1, self.workers):
+            wave = range(first, min(first + self.workers, page_count + 1))
+            for text in await asyncio.gather(*(submit(_ocr_page, content, page) for page in wave)):
+                if text:
+                    texts.append(text)
+                    total += len(text) + 1
+            if budget and total >= budget:
+                break
+        return TextExtractor.join_chunks(texts, budget)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,329 @@
+import asyncio
+import logging
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import REPORTS, stage_timer
+from app.services.llm.report_renderer import ReportPolicy, render_report
+from app.services.parsers.extractor import TextExtractor
+from app.services.parsers.preprocessor import CVPreprocessor
+from app.services.pipeline.runner import PipelineRunner, Stage, StageCallback, StageTimeoutError
+
+logger = logging.getLogger(__name__)
+
+# standard : extractions CV et offre séparées, rapport rédigé par le LLM
+# fused : une seule extraction LLM (CV + offre), rapport généré localement
+ANALYSIS_MODES = ('standard', 'fused')
+
+
+class AnalysisPipeline:
+    """
+    Pipeline d'analyse d'une candidature :
+
+        extraction ──> preprocessing ──> cv_analysis ──┐
+                                                       ├──> matching ──> report
+        job_analysis ──────────────────────────────────┘
+
+    L'analyse de l'offre démarre immédiatement, en parallèle de l'extraction
+    et de l'analyse du CV. Un échec sur une branche annule l'autre.
+    Si l'offre a déjà été analysée (`job_data`), l'étape job_analysis la
+    réutilise sans appel LLM ; le rapport est optionnel (`include_report`).
+    Le prétraitement (CVPreprocessor) borne le texte envoyé au LLM à
+    CV_TOKEN_BUDGET tokens estimés. Avec un `results_store`, chaque résultat
+    de matching y est enregistré.
+
+    En mode `fused`, un seul appel LLM extrait le CV et l'offre :
+
+        extraction ──> preprocessing ──> fused_analysis ──> cv_analysis / job_analysis ──> matching ──> report
+
+    et le rapport est rendu par template (render_report), sans appel LLM.
+    L'offre n'est alors plus analysée en parallèle de l'extraction, mais
+    un seul appel remplace les trois du mode standard. En mode standard,
+    `report_policy` (REPORT_POLICY) décide pour chaque candidat entre
+    rapport LLM et rapport par template.
+
+    Avec l'empreinte SHA-256 du fichier reçu (`content_hash`), l'analyse du
+    CV est mémorisée par document : un même fichier soumis à nouveau passe
+    directement au matching, sans extraction ni prétraitement, et l'empreinte
+    sert d'identifiant de candidat pour les sous-scores.
+    """
+
+    def __init__(
+        self,
+        llm_service,
+        matching_service,
+        runner: Optional[PipelineRunner] = None,
+        extraction_pool=None,
+        results_store=None,
+        preprocessor: Optional[CVPreprocessor] = None,
+        report_policy: Optional[ReportPolicy] = None
+    ):
+        self.llm_service = llm_service
+        self.matching_service = matching_service
+        self.runner = runner or PipelineRunner()
+        # Sans pool, l'extraction est exécutée directement dans la boucle
+        self.extraction_pool = extraction_pool
+        self.results_store = results_store
+        if preprocessor is None and settings.CV_PREPROCESSING:
+            preprocessor = CVPreprocessor()
+        self.preprocessor = preprocessor
+        self.report_policy = report_policy or ReportPolicy()
+
+    async def preprocess(self, cv_text: str) -> str:
+        """Texte du CV prêt pour l'extraction LLM (inchangé sans préprocesseur)."""
+        if self.preprocessor is None:
+            return cv_text
+        with stage_timer("preprocessing"):
+            return (await asyncio.to_thread(self.preprocessor.process, cv_text)).text
+
+    def _use_llm_report(self, mode: str, matching: dict) -> bool:
+        """Rapport rédigé par le LLM (sinon rendu par template) ; jamais en mode fused."""
+        use_llm = mode != 'fused' and self.report_policy.use_llm(matching)
+        REPORTS.inc(renderer="llm" if use_llm else "template")
+        return use_llm
+
+    @staticmethod
+    def _render_report(cv_data: dict, job_data: dict, matching: dict) -> str:
+        with stage_timer("render_report"):
+            return render_report(cv_data, job_data, matching)
+
+    def document_variant(self) -> str:
+        """Réglages d'extraction et de prétraitement dont dépend l'analyse mémorisée d'un document."""
+        budget = self.preprocessor.token_budget if self.preprocessor is not None else "raw"
+        return f"{settings.EXTRACTION_MAX_CHARS}:{budget}"
+
+    def cached_cv_analysis(self, content_hash: Optional[str]) -> Optional[dict]:
+        """Analyse mémorisée du document d'empreinte `content_hash` (None si inconnu)."""
+        if not content_hash:
+            return None
+        return self.llm_service.cached_cv_document(content_hash, self.document_variant())
+
+    def remember_cv_analysis(self, content_hash: Optional[str], cv_data: dict) -> None:
+        if content_hash:
+            self.llm_service.remember_cv_document(content_hash, cv_data, self.document_variant())
+
+    @staticmethod
+    def resolve_mode(mode: Optional[str]) -> str:
+        """Mode d'analyse demandé (ANALYSIS_MODE par défaut) ; ValueError si inconnu."""
+        mode = (mode or settings.ANALYSIS_MODE).lower()
+        if mode not in ANALYSIS_MODES:
+            raise ValueError(f"Mode d'analyse inconnu: {mode} (valeurs possibles : {', '.join(ANALYSIS_MODES)})")
+        return mode
+
+    def build_stages(
+        self,
+        filename: str,
+        content: bytes,
+        job_description: Optional[str] = None,
+        job_data: Optional[dict] = None,
+        include_report: bool = True,
+        mode: str = 'standard',
+        cv_data: Optional[dict] = None,
+        content_hash: Optional[str] = None
+    ) -> List[Stage]:
+        async def extraction(results: Dict[str, Any]) -> str:
+            if self.extraction_pool is not None:
+                cv_text = await self.extraction_pool.extract(filename, content)
+            else:
+                with stage_timer("extraction"):
+                    cv_text = TextExtractor.extract(filename, content)
+            if not cv_text:
+                raise ValueError("Impossible d'extraire du texte du fichier.")
+            return cv_text
+
+        async def preprocessing(results: Dict[str, Any]) -> str:
+            return await self.preprocess(results['extraction'])
+
+        async def cv_analysis(results: Dict[str, Any]) -> dict:
+            analysis = await self.llm_service.analyze_cv(results['preprocessing'])
+            self.remember_cv_analysis(content_hash, analysis)
+            return analysis
+
+        async def known_cv_analysis(results: Dict[str, Any]) -> dict:
+            return cv_data
+
+        async def job_analysis(results: Dict[str, Any]) -> dict:
+            if job_data is not None:
+                return job_data
+            return await self.llm_service.analyze_job_description(job_description)
+
+        async def matching(results: Dict[str, Any]) -> dict:
+            matching = await self.matching_service.calculate_score(
+                results['cv_analysis'], results['job_analysis'],
+                candidate_id=content_hash[:16] if content_hash else None
+            )
+            if self.results_store is not None:
+                try:
+                    self.results_store.record(results['cv_analysis'], results['job_analysis'], matching)
+                except Exception as e:
+                    logger.warning(f"Enregistrement analytique impossible: {e}")
+            return matching
+
+        async def report(results: Dict[str, Any]) -> str:
+            if not self._use_llm_report(mode, results['matching']):
+                return self._render_report(results['cv_analysis'], results['job_analysis'], results['matching'])
+            return await self.llm_service.generate_report(
+                results['cv_analysis'],
+                results['job_analysis'],
+                results['matching']['overall_score']
+            )
+
+        async def fused_analysis(results: Dict[str, Any]) -> dict:
+            return await self.llm_service.analyze_fused(results['preprocessing'], job_description)
+
+        async def fused_cv_analysis(results: Dict[str, Any]) -> dict:
+            analysis = results['fused_analysis']['cv_analysis']
+            self.remember_cv_analysis(content_hash, analysis)
+            return analysis
+
+        async def fused_job_analysis(results: Dict[str, Any]) -> dict:
+            return results['fused_analysis']['job_analysis']
+
+        if cv_data is not None:
+            # CV déjà analysé (même document) : ni extraction, ni appel LLM pour le CV
+            stages = [
+                Stage('cv_analysis', known_cv_analysis),
+                Stage('job_analysis', job_analysis, timeout=settings.LLM_ANALYSIS_TIMEOUT),
+            ]
+        elif mode == 'fused' and job_data is None:
+            stages = [
+                Stage('extraction', extraction, timeout=settings.EXTRACTION_TIMEOUT),
+                Stage('preprocessing', preprocessing, depends_on=['extraction']),
+                Stage('fused_analysis', fused_analysis, depends_on=['preprocessing'], timeout=settings.LLM_ANALYSIS_TIMEOUT),
+                Stage('cv_analysis', fused_cv_analysis, depends_on=['fused_analysis']),
+                Stage('job_analysis', fused_job_analysis, depends_on=['fused_analysis']),
+            ]
+        else:
+            stages = [
+                Stage('extraction', extraction, timeout=settings.EXTRACTION_TIMEOUT),
+                Stage('preprocessing', preprocessing, depends_on=['extraction']),
+                Stage('cv_analysis', cv_analysis, depends_on=['preprocessing'], timeout=settings.LLM_ANALYSIS_TIMEOUT),
+                Stage('job_analysis', job_analysis, timeout=settings.LLM_ANALYSIS_TIMEOUT),
+            ]
+        stages.append(
+            Stage('matching', matching, depends_on=['cv_analysis', 'job_analysis'], timeout=settings.MATCHING_TIMEOUT)
+        )
+        if include_report:
+            stages.append(
+                Stage('report', report, depends_on=['cv_analysis', 'job_analysis', 'matching'], timeout=settings.REPORT_TIMEOUT)
+            )
+        return stages
+
+    async def run(
+        self,
+        filename: str,
+        content: bytes,
+        job_description: Optional[str] = None,
+        on_stage_complete: Optional[StageCallback] = None,
+        job_data: Optional[dict] = None,
+        include_report: bool = True,
+        mode: Optional[str] = None,
+        content_hash: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Exécute le pipeline complet et retourne les résultats indexés par étape.
+        `mode` : standard ou fused (ANALYSIS_MODE par défaut) ; `content_hash` :
+        empreinte SHA-256 du fichier (analyse du CV mémorisée par document).
+        """
+        if job_description is None and job_data is None:
+            raise ValueError("Une offre d'emploi (texte ou analyse) est requise.")
+        stages = self.build_stages(
+            filename, content, job_description, job_data, include_report, self.resolve_mode(mode),
+            cv_data=self.cached_cv_analysis(content_hash), content_hash=content_hash
+        )
+        return await self.runner.run(stages, on_stage_complete=on_stage_complete)
+
+    async def analyze_job(self, job_description: str) -> dict:
+        """Analyse seule de l'offre d'emploi, avec le même timeout que dans le pipeline."""
+        async def job_analysis(results: Dict[str, Any]) -> dict:
+            return await self.llm_service.analyze_job_description(job_description)
+
+        results = await self.runner.run(
+            [Stage('job_analysis', job_analysis, timeout=settings.LLM_ANALYSIS_TIMEOUT)]
+        )
+        return results['job_analysis']
+
+    async def stream_events(
+        self,
+        filename: str,
+        content: bytes,
+        job_description: str,
+        mode: Optional[str] = None,
+        content_hash: Optional[str] = None
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Variante progressive du pipeline : produit des couples (événement, données)
+        dès qu'une étape se termine, puis le rapport morceau par morceau
+        (en un seul fragment quand le rapport est rendu par template).
+
+        Événements : job_analysis, classification, cv_analysis, matching,
+        report (fragment de texte) et done (réponse complète).
+        """
+        mode = self.resolve_mode(mode)
+        queue: asyncio.Queue = asyncio.Queue()
+        finished = object()
+
+        def on_stage_complete(name: str, result: Any, elapsed: float) -> None:
+            queue.put_nowait((name, result))
+
+        async def run_pipeline() -> Dict[str, Any]:
+            try:
+                return await self.run(
+                    filename, content, job_description,
+                    on_stage_complete=on_stage_complete, include_report=False, mode=mode,
+                    content_hash=content_hash
+                )
+            finally:
+                queue.put_nowait(finished)
+
+        task = asyncio.create_task(run_pipeline())
+        try:
+            while True:
+                item = await queue.get()
+                if item is finished:
+                    break
+                name, result = item
+                if name == 'cv_analysis':
+                    yield 'classification', result.get('job_classification')
+                    yield 'cv_analysis', result.get('cv_analysis')
+                elif name in ('job_analysis', 'matching'):
+                    yield name, result
+
+            results = await task
+        finally:
+            if not task.done():
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+
+        cv_data, job_data, matching = results['cv_analysis'], results['job_analysis'], results['matching']
+        chunks = []
+        if not self._use_llm_report(mode, matching):
+            chunks.append(self._render_report(cv_data, job_data, matching))
+            yield 'report', chunks[0]
+        else:
+            # Rapport en flux, avec le même délai global que l'étape non streamée
+            deadline = time.monotonic() + settings.REPORT_TIMEOUT if settings.REPORT_TIMEOUT > 0 else None
+            stream = self.llm_service.stream_report(cv_data, job_data, matching['overall_score'])
+            try:
+                while True:
+                    remaining = deadline - time.monotonic() if deadline else None
+                    if remaining is not None and remaining <= 0:
+                        raise StageTimeoutError('report', settings.REPORT_TIMEOUT)
+                    try:
+                        chunk = await asyncio.wait_for(anext(stream), remaining)
+                    except StopAsyncIteration:
+                        break
+                    except asyncio.TimeoutError:
+                        raise StageTimeoutError('report', settings.REPORT_TIMEOUT) from None
+                    chunks.append(chunk)
+                    yield 'report', chunk
+            finally:
+                await stream.aclose()
+
+        yield 'done', {
+            'job_classification': cv_data.get('job_classification'),
+            'cv_analysis': cv_data.get('cv_analysis'),
+            'matching': matching,
+            'report': "".join(chunks),
+        }
@@ -0,0 +1,140 @@
+import asyncio
+import io
+import logging
+import os
+import zipfile
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.services.parsers.upload import UPLOAD_CHUNK_SIZE, file_extension, sniff_content
+from app.services.pipeline.analysis import AnalysisPipeline
+
+logger = logging.getLogger(__name__)
+
+UploadedFile = Tuple[str, bytes]
+
+
+def expand_archives(files: List[UploadedFile]) -> List[UploadedFile]:
+    """
+    Déplie les archives ZIP en une liste de fichiers (nom, contenu).
+    Seules les entrées dont l'extension est autorisée et dont le contenu
+    correspond à l'extension (comme un fichier reçu directement) sont
+    conservées ; les entrées dépassant MAX_UPLOAD_SIZE sont ignorées avant
+    décompression, et la lecture de chaque entrée est bornée (taille annoncée
+    non fiable). Décompression synchrone : à appeler hors de la boucle
+    d'événements.
+    Le nombre de fichiers (BATCH_MAX_FILES) et le volume total décompressé
+    (BATCH_MAX_UNCOMPRESSED_SIZE) sont contrôlés au fil du dépliage.
+    """
+    expanded: List[UploadedFile] = []
+    budget = settings.BATCH_MAX_UNCOMPRESSED_SIZE
+
+    def add(name: str, content: bytes) -> None:
+        if len(expanded) >= settings.BATCH_MAX_FILES:
+            raise ValueError(f"Trop de CV dans le lot (maximum {settings.BATCH_MAX_FILES}).")
+        expanded.append((name, content))
+
+    for filename, content in files:
+        if not filename.lower().endswith('.zip'):
+            add(filename, content)
+            continue
+
+        try:
+            with zipfile.ZipFile(io.BytesIO(content)) as archive:
+                for info in archive.infolist():
+                    name = os.path.basename(info.filename)
+                    ext = file_extension(name)
+                    if info.is_dir() or not name or name.startswith('.') or '__MACOSX' in info.filename:
+                        continue
+                    if ext not in settings.ALLOWED_EXTENSIONS:
+                        logger.info(f"Entrée ignorée dans {filename}: {info.filename}")
+                        continue
+                    if info.file_size > settings.MAX_UPLOAD_SIZE:
+                        logger.warning(f"Entrée trop volumineuse ignorée dans {filename}: {info.filename}")
+                        continue
+                    if info.file_size > budget:
+                        raise ValueError(f"Volume décompressé du lot trop important ({filename}).")
+                    with archive.open(info) as entry:
+                        data = entry.read(settings.MAX_UPLOAD_SIZE + 1)
+                    if len(data) > settings.MAX_UPLOAD_SIZE:
+                        logger.warning(f"Entrée trop volumineuse ignorée dans {filename}: {info.filename}")
+                        continue
+                    budget -= len(data)
+                    if budget < 0:
+                        raise ValueError(f"Volume décompressé du lot trop important ({filename}).")
+                    if not sniff_content(ext, data[:UPLOAD_CHUNK_SIZE]):
+                        logger.warning(f"Entrée dont le contenu ne correspond pas à l'extension ignorée dans {filename}: {info.filename}")
+                        continue
+                    add(name, data)
+        except zipfile.BadZipFile:
+            raise ValueError(f"Archive ZIP invalide: {filename}")
+
+    return expanded
+
+
+class BatchAnalysisPipeline:
+    """
+    Classement de plusieurs CV pour une même offre d'emploi.
+    L'offre est analysée et compilée (JobProfile) une seule fois ; les
+    candidatures sont ensuite traitées en parallèle avec un nombre maximal de
+    pipelines simultanés.
+    """
+
+    def __init__(self, pipeline: AnalysisPipeline, concurrency: Optional[int] = None):
+        self.pipeline = pipeline
+        self.concurrency = max(1, concurrency or settings.BATCH_CONCURRENCY)
+
+    async def run(
+        self,
+        files: List[UploadedFile],
+        job_description: str,
+        include_report: bool = False
+    ) -> Dict[str, Any]:
+        # Décompression (jusqu'à BATCH_MAX_UNCOMPRESSED_SIZE) hors de la boucle d'événements
+        files = await asyncio.to_thread(expand_archives, files)
+        if not files:
+            raise ValueError("Aucun CV exploitable dans la requête.")
+        if len(files) > settings.BATCH_MAX_FILES:
+            raise ValueError(f"Trop de CV dans le lot ({len(files)} > {settings.BATCH_MAX_FILES}).")
+
+        job_data = await self.pipeline.analyze_job(job_description)
+        # Offre vectorisée une fois, avant le scoring des candidats
+        await self.pipeline.matching_service.job_profile(job_data)
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def analyze_candidate(filename: str, content: bytes) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    results = await self.pipeline.run(
+                        filename, content, job_data=job_data, include_report=include_report
+                    )
+                except Exception as e:
+                    logger.error(f"Échec de l'analyse de {filename}: {e}")
+                    return {'filename': filename, 'error': str(e)}
+
+            cv_data = results['cv_analysis']
+            return {
+                'filename': filename,
+                'job_classification': cv_data.get('job_classification'),
+                'matching': results['matching'],
+                'report': results.get('report'),
+            }
+
+        candidates = await asyncio.gather(*(analyze_candidate(name, content) for name, content in files))
+
+        ranked = sorted(
+            (c for c in candidates if 'error' not in c),
+            key=lambda c: c['matching']['overall_score'],
+            reverse=True
+        )
+        for rank, candidate in enumerate(ranked, start=1):
+            candidate['rank'] = rank
+        failed = [c for c in candidates if 'error' in c]
+
+        return {
+            'job_analysis': job_data,
+            'total': len(candidates),
+            'succeeded': len(ranked),
+            'failed': len(failed),
+            'candidates': ranked + failed,
+        }
@@ -0,0 +1,152 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Statuts d'un job d'analyse
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+FINISHED_STATUSES = (COMPLETED, FAILED)
+
+JOB_FIELDS = ("id", "status", "priority", "filename", "created_at", "started_at", "finished_at",
+              "result", "error", "status_code")
+
+
+class MemoryJobStore:
+    """Stockage des jobs en mémoire : perdu au redémarrage."""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._jobs: Dict[str, dict] = {}
+        self._payloads: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def create(self, job: dict, payload: dict) -> None:
+        with self._lock:
+            self._purge()
+            self._jobs[job["id"]] = dict(job)
+            self._payloads[job["id"]] = payload
+
+    def update(self, job_id: str, **fields) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job.update(fields)
+            if fields.get("status") in FINISHED_STATUSES:
+                self._payloads.pop(job_id, None)
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def get_payload(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            return self._payloads.get(job_id)
+
+    def unfinished(self) -> List[dict]:
+        return []
+
+    def _purge(self) -> None:
+        limit = time.time() - self.ttl
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job["status"] in FINISHED_STATUSES and (job["finished_at"] or 0) < limit]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+class SQLiteJobStore:
+    """
+    Stockage des jobs dans un fichier SQLite local : les jobs en attente ou
+    interrompus (avec le document et l'offre) sont repris au redémarrage.
+    """
+
+    def __init__(self, path: str, ttl: float):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS analysis_jobs ("
+            "id TEXT PRIMARY KEY, status TEXT NOT NULL, priority TEXT NOT NULL, filename TEXT, "
+            "created_at REAL NOT NULL, started_at REAL, finished_at REAL, result TEXT, error TEXT, "
+            "status_code INTEGER, content BLOB, job_description TEXT)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_analysis_jobs_status ON analysis_jobs (status)")
+        self._db.commit()
+
+    def create(self, job: dict, payload: dict) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM analysis_jobs WHERE finished_at < ?", (time.time() - self.ttl,))
+            self._db.execute(
+                "INSERT INTO analysis_jobs (id, status, priority, filename, created_at, content, job_description) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job["id"], job["status"], job["priority"], job["filename"], job["created_at"],
+                 payload["content"], payload["job_description"])
+            )
+            self._db.commit()
+
+    def update(self, job_id: str, **fields) -> None:
+        if "result" in fields and fields["result"] is not None:
+            fields["result"] = json.dumps(fields["result"], ensure_ascii=False)
+        if fields.get("status") in FINISHED_STATUSES:
+            # Le document n'est plus utile une fois le job terminé
+            fields.update(content=None, job_description=None)
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock:
+            self._db.execute(f"UPDATE analysis_jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+            self._db.commit()
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._db.execute(
+                f"SELECT {', '.join(JOB_FIELDS)} FROM analysis_jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return self._to_job(row) if row else None
+
+    def get_payload(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT filename, content, job_description FROM analysis_jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        if row is None or row[1] is None:
+            return None
+        return {"filename": row[0], "content": row[1], "job_description": row[2]}
+
+    def unfinished(self) -> List[dict]:
+        """Jobs en attente ou interrompus en cours d'exécution, par ordre d'arrivée."""
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT {', '.join(JOB_FIELDS)} FROM analysis_jobs WHERE status IN (?, ?) ORDER BY created_at",
+                (QUEUED, RUNNING)
+            ).fetchall()
+        return [self._to_job(row) for row in rows]
+
+    @staticmethod
+    def _to_job(row) -> dict:
+        job = dict(zip(JOB_FIELDS, row))
+        if job["result"] is not None:
+            job["result"] = json.loads(job["result"])
+        return job
+
+
+def build_job_store():
+    """Instancie le stockage de jobs configuré (memory ou sqlite)."""
+    if settings.JOB_STORE_BACKEND == "sqlite":
+        try:
+            return SQLiteJobStore(settings.JOB_STORE_PATH, settings.JOB_RESULT_TTL)
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Stockage des jobs SQLite indisponible ({settings.JOB_STORE_PATH}), repli en mémoire: {e}")
+    return MemoryJobStore(settings.JOB_RESULT_TTL)
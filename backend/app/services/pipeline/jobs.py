@@ -0,0 +1,190 @@
+import asyncio
+import contextvars
+import itertools
+import logging
+import time
+import uuid
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+from app.schemas.analysis import AnalysisResponse
+from app.services.parsers.worker_pool import ExtractionPoolSaturated
+from app.services.pipeline.job_store import COMPLETED, FAILED, FINISHED_STATUSES, QUEUED, RUNNING, build_job_store
+from app.services.pipeline.runner import StageTimeoutError
+
+logger = logging.getLogger(__name__)
+
+# Niveaux de priorité : les plus petits sont servis en premier
+PRIORITIES = {'high': 0, 'normal': 1, 'low': 2}
+
+
+class JobQueueFull(Exception):
+    """File des jobs d'analyse pleine : la soumission doit être retentée."""
+
+
+class AnalysisJobQueue:
+    """
+    Mode asynchrone de /analyze : la soumission retourne immédiatement un
+    identifiant de job, des workers locaux exécutent le pipeline et le client
+    interroge (ou s'abonne à) l'état du job.
+
+    - File à priorités (high, normal, low ; FIFO à priorité égale), bornée à
+      `queue_size` jobs en attente (JobQueueFull → HTTP 503).
+    - `workers` pipelines exécutés en parallèle : le débit augmente avec le
+      nombre de workers, sans connexion HTTP maintenue pendant l'analyse.
+    - Stockage en mémoire ou SQLite (voir job_store) ; avec SQLite, les jobs
+      non terminés sont remis en file au démarrage. Le stockage n'est lu et
+      écrit que hors de la boucle d'événements ; les attentes de changement
+      de statut consultent un miroir en mémoire des statuts non terminés.
+    """
+
+    def __init__(self, pipeline, store=None, workers: Optional[int] = None, queue_size: Optional[int] = None):
+        self.pipeline = pipeline
+        self.store = store or build_job_store()
+        self.workers = workers or settings.JOB_WORKERS
+        self.queue_size = queue_size or settings.JOB_QUEUE_SIZE
+
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._changed: Optional[asyncio.Condition] = None
+        self._tasks: List[asyncio.Task] = []
+        self._sequence = itertools.count()
+        # Statut des jobs non terminés, tenu à jour par `_update`
+        self._statuses: Dict[str, str] = {}
+
+    async def start(self) -> None:
+        """Démarre les workers et reprend les jobs non terminés du stockage."""
+        if self._tasks:
+            return
+        self._queue = asyncio.PriorityQueue()
+        self._changed = asyncio.Condition()
+
+        for job in await asyncio.to_thread(self.store.unfinished):
+            if job['status'] == RUNNING:
+                await asyncio.to_thread(self.store.update, job['id'], status=QUEUED, started_at=None)
+            self._statuses[job['id']] = QUEUED
+            self._enqueue(job['id'], job['priority'])
+        if self._queue.qsize():
+            logger.info(f"{self._queue.qsize()} job(s) d'analyse repris depuis le stockage")
+
+        # Workers créés dans un contexte vierge : démarrés par une requête, ils
+        # ne doivent pas hériter de ses variables de contexte (Server-Timing,
+        # suivi du cache LLM) pour tous les jobs suivants
+        self._tasks = [
+            contextvars.Context().run(asyncio.create_task, self._worker()) for _ in range(self.workers)
+        ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def submit(self, filename: str, content: bytes, job_description: str, priority: str = 'normal') -> dict:
+        """Enregistre un job et le met en file ; retourne son état initial."""
+        if priority not in PRIORITIES:
+            raise ValueError(f"Priorité inconnue: {priority} (valeurs possibles : {', '.join(PRIORITIES)}).")
+        await self.start()
+        if self._queue.qsize() >= self.queue_size:
+            raise JobQueueFull("Trop d'analyses en attente, veuillez réessayer dans quelques instants.")
+
+        job = {
+            'id': uuid.uuid4().hex,
+            'status': QUEUED,
+            'priority': priority,
+            'filename': filename,
+            'created_at': time.time(),
+            'started_at': None,
+            'finished_at': None,
+            'result': None,
+            'error': None,
+            'status_code': None,
+        }
+        # Écritures du stockage (document jusqu'à MAX_UPLOAD_SIZE) hors de la boucle d'événements
+        await asyncio.to_thread(
+            self.store.create, job, {'filename': filename, 'content': content, 'job_description': job_description}
+        )
+        self._statuses[job['id']] = QUEUED
+        self._enqueue(job['id'], priority)
+        return job
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        return await asyncio.to_thread(self.store.get, job_id)
+
+    async def wait(self, job_id: str, timeout: float, known_status: Optional[str] = None) -> Optional[dict]:
+        """
+        Attend au plus `timeout` secondes que le statut du job diffère de
+        `known_status` (par défaut, son statut actuel) ; retourne l'état du job.
+        """
+        job = await self.get(job_id)
+        if job is None or job['status'] in FINISHED_STATUSES or timeout <= 0 or self._changed is None:
+            return job
+        known_status = known_status or job['status']
+        if job['status'] != known_status:
+            return job
+
+        def status_changed() -> bool:
+            # Job terminé (ou inconnu) : retiré du miroir
+            return self._statuses.get(job_id) != known_status
+
+        async with self._changed:
+            try:
+                await asyncio.wait_for(self._changed.wait_for(status_changed), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return await self.get(job_id)
+
+    def _enqueue(self, job_id: str, priority: str) -> None:
+        self._queue.put_nowait((PRIORITIES.get(priority, PRIORITIES['normal']), next(self._sequence), job_id))
+
+    async def _update(self, job_id: str, **fields) -> None:
+        await asyncio.to_thread(self.store.update, job_id, **fields)
+        if fields.get('status') in FINISHED_STATUSES:
+            self._statuses.pop(job_id, None)
+        elif 'status' in fields:
+            self._statuses[job_id] = fields['status']
+        async with self._changed:
+            self._changed.notify_all()
+
+    async def _worker(self) -> None:
+        while True:
+            _, _, job_id = await self._queue.get()
+            try:
+                await self._process(job_id)
+            except Exception as e:
+                logger.error(f"Job {job_id}: erreur inattendue du worker: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def _process(self, job_id: str) -> None:
+        payload = await asyncio.to_thread(self.store.get_payload, job_id)
+        if payload is None:
+            logger.warning(f"Job {job_id}: document introuvable, job ignoré")
+            self._statuses.pop(job_id, None)
+            return
+
+        await self._update(job_id, status=RUNNING, started_at=time.time())
+        try:
+            results = await self.pipeline.run(payload['filename'], payload['content'], payload['job_description'])
+            cv_data = results['cv_analysis']
+            result = AnalysisResponse(
+                job_classification=cv_data.get('job_classification'),
+                cv_analysis=cv_data.get('cv_analysis'),
+                matching=results['matching'],
+                report=results['report']
+            ).model_dump()
+            await self._update(job_id, status=COMPLETED, finished_at=time.time(), result=result)
+            return
+        except StageTimeoutError as e:
+            logger.error(f"Job {job_id}: timeout: {e}")
+            status_code, error = 504, str(e)
+        except ExtractionPoolSaturated as e:
+            logger.warning(f"Job {job_id}: extraction pool saturated: {e}")
+            status_code, error = 503, str(e)
+        except ValueError as e:
+            logger.error(f"Job {job_id}: validation error: {e}")
+            status_code, error = 400, str(e)
+        except Exception as e:
+            logger.error(f"Job {job_id}: internal error: {e}")
+            status_code, error = 500, f"Une erreur interne est survenue: {str(e)}"
+
+        await self._update(job_id, status=FAILED, finished_at=time.time(), error=error, status_code=status_code)
@@ -0,0 +1,112 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+StageFunc = Callable[[Dict[str, Any]], Awaitable[Any]]
+StageCallback = Callable[[str, Any, float], None]
+
+
+class PipelineError(Exception):
+    """Erreur levée par l'orchestrateur lui-même (graphe invalide, timeout...)."""
+
+    def __init__(self, stage: str, message: str):
+        self.stage = stage
+        super().__init__(message)
+
+
+class StageTimeoutError(PipelineError):
+    """Une étape a dépassé le délai qui lui était alloué."""
+
+    def __init__(self, stage: str, timeout: float):
+        self.timeout = timeout
+        super().__init__(stage, f"L'étape '{stage}' a dépassé le délai de {timeout:g}s")
+
+
+class Stage:
+    """
+    Étape d'un pipeline asynchrone.
+    `func` reçoit le dictionnaire des résultats des étapes déjà terminées.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        func: StageFunc,
+        depends_on: Iterable[str] = (),
+        timeout: Optional[float] = None
+    ):
+        self.name = name
+        self.func = func
+        self.depends_on = tuple(depends_on)
+        self.timeout = timeout if timeout and timeout > 0 else None
+
+
+class PipelineRunner:
+    """
+    Exécute un graphe d'étapes en respectant leurs dépendances.
+    Chaque étape démarre dès que ses dépendances sont satisfaites ; dès qu'une
+    étape échoue (exception ou timeout), toutes les étapes en cours sont annulées.
+    """
+
+    async def run(
+        self,
+        stages: List[Stage],
+        on_stage_complete: Optional[StageCallback] = None
+    ) -> Dict[str, Any]:
+        names = {stage.name for stage in stages}
+        for stage in stages:
+            unknown = [dep for dep in stage.depends_on if dep not in names]
+            if unknown:
+                raise PipelineError(stage.name, f"Dépendances inconnues pour '{stage.name}': {unknown}")
+
+        results: Dict[str, Any] = {}
+        pending = {stage.name: stage for stage in stages}
+        running: Dict[asyncio.Task, Stage] = {}
+
+        try:
+            while pending or running:
+                for name, stage in list(pending.items()):
+                    if all(dep in results for dep in stage.depends_on):
+                        task = asyncio.create_task(self._run_stage(stage, results))
+                        running[task] = stage
+                        del pending[name]
+
+                if not running:
+                    raise PipelineError(next(iter(pending)), "Dépendance circulaire détectée dans le pipeline")
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    stage = running.pop(task)
+                    result, elapsed = task.result()
+                    results[stage.name] = result
+                    if on_stage_complete:
+                        on_stage_complete(stage.name, result, elapsed)
+        finally:
+            # Annulation des étapes encore en vol (échec d'une étape ou requête annulée)
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+        return results
+
+    async def _run_stage(self, stage: Stage, results: Dict[str, Any]):
+        start = time.perf_counter()
+        try:
+            if stage.timeout:
+                result = await asyncio.wait_for(stage.func(results), stage.timeout)
+            else:
+                result = await stage.func(results)
+        except asyncio.TimeoutError:
+            logger.error(f"Timeout de l'étape '{stage.name}' après {stage.timeout}s")
+            raise StageTimeoutError(stage.name, stage.timeout) from None
+        except asyncio.CancelledError:
+            logger.info(f"Étape '{stage.name}' annulée")
+            raise
+        except Exception as e:
+            logger.error(f"Échec de l'étape '{stage.name}': {e}")
+            raise
+        return result, time.perf_counter() - start
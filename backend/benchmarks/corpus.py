@@ -0,0 +1,88 @@
+"""
+Benchmark corpus: the sample CVs / job offers shipped in data/ plus synthetic
+documents and profiles scaled up to stress extraction and scoring.
+"""
+import io
+import random
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import docx
+
+from benchmarks.fakes import SOFT_VOCABULARY, TECHNICAL_VOCABULARY
+
+DATA_DIR = Path(__file__).resolve().parents[2] / "data"
+
+Document = Tuple[str, bytes]
+
+
+def sample_cvs() -> List[Document]:
+    return [(path.name, path.read_bytes()) for path in sorted((DATA_DIR / "cv_exemples").glob("*")) if path.is_file()]
+
+
+def sample_job_offers() -> List[Tuple[str, str]]:
+    return [
+        (path.name, path.read_text(encoding="utf-8"))
+        for path in sorted((DATA_DIR / "offres_exemples").glob("*.txt"))
+    ]
+
+
+def synthetic_cv_text(n_skills: int, n_sections: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    skills = rng.sample(TECHNICAL_VOCABULARY, min(n_skills, len(TECHNICAL_VOCABULARY)))
+    lines = ["Candidat Synthétique", "Développeur senior, 7 ans d'expérience", ""]
+    for section in range(n_sections):
+        lines.append(f"Expérience {section + 1} — Entreprise {rng.randint(1, 500)}")
+        lines.append("Missions : " + ", ".join(rng.sample(skills, min(6, len(skills)))))
+        lines.append("Qualités : " + ", ".join(rng.sample(SOFT_VOCABULARY, 3)))
+        lines.append("Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 4)
+        lines.append("")
+    return "\n".join(lines)
+
+
+def synthetic_cvs(count: int, n_sections: int = 20, seed: int = 0) -> List[Document]:
+    """Alternate TXT and DOCX synthetic CVs."""
+    documents = []
+    for i in range(count):
+        text = synthetic_cv_text(n_skills=25, n_sections=n_sections, seed=seed + i)
+        if i % 2:
+            document = docx.Document()
+            for line in text.split("\n"):
+                document.add_paragraph(line)
+            buffer = io.BytesIO()
+            document.save(buffer)
+            documents.append((f"synthetic_{i}.docx", buffer.getvalue()))
+        else:
+            documents.append((f"synthetic_{i}.txt", text.encode("utf-8")))
+    return documents
+
+
+def synthetic_profiles(n_skills: int, seed: int = 0) -> Tuple[Dict, Dict]:
+    """
+    (cv_data, job_data) pair with `n_skills` technical skills on each side,
+    drawn from a vocabulary large enough to avoid trivial exact matches.
+    """
+    rng = random.Random(seed)
+    vocabulary = [f"{term} {suffix}".strip() for term in TECHNICAL_VOCABULARY for suffix in ("", "avancé", "v2", "cloud")]
+    cv_skills = rng.sample(vocabulary, n_skills)
+    job_skills = rng.sample(vocabulary, n_skills)
+    cv_data = {
+        "job_classification": {"job_title": "Software engineer", "confidence": 0.9, "alternative_jobs": []},
+        "cv_analysis": {
+            "technical_skills": cv_skills,
+            "soft_skills": rng.sample(SOFT_VOCABULARY, 5),
+            "technologies": rng.sample(vocabulary, n_skills // 2),
+            "experiences": [],
+            "educations": [],
+            "seniority": "Senior",
+            "languages": ["Français"],
+        },
+    }
+    job_data = {
+        "required_technical_skills": job_skills,
+        "required_soft_skills": rng.sample(SOFT_VOCABULARY, 4),
+        "required_technologies": rng.sample(vocabulary, n_skills // 2),
+        "required_experience_level": "Confirmé",
+        "required_languages": ["Français"],
+    }
+    return cv_data, job_data
@@ -0,0 +1,190 @@
+"""
+Deterministic local stand-ins for the Mistral chat and embedding clients.
+
+They implement just enough of the LangChain interfaces used by LLMService and
+MatchingService (ainvoke / astream / with_structured_output / aembed_documents)
+so the real service code runs end to end without network access, with a
+configurable simulated latency.
+"""
+import asyncio
+import hashlib
+import re
+from typing import Any, AsyncIterator, Iterator, List, Optional
+
+import numpy as np
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import RunnableLambda
+
+from app.schemas.analysis import CVExtractionResult, FusedExtractionResult, JobDescriptionAnalysis
+
+TECHNICAL_VOCABULARY = [
+    "python", "django", "flask", "fastapi", "java", "spring", "javascript", "typescript",
+    "react", "react.js", "next.js", "vue.js", "angular", "node.js", "html", "css", "tailwind",
+    "sql", "postgresql", "mysql", "mongodb", "redis", "docker", "kubernetes", "terraform",
+    "aws", "azure", "gcp", "git", "ci/cd", "linux", "pandas", "numpy", "scikit-learn",
+    "pytorch", "tensorflow", "machine learning", "deep learning", "nlp", "langchain",
+    "spark", "airflow", "graphql", "rest", "go", "rust", "c++", "power bi", "tableau",
+]
+SOFT_VOCABULARY = [
+    "communication", "leadership", "autonomie", "rigueur", "travail en équipe",
+    "curiosité", "adaptabilité", "esprit d'analyse", "créativité", "organisation",
+]
+SENIORITY_PATTERNS = [
+    ("Expert", r"\b(expert|lead|principal|architecte)\b"),
+    ("Senior", r"\b(senior|[5-9]\+? ans|1[0-9] ans)\b"),
+    ("Confirmé", r"\b(confirmé|[3-4]\+? ans)\b"),
+]
+
+
+def _prompt_text(value: Any) -> str:
+    """Flatten a prompt value / list of messages to plain text."""
+    if hasattr(value, "to_messages"):
+        value = value.to_messages()
+    if isinstance(value, list):
+        return "\n".join(m.content if isinstance(m, BaseMessage) else str(m) for m in value)
+    return str(value)
+
+
+def _user_text(value: Any) -> str:
+    """Text of the last message (the document itself, without the system prompt)."""
+    if hasattr(value, "to_messages"):
+        messages = value.to_messages()
+        return messages[-1].content if messages else ""
+    return _prompt_text(value)
+
+
+def _find_terms(text: str, vocabulary: List[str]) -> List[str]:
+    lowered = text.lower()
+    return [term for term in vocabulary if re.search(rf"(?<![\w.]){re.escape(term)}(?![\w]|\.\w)", lowered)]
+
+
+def _seniority(text: str) -> str:
+    lowered = text.lower()
+    for label, pattern in SENIORITY_PATTERNS:
+        if re.search(pattern, lowered):
+            return label
+    return "Junior"
+
+
+def fake_cv_extraction(text: str) -> CVExtractionResult:
+    skills = _find_terms(text, TECHNICAL_VOCABULARY)
+    return CVExtractionResult(
+        job_classification={
+            "job_title": "Développeur Python" if "python" in skills else "Software engineer",
+            "confidence": 0.8,
+            "alternative_jobs": ["Développeur back-end"],
+        },
+        cv_analysis={
+            "technical_skills": skills,
+            "soft_skills": _find_terms(text, SOFT_VOCABULARY),
+            "experiences": [],
+            "educations": [],
+            "seniority": _seniority(text),
+            "languages": ["Français"],
+        },
+    )
+
+
+def fake_job_analysis(text: str) -> JobDescriptionAnalysis:
+    return JobDescriptionAnalysis(
+        required_technical_skills=_find_terms(text, TECHNICAL_VOCABULARY),
+        required_soft_skills=_find_terms(text, SOFT_VOCABULARY),
+        required_experience_level=_seniority(text),
+        required_languages=["Français"],
+    )
+
+
+def fake_fused_extraction(text: str) -> FusedExtractionResult:
+    """CV and job offer sent in one message (see FUSED_PROMPT)."""
+    cv_text, _, job_text = text.rpartition("Offre d'emploi :")
+    return FusedExtractionResult(cv=fake_cv_extraction(cv_text), job=fake_job_analysis(job_text))
+
+
+class FakeChatModel(BaseChatModel):
+    """Chat model returning deterministic outputs after `latency` seconds."""
+
+    latency: float = 0.0
+    report_words: int = 300
+    stream_chunk_words: int = 5
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-mistral-chat"
+
+    def _report(self, messages: List[BaseMessage]) -> str:
+        seed = int(hashlib.md5(_prompt_text(messages).encode("utf-8")).hexdigest()[:8], 16)
+        words = [f"mot{(seed + i) % 97}" for i in range(self.report_words)]
+        return "## Synthèse Globale\n" + " ".join(words)
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self._report(messages)))])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        await asyncio.sleep(self.latency)
+        return self._generate(messages)
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs) -> Iterator[ChatGenerationChunk]:
+        words = self._report(messages).split(" ")
+        for i in range(0, len(words), self.stream_chunk_words):
+            yield ChatGenerationChunk(message=AIMessageChunk(content=" ".join(words[i:i + self.stream_chunk_words]) + " "))
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs) -> AsyncIterator[ChatGenerationChunk]:
+        chunks = list(self._stream(messages))
+        # La latence est répartie : premier fragment après 20 %, le reste ensuite
+        await asyncio.sleep(self.latency * 0.2)
+        for chunk in chunks:
+            await asyncio.sleep(self.latency * 0.8 / max(len(chunks), 1))
+            yield chunk
+
+    def with_structured_output(self, schema, **kwargs):
+        builders = {
+            CVExtractionResult: fake_cv_extraction,
+            JobDescriptionAnalysis: fake_job_analysis,
+            FusedExtractionResult: fake_fused_extraction,
+        }
+        if schema not in builders:
+            raise NotImplementedError(f"Schéma non simulé: {schema}")
+        build = builders[schema]
+
+        async def ainvoke(value):
+            await asyncio.sleep(self.latency)
+            return build(_user_text(value))
+
+        return RunnableLambda(lambda value: build(_user_text(value)), afunc=ainvoke)
+
+
+class FakeEmbeddings:
+    """
+    Hashed character-trigram embeddings: deterministic, and close strings
+    ("react" / "react.js") get close vectors, like a real embedding model.
+    """
+
+    def __init__(self, dim: int = 1024, latency: float = 0.0, per_text_latency: float = 0.0):
+        self.dim = dim
+        self.latency = latency
+        self.per_text_latency = per_text_latency
+        self.calls = 0
+        self.texts_embedded = 0
+
+    def _embed(self, text: str) -> List[float]:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        padded = f"  {text.lower()}  "
+        for i in range(len(padded) - 2):
+            digest = hashlib.md5(padded[i:i + 3].encode("utf-8")).digest()
+            vector[int.from_bytes(digest[:4], "little") % self.dim] += 1.0
+        norm = np.linalg.norm(vector)
+        return (vector / norm if norm else vector).tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed(t) for t in texts]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.calls += 1
+        self.texts_embedded += len(texts)
+        await asyncio.sleep(self.latency + self.per_text_latency * len(texts))
+        return self.embed_documents(texts)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return (await self.aembed_documents([text]))[0]
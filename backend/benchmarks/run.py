@@ -0,0 +1,238 @@
+"""
+End-to-end benchmark of the analysis pipeline with local model stand-ins.
+
+Usage (from backend/):
+    python -m benchmarks.run --iterations 50 --concurrency 8 --output bench.json
+    python -m benchmarks.run --compare bench.json   # exit code 1 on regression
+
+Stages:
+    extraction  TextExtractor.extract over sample + synthetic documents
+    scoring     MatchingService.calculate_score on large synthetic profiles
+    analyze     full POST /api/v1/analyze through the ASGI app
+                (--mode fused: one extraction call, template report)
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Awaitable, Callable, Dict, List, Optional
+
+# Pas de téléchargement du tokenizer Hugging Face par les clients Mistral
+os.environ.setdefault("HF_HUB_OFFLINE", "1")
+
+import numpy as np
+
+from app.services.llm.mistral_client import LLMService
+from app.services.llm.result_cache import MemoryResultCache, NullResultCache
+from app.services.matching.embedding_cache import EmbeddingCache
+from app.services.matching.score_store import ScoreStore
+from app.services.matching.scorer import MatchingService
+from app.services.parsers.extractor import TextExtractor
+from app.services.parsers.worker_pool import ExtractionPool
+from benchmarks import corpus
+from benchmarks.fakes import FakeChatModel, FakeEmbeddings
+
+STAGES = ("extraction", "scoring", "analyze")
+COMPARED_METRICS = ("p50_ms", "p95_ms", "p99_ms", "peak_memory_mb")
+
+
+def summarize(latencies: List[float], wall_time: float, peak_memory: Optional[int]) -> Dict[str, float]:
+    values = np.array(latencies) * 1000
+    return {
+        "iterations": len(latencies),
+        "throughput_per_s": round(len(latencies) / wall_time, 2) if wall_time else 0.0,
+        "mean_ms": round(float(values.mean()), 3),
+        "p50_ms": round(float(np.percentile(values, 50)), 3),
+        "p95_ms": round(float(np.percentile(values, 95)), 3),
+        "p99_ms": round(float(np.percentile(values, 99)), 3),
+        "peak_memory_mb": round(peak_memory / 1024 / 1024, 2) if peak_memory is not None else None,
+    }
+
+
+async def measure(
+    operation: Callable[[int], Awaitable[None]],
+    iterations: int,
+    concurrency: int,
+    memory_iterations: int
+) -> Dict[str, float]:
+    """
+    Run `operation(i)` `iterations` times with at most `concurrency` in flight.
+    Peak memory is measured in a separate sequential pass (tracemalloc slows
+    down allocations and would skew latencies).
+    """
+    for i in range(min(2, iterations)):
+        await operation(i)  # warm-up (imports, lazy initialisation)
+
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+
+    async def timed(i: int) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            await operation(i)
+            latencies.append(time.perf_counter() - start)
+
+    wall_start = time.perf_counter()
+    await asyncio.gather(*(timed(i) for i in range(iterations)))
+    wall_time = time.perf_counter() - wall_start
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    for i in range(memory_iterations):
+        await operation(i)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return summarize(latencies, wall_time, peak)
+
+
+def build_services(args) -> Dict[str, object]:
+    llm_cache = MemoryResultCache(ttl=3600, max_entries=1000) if args.warm_cache else NullResultCache()
+    embedding_cache = EmbeddingCache(model="fake-embed", max_entries=20000 if args.warm_cache else 0)
+    embeddings = FakeEmbeddings(latency=args.embed_latency, per_text_latency=args.embed_per_text_latency)
+    return {
+        "llm": LLMService(result_cache=llm_cache, llm=FakeChatModel(latency=args.llm_latency)),
+        # Stockages en mémoire : un benchmark n'écrit jamais dans les fichiers de production
+        "matching": MatchingService(embeddings=embeddings, cache=embedding_cache, score_store=ScoreStore()),
+        "embeddings": embeddings,
+    }
+
+
+async def bench_extraction(args, services) -> Dict[str, float]:
+    documents = corpus.sample_cvs() + corpus.synthetic_cvs(args.synthetic_documents, n_sections=args.sections)
+
+    async def operation(i: int) -> None:
+        filename, content = documents[i % len(documents)]
+        TextExtractor.extract(filename, content)
+
+    # Extraction synchrone : pas de concurrence, on mesure le coût CPU pur
+    return await measure(operation, args.iterations, 1, args.memory_iterations)
+
+
+async def bench_scoring(args, services) -> Dict[str, float]:
+    profiles = [corpus.synthetic_profiles(args.skills, seed=i) for i in range(8)]
+    matching = services["matching"]
+
+    async def operation(i: int) -> None:
+        cv_data, job_data = profiles[i % len(profiles)]
+        await matching.calculate_score(cv_data, job_data)
+
+    return await measure(operation, args.iterations, args.concurrency, args.memory_iterations)
+
+
+async def bench_analyze(args, services) -> Dict[str, float]:
+    import httpx
+    from app.api import deps
+    from app.main import app
+
+    from app.services.pipeline.analysis import AnalysisPipeline
+
+    # Pipeline construit directement sur les doublures : ni client Mistral, ni stockage analytique
+    pool = ExtractionPool(mode="thread")
+    deps.get_analysis_pipeline.set(
+        AnalysisPipeline(services["llm"], services["matching"], extraction_pool=pool, results_store=None)
+    )
+
+    documents = corpus.sample_cvs() + corpus.synthetic_cvs(4, n_sections=args.sections)
+    offers = corpus.sample_job_offers()
+    transport = httpx.ASGITransport(app=app)
+
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            async def operation(i: int) -> None:
+                filename, content = documents[i % len(documents)]
+                _, offer = offers[i % len(offers)]
+                response = await client.post(
+                    "/api/v1/analyze",
+                    files={"cv": (filename, content)},
+                    data={"job_description": offer, "mode": args.mode},
+                )
+                response.raise_for_status()
+
+            return await measure(operation, args.iterations, args.concurrency, args.memory_iterations)
+    finally:
+        pool.shutdown()
+
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """List of regressions (metric above baseline by more than `threshold`)."""
+    regressions = []
+    for stage, metrics in current["stages"].items():
+        reference = baseline.get("stages", {}).get(stage)
+        if not reference:
+            continue
+        for metric in COMPARED_METRICS:
+            new, old = metrics.get(metric), reference.get(metric)
+            if new is None or not old:
+                continue
+            ratio = new / old
+            marker = "REGRESSION" if ratio > 1 + threshold else "ok"
+            print(f"  {stage:<11} {metric:<15} {old:>10.2f} -> {new:>10.2f}  ({ratio - 1:+.1%})  {marker}")
+            if ratio > 1 + threshold:
+                regressions.append(f"{stage}.{metric}")
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark du pipeline d'analyse Skill-Match")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES))
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--memory-iterations", type=int, default=3)
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="Latence simulée d'un appel chat (s)")
+    parser.add_argument("--embed-latency", type=float, default=0.01, help="Latence simulée d'un appel embeddings (s)")
+    parser.add_argument("--embed-per-text-latency", type=float, default=0.0)
+    parser.add_argument("--mode", choices=("standard", "fused"), default="standard", help="Mode d'analyse (analyze)")
+    parser.add_argument("--skills", type=int, default=60, help="Compétences par profil synthétique (scoring)")
+    parser.add_argument("--synthetic-documents", type=int, default=6)
+    parser.add_argument("--sections", type=int, default=40, help="Sections par CV synthétique")
+    parser.add_argument("--warm-cache", action="store_true", help="Conserver les caches entre itérations")
+    parser.add_argument("--output", help="Fichier JSON de résultats")
+    parser.add_argument("--compare", help="Résultats de référence (JSON) à comparer")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Tolérance de régression (0.10 = +10 %%)")
+    return parser.parse_args(argv)
+
+
+async def run(args) -> Dict:
+    services = build_services(args)
+    runners = {"extraction": bench_extraction, "scoring": bench_scoring, "analyze": bench_analyze}
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "args": {k: v for k, v in vars(args).items() if k not in ("output", "compare")},
+        },
+        "stages": {},
+    }
+    for stage in args.stages:
+        results["stages"][stage] = await runners[stage](args, services)
+        print(f"{stage}: {json.dumps(results['stages'][stage])}")
+    return results
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    results = asyncio.run(run(args))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        print(f"Comparaison avec {args.compare} (tolérance {args.threshold:.0%}) :")
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"Régressions détectées : {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+"""
+Cold-start benchmark: import time and first-request latency of the API.
+
+Usage (from backend/):
+    python -m benchmarks.startup --runs 5 --output startup.json
+    python -m benchmarks.startup --warmup   # services warmed up before the first /analyze
+
+Each run is a fresh interpreter (`--child`), measuring:
+    import_ms          import app.main
+    startup_ms         lifespan startup
+    first_health_ms    first GET /health
+    warmup_ms          deps.warm_up() (only with --warmup)
+    first_analyze_ms   first POST /api/v1/analyze, services created on demand
+                       (local model stand-ins: no network, no Mistral client import)
+    second_analyze_ms  same request once everything is loaded
+The report gives the median of each metric and the heavy modules already
+loaded after `import app.main` (expected: none).
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+HEAVY_MODULES = ("langchain_core", "langchain_mistralai", "numpy", "pypdf", "docx", "pytesseract", "pdf2image")
+METRICS = ("import_ms", "startup_ms", "first_health_ms", "warmup_ms", "first_analyze_ms", "second_analyze_ms")
+
+# Environnement des runs : pas de réseau, pas de fichiers persistants partagés
+CHILD_ENV = {
+    "HF_HUB_OFFLINE": "1",
+    "LLM_CACHE_BACKEND": "none",
+    "JOB_STORE_BACKEND": "memory",
+    "SCORE_STORE_PATH": "",
+    "ANALYTICS_STORE_PATH": "",
+    "EMBEDDING_CACHE_PATH": "",
+    "WARMUP_ON_STARTUP": "false",
+}
+
+
+def _elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 3)
+
+
+async def _child_run(warmup: bool) -> Dict:
+    start = time.perf_counter()
+    from app.main import app
+    result = {"import_ms": _elapsed_ms(start), "loaded_modules": [m for m in HEAVY_MODULES if m in sys.modules]}
+
+    import httpx
+    from app.api import deps
+
+    def use_local_models() -> None:
+        from app.services.llm.mistral_client import LLMService
+        from app.services.llm.result_cache import NullResultCache
+        from app.services.matching.embedding_cache import EmbeddingCache
+        from app.services.matching.scorer import MatchingService
+        from app.services.parsers.worker_pool import ExtractionPool
+        from benchmarks.fakes import FakeChatModel, FakeEmbeddings
+
+        deps.get_llm_service.set(LLMService(result_cache=NullResultCache(), llm=FakeChatModel(report_words=50)))
+        deps.get_matching_service.set(
+            MatchingService(embeddings=FakeEmbeddings(), cache=EmbeddingCache(model="fake-embed", max_entries=1000))
+        )
+        deps.get_extraction_pool.set(ExtractionPool(mode="thread"))
+
+    from benchmarks import corpus
+    filename, content = corpus.sample_cvs()[0]
+    _, offer = corpus.sample_job_offers()[0]
+
+    start = time.perf_counter()
+    async with app.router.lifespan_context(app):
+        result["startup_ms"] = _elapsed_ms(start)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            start = time.perf_counter()
+            (await client.get("/health")).raise_for_status()
+            result["first_health_ms"] = _elapsed_ms(start)
+
+            if warmup:
+                start = time.perf_counter()
+                use_local_models()
+                await deps.warm_up()
+                result["warmup_ms"] = _elapsed_ms(start)
+
+            for key in ("first_analyze_ms", "second_analyze_ms"):
+                start = time.perf_counter()
+                if not warmup and key == "first_analyze_ms":
+                    use_local_models()
+                response = await client.post(
+                    "/api/v1/analyze", files={"cv": (filename, content)}, data={"job_description": offer}
+                )
+                response.raise_for_status()
+                result[key] = _elapsed_ms(start)
+    return result
+
+
+def run_cold(warmup: bool) -> Dict:
+    """Un run dans un nouvel interpréteur ; retourne ses mesures."""
+    command = [sys.executable, "-m", "benchmarks.startup", "--child"] + (["--warmup"] if warmup else [])
+    env = {**os.environ, **CHILD_ENV}
+    completed = subprocess.run(command, env=env, capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def summarize(runs: List[Dict]) -> Dict:
+    import numpy as np
+
+    summary = {
+        metric: round(float(np.median([run[metric] for run in runs])), 3)
+        for metric in METRICS if all(metric in run for run in runs)
+    }
+    summary["runs"] = len(runs)
+    summary["loaded_modules"] = sorted({m for run in runs for m in run["loaded_modules"]})
+    return summary
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Temps de démarrage à froid de l'API Skill-Match")
+    parser.add_argument("--runs", type=int, default=5, help="Nombre de démarrages à froid")
+    parser.add_argument("--warmup", action="store_true", help="Préchauffer les services avant la première analyse")
+    parser.add_argument("--output", help="Fichier JSON de résultats")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if args.child:
+        # Seule la dernière ligne de la sortie est lue par le processus parent
+        print(json.dumps(asyncio.run(_child_run(args.warmup))))
+        return 0
+
+    summary = summarize([run_cold(args.warmup) for _ in range(args.runs)])
+    print(f"startup: {json.dumps(summary)}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,9 @@
+import pytest
+
+from app.core.config import settings
+
+@pytest.fixture(autouse=True)
+def memory_only_stores(monkeypatch):
+    """Les services créés sans stockage explicite restent en mémoire pendant les tests."""
+    monkeypatch.setattr(settings, "SCORE_STORE_PATH", "")
+    monkeypatch.setattr(settings, "ANALYTICS_STORE_PATH", "")
@@ -0,0 +1,79 @@
+import os
+import tempfile
+
+import numpy as np
+
+from app.services.analytics.store import AnalyticsStore
+from app.services.matching.score_store import ScoreStore
+
+JOB = {'required_technical_skills': ['Python', 'Kubernetes'], 'required_soft_skills': [],
+       'required_experience_level': 'Senior'}
+
+def cv(title):
+    return {'job_classification': {'job_title': title, 'confidence': 0.9},
+            'cv_analysis': {'technical_skills': ['Python'], 'soft_skills': [], 'seniority': 'Senior'}}
+
+def matching(candidate_id, score, missing):
+    return {'candidate_id': candidate_id, 'offer_id': 'offer-1', 'overall_score': score,
+            'recommendation': 'recommended', 'matched_skills': ['python'], 'missing_skills': missing,
+            'details': {'skills_score': score, 'soft_skills_score': 100.0,
+                        'experience_score': 100.0, 'technologies_score': score}}
+
+def record(store, title, result):
+    # Sous-scores et compétences : enregistrés par le scoring dans le stockage des scores
+    store.score_store.record(result['candidate_id'], result['offer_id'], result['details'],
+                             result['matched_skills'], result['missing_skills'])
+    store.record(cv(title), JOB, result)
+
+def test_filtered_scan_and_reload():
+    with tempfile.TemporaryDirectory() as tmp:
+        scores = ScoreStore()
+        store = AnalyticsStore(tmp, scores)
+        record(store, "Développeur", matching("alice", 82.0, ['kubernetes']))
+        record(store, "Développeur", matching("bob", 91.0, []))
+        record(store, "Data", matching("carol", 65.0, ['kubernetes']))
+        # Nouvelle analyse d'alice : seul le dernier résultat compte
+        record(store, "Développeur", matching("alice", 75.0, ['Kubernetes']))
+        store.flush()
+
+        results = store.scan(min_score=70, missing=['Kubernetes'])
+        assert [(r['candidate_id'], r['overall_score']) for r in results] == [("alice", 75.0)]
+        assert results[0]['missing_skills'] == ['Kubernetes']
+        assert results[0]['details']['skills_score'] == 75.0
+        assert len(store.scan(min_score=70, missing=['kubernetes'], latest_only=False)) == 2
+        assert store.scan(missing=['Rust']) == []
+        store.close()
+
+        reloaded = AnalyticsStore(tmp, scores)
+        assert len(reloaded.cvs) == 3 and len(reloaded.offers) == 1 and len(reloaded.matches) == 4
+        assert isinstance(reloaded.matches.column("overall_score"), np.memmap)
+        assert [r['candidate_id'] for r in reloaded.scan(offer_id='offer-1')] == ["bob", "alice", "carol"]
+        # Couples absents du stockage des scores : ignorés
+        assert AnalyticsStore(tmp, ScoreStore()).scan() == []
+
+def test_pending_results_are_written_in_one_batch(monkeypatch):
+    with tempfile.TemporaryDirectory() as tmp:
+        store = AnalyticsStore(tmp)
+        batches = []
+        append_many = store.matches.append_many
+        monkeypatch.setattr(store.matches, "append_many", lambda rows: (batches.append(len(rows)), append_many(rows)))
+        with store._lock:
+            # Écriture bloquée : les résultats s'accumulent dans la file
+            for i in range(5):
+                store.record(cv("Développeur"), JOB, matching(f"candidat-{i}", 80.0, []))
+        store.close()
+        assert sum(batches) == 5 and len(batches) <= 2
+        assert len(AnalyticsStore(tmp).matches) == 5
+
+def test_incomplete_row_is_truncated_on_load():
+    with tempfile.TemporaryDirectory() as tmp:
+        first = AnalyticsStore(tmp)
+        record(first, "Développeur", matching("alice", 82.0, []))
+        first.close()
+        # Arrêt brutal pendant l'écriture d'une ligne : seules les listes ont été écrites
+        with open(os.path.join(tmp, "cvs", "skills.values.bin"), "ab") as f:
+            f.write(np.int32(7).tobytes())
+
+        store = AnalyticsStore(tmp, first.score_store)
+        assert len(store.cvs) == 1 and len(store.cvs.list_values("skills", 0)) == 1
+        assert store.scan()[0]['missing_skills'] == []
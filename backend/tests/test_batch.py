@@ -0,0 +1,33 @@
+import io
+import zipfile
+
+import pytest
+
+from app.core.config import settings
+from app.services.pipeline.batch import expand_archives
+
+def archive(entries):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for name, data in entries:
+            zf.writestr(name, data)
+    return buffer.getvalue()
+
+def test_archives_are_expanded_with_oversized_and_foreign_entries_skipped(monkeypatch):
+    monkeypatch.setattr(settings, "MAX_UPLOAD_SIZE", 1000)
+    content = archive([("cv1.txt", b"Python"), ("photo.png", b"png"), ("big.txt", b"a" * 5000), ("dir/cv2.txt", b"Go"),
+                       ("faux.pdf", b"MZ\x90\x00\x03\x00\x00\x00"), ("binaire.txt", b"texte\x00binaire")])
+    files = expand_archives([("lot.zip", content), ("cv3.txt", b"Rust")])
+    assert files == [("cv1.txt", b"Python"), ("cv2.txt", b"Go"), ("cv3.txt", b"Rust")]
+
+def test_file_count_and_uncompressed_volume_are_bounded_while_expanding(monkeypatch):
+    monkeypatch.setattr(settings, "BATCH_MAX_FILES", 3)
+    with pytest.raises(ValueError, match="Trop de CV"):
+        expand_archives([("lot.zip", archive([(f"cv{i}.txt", b"cv") for i in range(1000)]))])
+
+    monkeypatch.setattr(settings, "BATCH_MAX_FILES", 500)
+    monkeypatch.setattr(settings, "BATCH_MAX_UNCOMPRESSED_SIZE", 50_000)
+    bomb = archive([(f"cv{i}.txt", b"a" * 20_000) for i in range(10)])
+    assert len(bomb) < 5_000
+    with pytest.raises(ValueError, match="Volume décompressé"):
+        expand_archives([("lot.zip", bomb)])
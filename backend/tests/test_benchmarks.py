@@ -0,0 +1,15 @@
+import asyncio
+from benchmarks import run
+
+def test_scoring_benchmark_and_regression_check():
+    args = run.parse_args([
+        "--stages", "scoring", "--iterations", "3", "--memory-iterations", "1",
+        "--embed-latency", "0", "--skills", "10"
+    ])
+    results = asyncio.run(run.run(args))
+    scoring = results["stages"]["scoring"]
+    assert scoring["iterations"] == 3
+    assert scoring["p50_ms"] <= scoring["p99_ms"]
+
+    slower = {"stages": {"scoring": dict(scoring, p95_ms=scoring["p95_ms"] * 2)}}
+    assert run.compare(slower, results, threshold=0.1) == ["scoring.p95_ms"]
@@ -0,0 +1,78 @@
+import asyncio
+import hashlib
+import numpy as np
+from app.services.matching.candidate_index import CandidateIndex
+from app.services.matching.candidate_search import CandidateSearchService
+from app.services.matching.embedding_cache import EmbeddingCache
+from app.services.matching.scorer import MatchingService
+
+class HashEmbeddings:
+    async def aembed_documents(self, texts):
+        return [np.random.default_rng(int(hashlib.md5(t.encode()).hexdigest()[:8], 16)).normal(size=16).tolist() for t in texts]
+
+def make_cv(skills, soft, seniority):
+    return {'job_classification': {'job_title': 'Développeur', 'confidence': 1.0, 'alternative_jobs': []},
+            'cv_analysis': {'technical_skills': skills, 'soft_skills': soft, 'seniority': seniority}}
+
+JOB = {'required_technical_skills': ['python', 'docker'], 'required_soft_skills': ['communication'],
+       'required_experience_level': 'Senior', 'required_languages': []}
+
+def build_service(index):
+    matching = MatchingService(embeddings=HashEmbeddings(), cache=EmbeddingCache(model="test"))
+    return CandidateSearchService(matching, index=index, shortlist_factor=2)
+
+def test_search_ranks_by_exact_score(tmp_path):
+    service = build_service(CandidateIndex(path=str(tmp_path)))
+    profiles = {
+        'exact': make_cv(['python', 'docker'], ['communication'], 'Senior'),
+        'partial': make_cv(['python'], ['rigueur'], 'Junior'),
+        'other': make_cv(['photoshop'], [], 'Junior'),
+    }
+
+    async def main():
+        for cid, cv in profiles.items():
+            await service.add_candidate(cid, cv)
+        return await service.search(JOB, top_k=2)
+
+    result = asyncio.run(main())
+    assert result['results'][0]['candidate_id'] == 'exact'
+    for r in result['results']:
+        assert abs(r['estimated_score'] - r['matching']['overall_score']) < 0.2
+
+    reloaded = CandidateIndex(path=str(tmp_path))
+    assert len(reloaded) == 3
+    assert reloaded.get_profile('other')['cv_analysis']['technical_skills'] == ['photoshop']
+
+def test_ivf_search_returns_nearest():
+    index = CandidateIndex()
+    rng = np.random.default_rng(0)
+    for i in range(200):
+        index.add(str(i), {'technical': rng.normal(size=8), 'soft': rng.normal(size=8), 'tools': rng.normal(size=8)}, 1, {})
+    query = np.concatenate([np.zeros(8), np.zeros(8), np.ones(8)]).astype(np.float32)
+    exact = index.search(query, np.zeros(5, dtype=np.float32), top_k=1)
+    index.build_ivf(nlist=4)
+    approx = index.search(query, np.zeros(5, dtype=np.float32), top_k=1, approximate=True, nprobe=4)
+    assert approx == exact
+
+def test_ivf_is_retrained_as_the_index_grows_and_reloaded(tmp_path):
+    index = CandidateIndex(path=str(tmp_path), retrain_factor=2.0)
+    rng = np.random.default_rng(1)
+
+    def add(count):
+        for _ in range(count):
+            index.add(str(len(index)), {'technical': rng.normal(size=8), 'soft': rng.normal(size=8), 'tools': rng.normal(size=8)}, 1, {})
+
+    add(16)
+    index.build_ivf()
+    assert index.is_trained and not index.needs_training
+    add(15)
+    assert not index.needs_training
+    add(1)
+    assert index.needs_training
+    index.build_ivf()
+    assert not index.needs_training and index._centroids.shape[0] == int(np.sqrt(32))
+
+    add(3)
+    reloaded = CandidateIndex(path=str(tmp_path), retrain_factor=2.0)
+    assert reloaded.is_trained and not reloaded.needs_training
+    assert np.array_equal(reloaded._assignments[:35], index._assignments[:35])
@@ -0,0 +1,61 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from app.core.config import settings
+from app.services.matching.embedding_batcher import EmbeddingBatcher
+from app.services.matching.embedding_cache import EmbeddingCache
+from app.services.matching.scorer import MatchingService
+from benchmarks.fakes import FakeEmbeddings
+
+JOB = {'required_technical_skills': ['Python', 'Django', 'Docker'], 'required_soft_skills': ['Rigueur'],
+       'required_experience_level': 'Senior'}
+
+def cv(i):
+    return {'cv_analysis': {'technical_skills': ['Python', f'Outil{i}'], 'soft_skills': [f'Qualité{i}'],
+                            'tools': [f'Logiciel{i}'], 'seniority': 'Senior'}}
+
+def score_concurrently(embeddings, count=8):
+    service = MatchingService(embeddings=embeddings, cache=EmbeddingCache(model="fake", max_entries=1000))
+
+    async def main():
+        return await asyncio.gather(*(service.calculate_score(cv(i), JOB) for i in range(count)))
+
+    return asyncio.run(main())
+
+def test_concurrent_scorings_share_embedding_calls(monkeypatch):
+    monkeypatch.setattr(settings, "EMBEDDING_BATCH_WINDOW_MS", 0)
+    unbatched = FakeEmbeddings(dim=64, latency=0.02)
+    expected = score_concurrently(unbatched)
+
+    monkeypatch.setattr(settings, "EMBEDDING_BATCH_WINDOW_MS", 5)
+    batched = FakeEmbeddings(dim=64, latency=0.02)
+    results = score_concurrently(batched)
+
+    assert batched.calls < unbatched.calls
+    assert batched.calls <= 2
+    assert batched.texts_embedded == unbatched.texts_embedded
+    assert [r['overall_score'] for r in results] == [r['overall_score'] for r in expected]
+
+def test_batcher_splits_dedups_and_propagates_errors():
+    batches = []
+
+    async def embed(texts):
+        batches.append(list(texts))
+        if "erreur" in texts:
+            raise RuntimeError("fournisseur indisponible")
+        return {text: np.ones(2, dtype=np.float32) * len(text) for text in texts}
+
+    async def main():
+        batcher = EmbeddingBatcher(embed, "test", window_ms=5, max_batch_size=2)
+        first, second = await asyncio.gather(batcher.embed(["a", "bb"]), batcher.embed(["bb", "ccc"]))
+        with pytest.raises(RuntimeError):
+            await asyncio.gather(batcher.embed(["erreur"]), batcher.embed(["d"]))
+        return first, second
+
+    first, second = asyncio.run(main())
+    assert batches[:2] == [["a", "bb"], ["ccc"]]
+    assert first["bb"][0] == second["bb"][0] == 2.0
+    assert set(second) == {"bb", "ccc"}
+    assert batches[2] == ["erreur", "d"]
@@ -0,0 +1,58 @@
+import asyncio
+import numpy as np
+from app.services.matching.embedding_cache import EmbeddingCache
+from app.services.matching.scorer import MatchingService
+
+class CountingEmbeddings:
+    def __init__(self):
+        self.calls = []
+
+    async def aembed_documents(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(t)), 1.0] for t in texts]
+
+def test_lru_eviction():
+    cache = EmbeddingCache(model="test", max_entries=2)
+    cache.put_many({"a": np.ones(2), "b": np.ones(2), "c": np.ones(2)})
+    found, missing = cache.get_many(["a", "c"])
+    assert list(found) == ["c"]
+    assert missing == ["a"]
+    assert cache.stats["evictions"] == 1
+
+def test_disk_tier_survives_restart(tmp_path):
+    path = str(tmp_path / "emb.sqlite3")
+    first = EmbeddingCache(model="test", db_path=path)
+    first.put_many({"Python": np.array([1.0, 2.0])})
+    first.close()
+
+    cache = EmbeddingCache(model="test", db_path=path)
+    found, missing = asyncio.run(cache.aget_many(["  python "]))
+    assert missing == []
+    assert np.allclose(found["  python "], [1.0, 2.0])
+    assert cache.stats["disk_hits"] == 1
+
+    other_model = EmbeddingCache(model="other", db_path=path)
+    assert other_model.get_many(["python"])[1] == ["python"]
+
+def test_only_misses_are_embedded():
+    embeddings = CountingEmbeddings()
+    service = MatchingService(embeddings=embeddings, cache=EmbeddingCache(model="test"))
+
+    asyncio.run(service._get_embeddings_batch(["python", "docker"]))
+    result = asyncio.run(service._get_embeddings_batch(["python", "docker", "sql"]))
+
+    assert embeddings.calls[1] == ["sql"]
+    assert set(result) == {"python", "docker", "sql"}
+
+def test_unwritable_paths_fall_back_to_memory(tmp_path):
+    from app.services.matching.score_store import ScoreStore
+
+    blocker = tmp_path / "fichier"
+    blocker.write_text("")
+    cache = EmbeddingCache(model="test", db_path=str(blocker / "cache" / "embeddings.sqlite3"))
+    cache.put_many({"python": np.ones(4, dtype=np.float32)})
+    assert "python" in cache.get_many(["python"])[0]
+
+    store = ScoreStore(str(blocker / "scores" / "scores.sqlite3"))
+    store.record("cv", "offre", dict.fromkeys(("skills_score", "soft_skills_score", "experience_score", "technologies_score"), 50.0), [], [])
+    assert len(store) == 1
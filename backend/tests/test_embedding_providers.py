@@ -0,0 +1,74 @@
+import asyncio
+import numpy as np
+from benchmarks.fakes import FakeEmbeddings
+from app.services.matching.embedding_cache import EmbeddingCache
+from app.services.matching.embedding_providers import HashingEmbeddingProvider, VocabularyEmbeddingProvider, as_provider
+from app.services.matching.scorer import MatchingService
+
+def test_hashing_provider_is_local_and_tolerates_spelling_variants():
+    provider = HashingEmbeddingProvider(dim=512)
+    react, react_js, java, javascript = asyncio.run(
+        provider.aembed_documents(["React", "react.js", "java", "javascript"])
+    )
+    assert float(react @ react_js) > provider.skill_threshold
+    assert float(java @ javascript) < provider.skill_threshold
+
+def test_vocabulary_table_is_memory_mapped_with_fallback(tmp_path):
+    path = str(tmp_path / "vocab")
+    asyncio.run(VocabularyEmbeddingProvider.build(path, ["Python", "Docker"], HashingEmbeddingProvider(dim=32)))
+
+    provider = VocabularyEmbeddingProvider(path, fallback=HashingEmbeddingProvider(dim=32))
+    assert isinstance(provider._vectors, np.memmap)
+    assert "python" in provider and "rust" not in provider
+    python, rust = asyncio.run(provider.aembed_documents(["PYTHON", "rust"]))
+    assert np.allclose(python, HashingEmbeddingProvider(dim=32).embed("python"))
+    assert np.linalg.norm(rust) > 0
+
+def test_skills_use_local_provider_and_profiles_remote_one():
+    remote = FakeEmbeddings(dim=64)
+    service = MatchingService(
+        embeddings=remote,
+        cache=EmbeddingCache(model="fake", max_entries=100),
+        skill_embeddings=HashingEmbeddingProvider(dim=256)
+    )
+    cv = {'cv_analysis': {'technical_skills': ['ReactJS', 'Docker'], 'soft_skills': ['Communication'], 'seniority': 'Senior'}}
+    job = {'required_technical_skills': ['React', 'Kubernetes'], 'required_soft_skills': ['communication'],
+           'required_experience_level': 'Senior'}
+
+    result = asyncio.run(service.calculate_score(cv, job))
+    # Seules les chaînes agrégées (techniques, soft skills) partent au modèle distant ;
+    # « Communication » du CV est servie par le cache rempli lors de la compilation de l'offre
+    assert remote.texts_embedded == 3
+    assert result['matched_skills'] == ['react', 'communication']
+    assert result['missing_skills'] == ['kubernetes']
+
+def test_vocabulary_terms_never_reach_the_remote_provider(tmp_path):
+    class RecordingEmbeddings(FakeEmbeddings):
+        def __init__(self):
+            super().__init__(dim=64)
+            self.batches = []
+
+        async def aembed_documents(self, texts):
+            self.batches.append(list(texts))
+            return await super().aembed_documents(texts)
+
+    path = str(tmp_path / "vocab")
+    vocabulary = ["python", "docker", "kubernetes", "communication", "rigueur"]
+    asyncio.run(VocabularyEmbeddingProvider.build(path, vocabulary, as_provider(FakeEmbeddings(dim=64))))
+
+    remote = RecordingEmbeddings()
+    skills = VocabularyEmbeddingProvider(path, fallback=as_provider(remote))
+    assert skills.name != as_provider(remote).name
+    service = MatchingService(
+        embeddings=remote, cache=EmbeddingCache(model="fake", max_entries=100), skill_embeddings=skills
+    )
+    cv = {'cv_analysis': {'technical_skills': ['Python', 'Docker'], 'soft_skills': ['Communication', 'Rigueur'],
+                          'seniority': 'Senior'}}
+    job = {'required_technical_skills': ['Python', 'Kubernetes'], 'required_soft_skills': ['Communication', 'Rigueur'],
+           'required_experience_level': 'Senior'}
+
+    result = asyncio.run(service.calculate_score(cv, job))
+    # Seules les chaînes agrégées des profils partent au modèle distant
+    sent = {text.lower() for batch in remote.batches for text in batch}
+    assert not sent & set(vocabulary)
+    assert result['matched_skills'] == ['python', 'communication', 'rigueur']
@@ -9,3 +9,20 @@ def test_extract_text_from_txt():
 def test_extract_unsupported_format():
     with pytest.raises(ValueError):
         TextExtractor.extract("test.xyz", b"content")
+
+def test_extract_stops_at_character_budget():
+    content = "\n".join(f"ligne {i}" for i in range(1000)).encode()
+    text = TextExtractor.extract("cv.txt", content, max_chars=50)
+    assert len(text) == 50
+    assert text.startswith("ligne 0\nligne 1")
+
+def test_join_chunks_stops_consuming_early():
+    consumed = []
+
+    def pages():
+        for i in range(100):
+            consumed.append(i)
+            yield "x" * 10
+
+    TextExtractor.join_chunks(pages(), max_chars=25)
+    assert len(consumed) == 3
@@ -0,0 +1,51 @@
+import asyncio
+
+import pytest
+
+from app.services.llm.mistral_client import LLMService
+from app.services.llm.result_cache import MemoryResultCache
+from app.services.matching.embedding_cache import EmbeddingCache
+from app.services.matching.scorer import MatchingService
+from app.services.pipeline.analysis import AnalysisPipeline
+from benchmarks.fakes import FakeChatModel, FakeEmbeddings
+
+CV = "Développeur Python senior, 6 ans d'expérience. Django, Docker, PostgreSQL. Communication, rigueur.".encode("utf-8")
+OFFER = "Nous recherchons un développeur Python senior : Django, Kubernetes. Rigueur et autonomie."
+
+def build_pipeline():
+    llm = LLMService(result_cache=MemoryResultCache(ttl=60, max_entries=10), llm=FakeChatModel())
+    matching = MatchingService(embeddings=FakeEmbeddings(dim=64), cache=EmbeddingCache(model="fake", max_entries=100))
+    return AnalysisPipeline(llm, matching)
+
+def test_fused_mode_makes_a_single_llm_call():
+    pipeline = build_pipeline()
+    calls = []
+
+    async def forbidden(*args, **kwargs):
+        raise AssertionError("appel LLM inattendu")
+
+    fused = pipeline.llm_service.analyze_fused
+
+    async def counting_fused(*args):
+        calls.append(args)
+        return await fused(*args)
+
+    pipeline.llm_service.analyze_cv = forbidden
+    pipeline.llm_service.analyze_job_description = forbidden
+    pipeline.llm_service.generate_report = forbidden
+    pipeline.llm_service.analyze_fused = counting_fused
+
+    results = asyncio.run(pipeline.run("cv.txt", CV, OFFER, mode="fused"))
+
+    assert len(calls) == 1
+    assert results['cv_analysis']['cv_analysis']['seniority'] == "Senior"
+    assert results['job_analysis']['required_technical_skills'] == ["python", "django", "kubernetes"]
+    assert "kubernetes" in results['matching']['missing_skills']
+    report = results['report']
+    for section in ("Synthèse Globale", "Points Forts", "Points de Vigilance", "Conclusion", "RECOMMANDATION FINALE"):
+        assert f"## {section}" in report
+    assert f"**{results['matching']['overall_score']}/100**" in report
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        asyncio.run(build_pipeline().run("cv.txt", CV, OFFER, mode="turbo"))
@@ -0,0 +1,55 @@
+import asyncio
+
+from app.services.matching.embedding_cache import EmbeddingCache
+from app.services.matching.scorer import MatchingService
+from benchmarks.fakes import FakeEmbeddings
+
+JOB = {'required_technical_skills': ['Python', 'Kubernetes'], 'required_soft_skills': ['Rigueur'],
+       'required_experience_level': 'Senior'}
+
+def cv(*skills):
+    return {'cv_analysis': {'technical_skills': list(skills), 'soft_skills': [], 'seniority': 'Senior'}}
+
+def test_offer_is_compiled_once_for_concurrent_candidates():
+    embeddings = FakeEmbeddings(dim=32, latency=0.02)
+    service = MatchingService(embeddings=embeddings, cache=EmbeddingCache(model="fake", max_entries=100))
+
+    async def main():
+        return await asyncio.gather(*(service.calculate_score(cv("Django", f"outil-{i}"), dict(JOB)) for i in range(5)))
+
+    results = asyncio.run(main())
+    assert len(service.job_profiles) == 1
+    assert all(r['matched_skills'] == ['python'] for r in results)
+    assert all(r['missing_skills'] == ['kubernetes', 'Rigueur'] for r in results)
+
+def test_compiled_profile_gives_the_same_score():
+    service = MatchingService(embeddings=FakeEmbeddings(dim=32), cache=EmbeddingCache(model="fake", max_entries=100))
+    candidate = cv("Python", "Docker")
+
+    from_dict = asyncio.run(service.calculate_score(candidate, JOB))
+    profile = asyncio.run(service.job_profile(JOB))
+    assert profile.level == 3
+    assert asyncio.run(service.calculate_score(candidate, profile)) == from_dict
+
+def test_profile_compiled_after_an_embedding_error_is_not_cached():
+    class FlakyEmbeddings(FakeEmbeddings):
+        failing = True
+
+        async def aembed_documents(self, texts):
+            if self.failing:
+                raise RuntimeError("fournisseur indisponible")
+            return await super().aembed_documents(texts)
+
+    embeddings = FlakyEmbeddings(dim=32)
+    service = MatchingService(embeddings=embeddings, cache=EmbeddingCache(model="fake", max_entries=100))
+    candidate = cv("Python", "Docker")
+
+    degraded = asyncio.run(service.calculate_score(candidate, JOB))
+    assert len(service.job_profiles) == 0
+    assert degraded['details']['skills_score'] == 0
+
+    embeddings.failing = False
+    result = asyncio.run(service.calculate_score(candidate, JOB))
+    assert len(service.job_profiles) == 1
+    assert result['matched_skills'] == ['python']
+    assert result['details']['skills_score'] > 0
@@ -0,0 +1,124 @@
+import asyncio
+import time
+from app.services.pipeline.job_store import MemoryJobStore, SQLiteJobStore
+from app.services.pipeline.jobs import AnalysisJobQueue
+
+RESULTS = {
+    'cv_analysis': {
+        'job_classification': {'job_title': 'Développeur Python', 'confidence': 0.9},
+        'cv_analysis': {
+            'technical_skills': ['python'], 'soft_skills': [], 'experiences': [], 'educations': [],
+            'seniority': 'Senior', 'languages': [],
+        },
+    },
+    'matching': {
+        'overall_score': 80.0, 'recommendation': 'strongly_recommended', 'matched_skills': ['python'], 'missing_skills': [],
+        'details': {'skills_score': 80.0, 'experience_score': 100.0, 'technologies_score': 60.0, 'soft_skills_score': 80.0},
+    },
+    'report': '## Synthèse Globale',
+}
+
+class StubPipeline:
+    def __init__(self):
+        self.order = []
+
+    async def run(self, filename, content, job_description):
+        self.order.append(filename)
+        await asyncio.sleep(0.01)
+        if content == b'':
+            raise ValueError("Impossible d'extraire du texte du fichier.")
+        return RESULTS
+
+async def wait_until_finished(queue, job_id):
+    job = await queue.get(job_id)
+    while job['status'] not in ('completed', 'failed'):
+        job = await queue.wait(job_id, 1)
+    return job
+
+def test_jobs_run_by_priority_and_report_errors():
+    pipeline = StubPipeline()
+    queue = AnalysisJobQueue(pipeline, store=MemoryJobStore(ttl=60), workers=1, queue_size=10)
+
+    async def main():
+        first = await queue.submit('first.txt', b'cv', 'offre')
+        assert (await queue.wait(first['id'], 1))['status'] == 'running'
+        low = await queue.submit('low.txt', b'cv', 'offre', priority='low')
+        high = await queue.submit('high.txt', b'', 'offre', priority='high')
+        jobs = [await wait_until_finished(queue, job['id']) for job in (first, low, high)]
+        await queue.stop()
+        return jobs
+
+    first, low, high = asyncio.run(main())
+    assert pipeline.order == ['first.txt', 'high.txt', 'low.txt']
+    assert low['status'] == 'completed'
+    assert low['result']['matching']['overall_score'] == 80.0
+    assert high['status'] == 'failed' and high['status_code'] == 400
+
+def test_sqlite_store_requeues_interrupted_jobs(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    store = SQLiteJobStore(path, ttl=60)
+    job = {'id': 'j1', 'status': 'queued', 'priority': 'normal', 'filename': 'cv.txt', 'created_at': time.time()}
+    store.create(job, {'filename': 'cv.txt', 'content': b'cv', 'job_description': 'offre'})
+    store.update('j1', status='running', started_at=time.time())  # interrompu par un redémarrage
+
+    async def restart():
+        queue = AnalysisJobQueue(StubPipeline(), store=SQLiteJobStore(path, ttl=60), workers=1, queue_size=10)
+        await queue.start()
+        finished = await wait_until_finished(queue, 'j1')
+        await queue.stop()
+        return finished
+
+    finished = asyncio.run(restart())
+    assert finished['status'] == 'completed'
+    assert finished['result']['report'] == '## Synthèse Globale'
+    assert store.get_payload('j1') is None
+
+def test_workers_do_not_inherit_the_submitting_request_context():
+    from app.core import metrics
+
+    class TimedPipeline(StubPipeline):
+        async def run(self, filename, content, job_description):
+            with metrics.stage_timer("extraction"):
+                return await super().run(filename, content, job_description)
+
+    queue = AnalysisJobQueue(TimedPipeline(), store=MemoryJobStore(ttl=60), workers=1, queue_size=10)
+
+    async def main():
+        timings = []
+        token = metrics._server_timings.set(timings)
+        try:
+            job = await queue.submit('cv.txt', b'cv', 'offre')
+        finally:
+            metrics._server_timings.reset(token)
+        await wait_until_finished(queue, job['id'])
+        await queue.stop()
+        return timings
+
+    assert asyncio.run(main()) == []
+
+def test_status_reads_and_waits_stay_off_the_event_loop():
+    import threading
+
+    class LoopCheckingStore(MemoryJobStore):
+        def __init__(self, ttl):
+            super().__init__(ttl)
+            self.reads_on_loop = 0
+
+        def get(self, job_id):
+            if threading.current_thread() is threading.main_thread():
+                self.reads_on_loop += 1
+            return super().get(job_id)
+
+    store = LoopCheckingStore(ttl=60)
+    queue = AnalysisJobQueue(StubPipeline(), store=store, workers=1, queue_size=10)
+
+    async def main():
+        jobs = [await queue.submit(f'cv{i}.txt', b'cv', 'offre') for i in range(3)]
+        # Plusieurs clients en long-polling réveillés à chaque changement de statut
+        finished = await asyncio.gather(*(wait_until_finished(queue, job['id']) for job in jobs * 2))
+        await queue.stop()
+        return finished
+
+    assert all(job['status'] == 'completed' for job in asyncio.run(main()))
+    assert store.reads_on_loop == 0
+    assert queue._statuses == {}
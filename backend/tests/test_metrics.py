@@ -0,0 +1,45 @@
+import asyncio
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.core.metrics import REGISTRY, ServerTimingMiddleware, MetricsRegistry, stage_timer, timed
+from app.main import app
+
+def test_histogram_and_counter_rendering():
+    registry = MetricsRegistry()
+    latency = registry.histogram("demo_seconds", "Demo.", buckets=(0.1, 1), labelnames=("stage",))
+    hits = registry.counter("demo_total", "Demo.", labelnames=("result",))
+    latency.observe(0.05, stage="a")
+    latency.observe(0.5, stage="a")
+    hits.inc(3, result="hit")
+
+    text = registry.render()
+    assert 'demo_seconds_bucket{stage="a",le="0.1"} 1' in text
+    assert 'demo_seconds_bucket{stage="a",le="+Inf"} 2' in text
+    assert 'demo_seconds_count{stage="a"} 2' in text
+    assert 'demo_total{result="hit"} 3' in text
+
+def test_server_timing_header_lists_stages():
+    demo = FastAPI()
+    demo.add_middleware(ServerTimingMiddleware)
+
+    @timed("demo_llm")
+    async def call_llm():
+        await asyncio.sleep(0)
+
+    @demo.get("/")
+    async def root():
+        with stage_timer("demo_extraction"):
+            pass
+        await call_llm()
+        return {}
+
+    header = TestClient(demo).get("/").headers["server-timing"]
+    assert "demo_extraction;dur=" in header
+    assert "demo_llm;dur=" in header
+    assert "total;dur=" in header
+    assert 'stage="demo_llm"' in REGISTRY.render()
+
+def test_metrics_endpoint():
+    response = TestClient(app).get("/metrics")
+    assert response.status_code == 200
+    assert "# TYPE skillmatch_stage_duration_seconds histogram" in response.text
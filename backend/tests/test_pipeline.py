@@ -0,0 +1,50 @@
+import asyncio
+import pytest
+from app.services.pipeline.runner import PipelineRunner, Stage, StageTimeoutError
+
+def test_independent_stages_run_concurrently():
+    async def slow(value):
+        await asyncio.sleep(0.05)
+        return value
+
+    stages = [
+        Stage('a', lambda r: slow(1)),
+        Stage('b', lambda r: slow(2)),
+        Stage('c', lambda r: slow(r['a'] + r['b']), depends_on=['a', 'b']),
+    ]
+
+    async def main():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        results = await PipelineRunner().run(stages)
+        return results, loop.time() - start
+
+    results, elapsed = asyncio.run(main())
+    assert results == {'a': 1, 'b': 2, 'c': 3}
+    assert elapsed < 0.14
+
+def test_failure_cancels_running_stages():
+    cancelled = []
+
+    async def fail(results):
+        raise ValueError("parse error")
+
+    async def long_call(results):
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    stages = [Stage('extraction', fail), Stage('job_analysis', long_call)]
+    with pytest.raises(ValueError):
+        asyncio.run(PipelineRunner().run(stages))
+    assert cancelled == [True]
+
+def test_stage_timeout():
+    async def long_call(results):
+        await asyncio.sleep(5)
+
+    with pytest.raises(StageTimeoutError) as exc:
+        asyncio.run(PipelineRunner().run([Stage('report', long_call, timeout=0.01)]))
+    assert exc.value.stage == 'report'
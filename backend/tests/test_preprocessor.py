@@ -0,0 +1,60 @@
+from app.services.parsers.preprocessor import CVPreprocessor, estimate_tokens
+
+CV = """Jean Dupont
+Développeur Python Senior
+
+PROFIL
+Développeur   passionné avec 8 ans d'expérience.
+
+EXPÉRIENCE PROFESSIONNELLE
+Lead dev - ACME (2019 - 2024)
+Page 1/2
+Jean Dupont - CV
+Développeur - Foo (2016 - 2019)
+Page 2 sur 2
+Jean Dupont - CV
+
+Compétences
+Python, Django, Docker
+
+Centres d'intérêt
+Randonnée, photographie, échecs, voyages, cuisine, lecture
+"""
+
+def test_boilerplate_is_removed_and_sections_detected():
+    result = CVPreprocessor(token_budget=0).process(CV)
+
+    assert result.sections == ['header', 'profile', 'experience', 'skills', 'interests']
+    assert "Page" not in result.text
+    assert result.text.count("Jean Dupont - CV") == 1
+    assert "Développeur passionné" in result.text
+    assert "2019 - 2024" in result.text
+    assert result.tokens_after < result.tokens_before
+    assert not result.truncated
+
+def test_budget_keeps_high_priority_sections_in_original_order():
+    budget = 60
+    result = CVPreprocessor(token_budget=budget).process(CV)
+
+    assert result.truncated
+    assert result.tokens_after <= budget
+    assert "Python, Django, Docker" in result.text
+    assert "Randonnée" not in result.text
+    assert result.text.index("Lead dev") < result.text.index("Python, Django")
+
+def test_token_estimate():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("Python, Django") == 2 + 1 + 2
+
+def test_repeated_body_lines_are_kept():
+    cv = """EXPÉRIENCE PROFESSIONNELLE
+Lead dev - ACME (2019 - 2024)
+Technologies : Python, Django
+- Mise en place de l'intégration continue
+Développeur - Foo (2016 - 2019)
+Technologies : Python, Django
+- Mise en place de l'intégration continue
+"""
+    text = CVPreprocessor(token_budget=0).process(cv).text
+    assert text.count("Technologies : Python, Django") == 2
+    assert text.count("- Mise en place de l'intégration continue") == 2
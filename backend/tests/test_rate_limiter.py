@@ -0,0 +1,78 @@
+import asyncio
+import time
+import httpx
+from app.services.llm.http_client import RateLimitedTransport
+from app.services.llm.rate_limiter import RateLimiter
+
+def test_concurrency_is_bounded():
+    limiter = RateLimiter(max_concurrency=2)
+    active, peak = 0, 0
+
+    async def call():
+        nonlocal active, peak
+        async with limiter:
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+    async def main():
+        await asyncio.gather(*(call() for _ in range(6)))
+
+    asyncio.run(main())
+    assert peak == 2
+
+def test_token_bucket_spaces_requests_after_burst():
+    limiter = RateLimiter(rate=50, burst=2)
+
+    async def main():
+        start = time.monotonic()
+        for _ in range(5):
+            async with limiter:
+                pass
+        return time.monotonic() - start
+
+    # 2 requêtes immédiates, puis 3 espacées de 20 ms
+    assert asyncio.run(main()) >= 0.05
+
+class _Body(httpx.AsyncByteStream):
+    async def __aiter__(self):
+        yield b'{"ok": true}'
+
+def test_transport_releases_slot_when_response_is_closed():
+    limiter = RateLimiter(max_concurrency=1)
+    transport = RateLimitedTransport(httpx.MockTransport(lambda request: httpx.Response(200, stream=_Body())), limiter)
+
+    async def main():
+        async with httpx.AsyncClient(transport=transport, base_url="https://api.test") as client:
+            for _ in range(3):
+                response = await asyncio.wait_for(client.post("/chat/completions", json={}), 1)
+                assert response.json() == {"ok": True}
+
+    asyncio.run(main())
+
+def test_limiter_works_across_event_loops_and_sync_calls():
+    from app.services.llm.http_client import RateLimitedSyncTransport
+
+    limiter = RateLimiter(max_concurrency=1, rate=1000, burst=1)
+
+    async def call():
+        async with limiter:
+            await asyncio.sleep(0)
+
+    async def main():
+        await asyncio.wait_for(asyncio.gather(call(), call()), 1)
+
+    # Une boucle par asyncio.run : les primitives ne sont pas liées à la première
+    for _ in range(2):
+        asyncio.run(main())
+
+    class SyncBody(httpx.SyncByteStream):
+        def __iter__(self):
+            yield b'{"ok": true}'
+
+    transport = RateLimitedSyncTransport(httpx.MockTransport(lambda request: httpx.Response(200, stream=SyncBody())), limiter)
+    with httpx.Client(transport=transport, base_url="https://api.test") as client:
+        for _ in range(3):
+            assert client.post("/chat/completions", json={}).json() == {"ok": True}
+    assert limiter._sync_semaphore.acquire(blocking=False)
@@ -0,0 +1,48 @@
+import asyncio
+
+from app.services.llm.mistral_client import LLMService
+from app.services.llm.report_renderer import ReportPolicy, render_report
+from app.services.llm.result_cache import MemoryResultCache
+from app.services.matching.embedding_cache import EmbeddingCache
+from app.services.matching.scorer import MatchingService
+from app.services.pipeline.analysis import AnalysisPipeline
+from benchmarks.fakes import FakeChatModel, FakeEmbeddings
+
+JOB = {'required_technical_skills': ['Python', 'Django', 'Kubernetes'], 'required_soft_skills': ['Rigueur'],
+       'required_experience_level': 'Senior'}
+CV = {'job_classification': {'job_title': "Développeur Python", 'confidence': 0.9},
+      'cv_analysis': {'technical_skills': ['Python', 'Django'], 'soft_skills': ['Rigueur'],
+                      'experiences': [], 'seniority': 'Junior'}}
+
+def matching_service():
+    return MatchingService(embeddings=FakeEmbeddings(dim=64), cache=EmbeddingCache(model="fake", max_entries=100))
+
+def test_report_is_rendered_from_scorer_output():
+    matching = asyncio.run(matching_service().calculate_score(CV, JOB))
+    assert any("manquantes: kubernetes" in concern for concern in matching['concerns'])
+    assert any("insuffisant" in concern for concern in matching['concerns'])
+    assert matching['strengths']
+
+    report = render_report(CV, JOB, matching)
+    sections = ["## Synthèse Globale", "## Points Forts", "## Points de Vigilance", "## Conclusion", "## RECOMMANDATION FINALE"]
+    positions = [report.index(section) for section in sections]
+    assert positions == sorted(positions)
+    for point in matching['strengths'] + matching['concerns']:
+        assert f"- {point}" in report
+    assert f"**{matching['overall_score']}/100**" in report
+
+def test_threshold_policy_only_upgrades_strong_candidates():
+    llm = LLMService(result_cache=MemoryResultCache(ttl=60, max_entries=10), llm=FakeChatModel())
+    pipeline = AnalysisPipeline(llm, matching_service(), report_policy=ReportPolicy("threshold", min_score=70))
+    offer = "Développeur Python senior : Django, Docker. Rigueur."
+    strong = "Développeur Python senior, 8 ans. Django, Docker. Rigueur.".encode("utf-8")
+    weak = "Graphiste junior. Photoshop, Illustrator.".encode("utf-8")
+
+    async def main():
+        return [await pipeline.run("cv.txt", content, offer) for content in (strong, weak)]
+
+    strong_results, weak_results = asyncio.run(main())
+    assert strong_results['matching']['overall_score'] >= 70
+    assert strong_results['report'].startswith("## Synthèse Globale\nmot")
+    assert weak_results['matching']['overall_score'] < 70
+    assert weak_results['report'].startswith("## Synthèse Globale\nLe profil")
@@ -0,0 +1,92 @@
+import asyncio
+import os
+import tempfile
+
+import pytest
+
+from app.services.matching.embedding_cache import EmbeddingCache
+from app.services.matching.score_store import ScoreStore
+from app.services.matching.scorer import MatchingService
+from benchmarks.fakes import FakeEmbeddings
+
+def scores(skills, soft, experience, technologies):
+    return {'skills_score': skills, 'soft_skills_score': soft,
+            'experience_score': experience, 'technologies_score': technologies}
+
+def service_with(store):
+    return MatchingService(embeddings=FakeEmbeddings(dim=16), cache=EmbeddingCache(model="fake"), score_store=store)
+
+def test_rescore_applies_new_weights_without_model_calls():
+    store = ScoreStore()
+    store.record("alice", "offer-1", scores(90, 20, 100, 90), ["python"], [])
+    store.record("bob", "offer-1", scores(40, 100, 100, 40), [], ["python"])
+    store.record("carol", "offer-2", scores(100, 100, 100, 100), ["go"], [])
+    service = service_with(store)
+
+    default = service.rescore(offer_id="offer-1")
+    assert [r['candidate_id'] for r in default['results']] == ["alice", "bob"]
+    assert default['results'][0]['overall_score'] == 78.0
+
+    soft_first = service.rescore(weights={'soft_skills': 3.0, 'technical_skills': 1.0}, offer_id="offer-1")
+    assert soft_first['total'] == 2
+    assert abs(sum(soft_first['weights'].values()) - 1.0) < 1e-9
+    assert [r['candidate_id'] for r in soft_first['results']] == ["bob", "alice"]
+    assert soft_first['results'][0]['missing_skills'] == ["python"]
+
+    strict = service.rescore(thresholds={'strongly_recommended': 99, 'consider': 95}, top_k=1)
+    assert strict['total'] == 3 and len(strict['results']) == 1
+    assert strict['results'][0]['recommendation'] == 'strongly_recommended'
+
+    with pytest.raises(ValueError):
+        service.rescore(weights={'salary': 1.0})
+
+def test_scores_are_recorded_and_reloaded():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "scores.sqlite3")
+        store = ScoreStore(path)
+        service = service_with(store)
+        cv = {'cv_analysis': {'technical_skills': ['Python'], 'soft_skills': [], 'seniority': 'Senior'}}
+        job = {'required_technical_skills': ['Python', 'Docker'], 'required_soft_skills': [],
+               'required_experience_level': 'Senior'}
+
+        result = asyncio.run(service.calculate_score(cv, job, candidate_id="cv-1"))
+        store.close()
+        reloaded = service_with(ScoreStore(path)).rescore(offer_id=result['offer_id'])
+
+        assert reloaded['total'] == 1
+        pair = reloaded['results'][0]
+        assert pair['candidate_id'] == "cv-1"
+        assert pair['overall_score'] == result['overall_score']
+        assert pair['missing_skills'] == ['docker']
+
+def test_memory_rows_are_capped_to_the_most_recent_pairs():
+    store = ScoreStore(max_rows=10)
+    for i in range(25):
+        store.record(f"cv-{i}", f"offer-{i % 2}", scores(i, i, i, i), [], [])
+    store.record("cv-24", "offer-0", scores(99, 99, 99, 99), [], [])
+
+    assert len(store) <= 10
+    rows, matrix = store.select()
+    candidates = [pair['candidate_id'] for pair in store.pairs(rows.tolist())]
+    assert "cv-24" in candidates and "cv-0" not in candidates
+    assert matrix[candidates.index("cv-24")][0] == 99
+    assert all(int(c.split("-")[1]) == row[0] for c, row in zip(candidates, matrix) if c != "cv-24")
+
+def test_recently_rescored_pairs_survive_eviction_and_the_table_is_trimmed(tmp_path):
+    import sqlite3
+
+    path = str(tmp_path / "scores.sqlite3")
+    store = ScoreStore(path, max_rows=10)
+    for i in range(10):
+        store.record(f"cv-{i}", "offer", scores(i, i, i, i), [], [])
+    # cv-0 vient d'être re-scoré : ce sont cv-1 et suivants qui sortent
+    store.record("cv-0", "offer", scores(50, 50, 50, 50), [], [])
+    for i in range(10, 15):
+        store.record(f"cv-{i}", "offer", scores(i, i, i, i), [], [])
+    store.close()
+
+    candidates = [pair['candidate_id'] for pair in store.pairs(store.select()[0].tolist())]
+    assert "cv-0" in candidates and "cv-1" not in candidates
+    assert store.pair("cv-0", "offer")['details']['skills_score'] == 50.0
+    with sqlite3.connect(path) as db:
+        assert db.execute("SELECT COUNT(*) FROM match_scores").fetchone()[0] <= 10
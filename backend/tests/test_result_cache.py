@@ -0,0 +1,67 @@
+import asyncio
+from app.services.llm.result_cache import (
+    MemoryResultCache, SQLiteResultCache, begin_cache_tracking, format_cache_statuses,
+    record_cache_status, result_cache_key
+)
+
+def test_key_ignores_whitespace_but_not_model():
+    assert result_cache_key("cv", "Python  dev\n", "v1", "m") == result_cache_key("cv", "Python dev", "v1", "m")
+    assert result_cache_key("cv", "Python dev", "v1", "m") != result_cache_key("cv", "Python dev", "v1", "other")
+
+def test_memory_cache_ttl_and_eviction():
+    cache = MemoryResultCache(ttl=60, max_entries=1)
+    cache.set("a", {"x": 1})
+    cache.set("b", {"x": 2})
+    assert cache.get("a") is None
+    assert cache.get("b") == {"x": 2}
+
+    expired = MemoryResultCache(ttl=-1, max_entries=10)
+    expired.set("a", {"x": 1})
+    assert expired.get("a") is None
+
+def test_sqlite_cache_persists(tmp_path):
+    path = str(tmp_path / "llm.sqlite3")
+    SQLiteResultCache(path, ttl=60, max_entries=10).set("k", {"skills": ["python"]})
+    assert SQLiteResultCache(path, ttl=60, max_entries=10).get("k") == {"skills": ["python"]}
+
+def test_statuses_are_collected_across_tasks():
+    async def record(kind, status):
+        await asyncio.sleep(0)
+        record_cache_status(kind, status)
+
+    async def main():
+        statuses = begin_cache_tracking()
+        await asyncio.gather(
+            asyncio.create_task(record("cv_analysis", "hit")),
+            asyncio.create_task(record("job_analysis", "miss")),
+        )
+        return statuses
+
+    assert format_cache_statuses(asyncio.run(main())) == "cv_analysis=hit, job_analysis=miss"
+    assert format_cache_statuses([("cv_analysis", "hit"), ("cv_analysis", "miss")]) == "cv_analysis=hit:1;miss:1"
+
+def test_unwritable_cache_path_falls_back_to_memory(tmp_path, monkeypatch):
+    from app.core.config import settings
+    from app.services.llm.result_cache import build_result_cache
+    from app.services.pipeline.job_store import MemoryJobStore, build_job_store
+
+    blocker = tmp_path / "fichier"
+    blocker.write_text("")
+    monkeypatch.setattr(settings, "LLM_CACHE_BACKEND", "sqlite")
+    monkeypatch.setattr(settings, "LLM_CACHE_PATH", str(blocker / "cache" / "llm.sqlite3"))
+    monkeypatch.setattr(settings, "JOB_STORE_BACKEND", "sqlite")
+    monkeypatch.setattr(settings, "JOB_STORE_PATH", str(blocker / "jobs" / "jobs.sqlite3"))
+
+    assert isinstance(build_result_cache(), MemoryResultCache)
+    assert isinstance(build_job_store(), MemoryJobStore)
+
+def test_sqlite_cache_evicts_in_bulk_when_over_the_limit(tmp_path):
+    cache = SQLiteResultCache(str(tmp_path / "llm.sqlite3"), ttl=60, max_entries=10)
+    for i in range(10):
+        cache.set(f"k{i}", {"i": i})
+    assert cache._evictor is None
+    cache.set("k10", {"i": 10})
+    cache.flush()
+    count = cache._db.execute("SELECT COUNT(*) FROM llm_results").fetchone()[0]
+    assert count <= 10
+    assert cache.get("k10") == {"i": 10}
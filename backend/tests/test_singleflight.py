@@ -0,0 +1,62 @@
+import asyncio
+from benchmarks.fakes import FakeChatModel, FakeEmbeddings
+from app.core.singleflight import SingleFlight
+from app.services.llm.mistral_client import LLMService
+from app.services.llm.result_cache import MemoryResultCache, begin_cache_tracking
+from app.services.matching.embedding_cache import EmbeddingCache
+from app.services.matching.scorer import MatchingService
+
+def test_identical_job_analyses_share_one_llm_call():
+    service = LLMService(result_cache=MemoryResultCache(ttl=60, max_entries=10), llm=FakeChatModel(latency=0.05))
+    calls = 0
+    extract_job = service._extract_job
+
+    async def counting_extract(*args):
+        nonlocal calls
+        calls += 1
+        return await extract_job(*args)
+
+    service._extract_job = counting_extract
+
+    async def main():
+        statuses = begin_cache_tracking()
+        results = await asyncio.gather(*(service.analyze_job_description("Développeur Python senior, Django, Docker") for _ in range(5)))
+        return statuses, results
+
+    statuses, results = asyncio.run(main())
+    assert calls == 1
+    assert sorted(status for _, status in statuses) == ["coalesced"] * 4 + ["miss"]
+    assert all(result == results[0] for result in results)
+    assert results[1] is not results[0]
+
+def test_concurrent_embedding_batches_only_fetch_each_text_once():
+    embeddings = FakeEmbeddings(dim=64, latency=0.05)
+    service = MatchingService(embeddings=embeddings, cache=EmbeddingCache(model="fake", max_entries=100))
+
+    async def main():
+        return await asyncio.gather(
+            service._get_embeddings_batch(["python", "django"]),
+            service._get_embeddings_batch(["Python", "docker"]),
+        )
+
+    first, second = asyncio.run(main())
+    assert embeddings.texts_embedded == 3
+    assert set(first) == {"python", "django"}
+    assert set(second) == {"Python", "docker"}
+    assert (first["python"] == second["Python"]).all()
+
+def test_shared_call_survives_a_cancelled_waiter():
+    flight = SingleFlight("test")
+
+    async def slow():
+        await asyncio.sleep(0.05)
+        return 42
+
+    async def main():
+        first = asyncio.ensure_future(flight.do("k", slow))
+        second = asyncio.ensure_future(flight.do("k", slow))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(main()) == 42
@@ -0,0 +1,25 @@
+import numpy as np
+from app.services.matching.skill_matcher import SkillMatcher
+
+def test_exact_and_semantic_matches():
+    embedding_map = {
+        "react": np.array([1.0, 0.0, 0.0]),
+        "react.js": np.array([0.99, 0.05, 0.0]),
+        "docker": np.array([0.0, 1.0, 0.0]),
+        "kubernetes": np.array([0.0, 0.0, 1.0]),
+    }
+    result = SkillMatcher(threshold=0.85).match(
+        ["React", "Docker"], ["docker", "React.js", "Kubernetes"], embedding_map
+    )
+
+    assert result.matched == ["docker", "react.js"]
+    assert result.missing == ["kubernetes"]
+    by_skill = {d["skill"]: d for d in result.details}
+    assert by_skill["docker"]["similarity"] == 1.0
+    assert by_skill["react.js"]["best_match"] == "react"
+    assert by_skill["kubernetes"]["similarity"] == 0.0
+
+def test_empty_cv_skills():
+    result = SkillMatcher().match([], ["Python"], {})
+    assert result.matched == []
+    assert result.missing == ["Python"]
@@ -0,0 +1,39 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from app.api.deps import LazyService
+
+def test_app_import_does_not_load_heavy_modules():
+    code = (
+        "import sys, app.main\n"
+        "print(','.join(m for m in ('langchain_core', 'langchain_mistralai', 'numpy', 'pypdf', 'docx') if m in sys.modules))"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True,
+        env={**os.environ, "HF_HUB_OFFLINE": "1"}
+    )
+    assert completed.stdout.strip() == ""
+
+def test_lazy_service_is_created_once():
+    created = []
+
+    def factory():
+        time.sleep(0.02)
+        created.append(object())
+        return created[-1]
+
+    service = LazyService(factory)
+    assert not service.created
+    instances = []
+    threads = [threading.Thread(target=lambda: instances.append(service())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(created) == 1
+    assert service.created
+    assert all(instance is created[0] for instance in instances)
@@ -0,0 +1,63 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from app.services.matching.embedding_cache import EmbeddingCache
+from app.services.matching.scorer import MatchingService
+from app.services.matching.skill_matcher import SkillMatcher
+from app.services.matching.taxonomy import SkillTaxonomy, load_default_taxonomy
+from benchmarks.fakes import FakeEmbeddings
+
+TAXONOMY = SkillTaxonomy([
+    {"name": "Python", "aliases": ["py"]},
+    {"name": "Django", "parent": "Python"},
+    {"name": "JavaScript", "aliases": ["js"]},
+    {"name": "React", "aliases": ["react.js"], "parent": "JavaScript"},
+])
+
+def test_aliases_and_hierarchy():
+    assert TAXONOMY.canonical("React JS") == TAXONOMY.canonical("reactjs") == TAXONOMY.canonical("React")
+    assert TAXONOMY.canonical("Rust") is None
+    covered = TAXONOMY.coverage(["django", "rust"])
+    assert set(covered) == {"django", "python"}
+    assert covered["python"] == "django"
+
+def test_ambiguous_alias_is_rejected():
+    with pytest.raises(ValueError):
+        SkillTaxonomy([{"name": "Go", "aliases": ["golang"]}, {"name": "Golang"}])
+
+def test_matcher_resolves_known_skills_without_embeddings():
+    matcher = SkillMatcher(threshold=0.85, taxonomy=TAXONOMY)
+    cv, job = ["Django", "React.js"], ["Python", "React", "JavaScript", "Django"]
+
+    assert matcher.skills_to_embed(cv, job) == []
+    result = matcher.match(cv, job, {})
+    assert result.matched == ["python", "react", "javascript", "django"]
+    # Un parent ne couvre pas ses enfants
+    assert matcher.match(["Python"], ["Django"], {}).missing == ["django"]
+
+def test_known_skills_are_not_compared_by_embeddings():
+    matcher = SkillMatcher(threshold=0.85, taxonomy=TAXONOMY)
+    embedding_map = {"python": np.array([1.0, 0.0]), "react": np.array([1.0, 0.0]), "flask": np.array([0.6, 0.8])}
+
+    result = matcher.match(["Python", "Flask"], ["React"], embedding_map)
+    assert result.missing == ["react"]
+    assert result.details[0]["best_match"] == "flask"
+
+def test_scorer_only_embeds_unresolved_skills():
+    embeddings = FakeEmbeddings(dim=32)
+    service = MatchingService(
+        embeddings=embeddings, cache=EmbeddingCache(model="fake", max_entries=100), taxonomy=load_default_taxonomy()
+    )
+    cv = {'cv_analysis': {'technical_skills': ['ReactJS', 'Django', 'Docker'], 'soft_skills': [], 'seniority': 'Senior'}}
+    job = {'required_technical_skills': ['React', 'Python', 'Docker'], 'required_soft_skills': [],
+           'required_experience_level': 'Senior'}
+
+    profile = asyncio.run(service.job_profile(job))
+    embedded_for_offer = embeddings.texts_embedded
+
+    result = asyncio.run(service.calculate_score(cv, profile))
+    assert result['matched_skills'] == ['react', 'python', 'docker']
+    # Compétences résolues par le référentiel : seule la chaîne agrégée du CV est vectorisée
+    assert embeddings.texts_embedded == embedded_for_offer + 1
@@ -0,0 +1,93 @@
+import asyncio
+import hashlib
+import io
+
+import pytest
+from starlette.datastructures import UploadFile
+
+from app.core.config import settings
+from app.services.llm.mistral_client import LLMService
+from app.services.llm.result_cache import MemoryResultCache
+from app.services.matching.embedding_cache import EmbeddingCache
+from app.services.matching.scorer import MatchingService
+from app.services.parsers.upload import UploadRejected, ingest_upload
+from app.services.pipeline.analysis import AnalysisPipeline
+from benchmarks import corpus
+from benchmarks.fakes import FakeChatModel, FakeEmbeddings
+
+class CountingFile(io.BytesIO):
+    def __init__(self, data):
+        super().__init__(data)
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.bytes_read += len(chunk)
+        return chunk
+
+def ingest(filename, data, **kwargs):
+    return asyncio.run(ingest_upload(UploadFile(io.BytesIO(data), filename=filename), **kwargs))
+
+def test_valid_uploads_are_hashed_while_reading():
+    for filename, content in corpus.sample_cvs() + corpus.synthetic_cvs(2):
+        upload = ingest(filename, content, chunk_size=1024)
+        assert upload.content == content
+        assert upload.sha256 == hashlib.sha256(content).hexdigest()
+
+def test_oversized_upload_is_rejected_before_being_buffered():
+    stream = CountingFile(b"Python " * 100_000)
+    with pytest.raises(UploadRejected) as error:
+        asyncio.run(ingest_upload(UploadFile(stream, filename="cv.txt"), max_size=10_000, chunk_size=4096))
+    assert error.value.status_code == 413
+    assert stream.bytes_read <= 10_000 + 4096
+
+@pytest.mark.parametrize("filename, data", [
+    ("cv.exe", b"MZ\x90\x00\x03\x00\x00\x00"),
+    ("cv.pdf", b"MZ\x90\x00\x03\x00\x00\x00" * 10),
+    ("cv.docx", b"%PDF-1.5\n" * 10),
+    ("cv.txt", b"PK\x03\x04\x14\x00\x00\x00" * 10),
+    ("cv.txt", b"texte\x00binaire" * 10),
+])
+def test_unsupported_or_disguised_files_are_rejected(filename, data):
+    with pytest.raises(UploadRejected) as error:
+        ingest(filename, data)
+    assert error.value.status_code == 415
+
+def test_oversized_request_body_is_rejected_before_form_parsing(monkeypatch):
+    from fastapi.testclient import TestClient
+    from app.api import deps
+    from app.main import app
+
+    monkeypatch.setattr(settings, "MAX_UPLOAD_SIZE", 1000)
+    client = TestClient(app)
+    body = b"a" * (2 * 1024 * 1024)
+    declared = client.post("/api/v1/analyze", files={"cv": ("cv.txt", body)}, data={"job_description": "offre"})
+    assert declared.status_code == 413
+
+    def chunks():
+        yield b"--x\r\nContent-Disposition: form-data; name=\"cv\"; filename=\"cv.txt\"\r\n\r\n"
+        for _ in range(40):
+            yield b"a" * 64 * 1024
+    streamed = client.post(
+        "/api/v1/analyze", content=chunks(), headers={"content-type": "multipart/form-data; boundary=x"}
+    )
+    assert streamed.status_code == 413
+    assert not deps.get_analysis_pipeline.created
+
+def test_reuploaded_document_skips_extraction_and_cv_analysis():
+    llm = LLMService(result_cache=MemoryResultCache(ttl=60, max_entries=10), llm=FakeChatModel())
+    matching = MatchingService(embeddings=FakeEmbeddings(dim=64), cache=EmbeddingCache(model="fake", max_entries=100))
+    pipeline = AnalysisPipeline(llm, matching)
+    content = "Développeur Python senior. Django, Docker. Rigueur.".encode("utf-8")
+    upload = ingest("cv.txt", content)
+
+    async def main():
+        first = await pipeline.run(upload.filename, upload.content, "Développeur Python : Django.", content_hash=upload.sha256)
+        second = await pipeline.run(upload.filename, upload.content, "Développeur Python : Django.", content_hash=upload.sha256)
+        return first, second
+
+    first, second = asyncio.run(main())
+    assert 'extraction' in first and 'extraction' not in second
+    assert second['cv_analysis'] == first['cv_analysis']
+    assert second['matching']['candidate_id'] == upload.sha256[:16]
+    assert second['matching']['overall_score'] == first['matching']['overall_score']
@@ -0,0 +1,39 @@
+import asyncio
+import pytest
+from app.services.parsers.worker_pool import ExtractionPool, ExtractionPoolSaturated
+
+def test_extract_in_process_pool():
+    pool = ExtractionPool(mode="process", workers=1)
+    try:
+        assert asyncio.run(pool.extract("cv.txt", b"Hello World")) == "Hello World"
+    finally:
+        pool.shutdown()
+
+def test_saturated_pool_rejects_immediately(monkeypatch):
+    pool = ExtractionPool(mode="thread", workers=1, queue_size=1)
+    monkeypatch.setattr("app.services.parsers.worker_pool._extract_native", lambda f, c: __import__("time").sleep(0.2) or "ok")
+
+    async def main():
+        first = asyncio.create_task(pool.extract("a.txt", b"a"))
+        await asyncio.sleep(0.01)
+        with pytest.raises(ExtractionPoolSaturated):
+            await pool.extract("b.txt", b"b")
+        assert await first == "ok"
+        assert pool.pending == 0
+
+    try:
+        asyncio.run(main())
+    finally:
+        pool.shutdown()
+
+def test_failed_pool_creation_releases_the_slot(monkeypatch):
+    pool = ExtractionPool(mode="thread", workers=1, queue_size=1)
+
+    def broken_executor():
+        raise RuntimeError("spawn impossible")
+
+    monkeypatch.setattr(pool, "_get_executor", broken_executor)
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            asyncio.run(pool.extract("a.txt", b"a"))
+    assert pool.pending == 0